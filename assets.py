@@ -0,0 +1,145 @@
+"""
+Static Assets
+Fingerprinted, precompressed copies of static/css and static/js, built by
+`flask build-assets` and served with long-lived immutable caching
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+
+from flask import current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # Optional dependency; without it only gzip variants are built
+    brotli = None
+
+ASSET_DIRS = ('css', 'js')
+BUILD_DIR = 'dist'
+MANIFEST = 'manifest.json'
+
+# Content-Encoding -> file suffix, in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def _compress(encoding, data):
+    if encoding == 'br':
+        return brotli.compress(data, quality=11) if brotli else None
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def build_assets(static_folder):
+    """
+    Rebuild static/dist from static/css and static/js.
+
+    Each file is copied to dist/<dir>/<name>.<hash><ext>, with .br and .gz
+    variants when they come out smaller, and dist/manifest.json maps the
+    original name (css/style.css) to the copy and its encodings.
+    Returns the manifest.
+    """
+    output = os.path.join(static_folder, BUILD_DIR)
+    shutil.rmtree(output, ignore_errors=True)
+
+    assets = {}
+    for directory in ASSET_DIRS:
+        source_dir = os.path.join(static_folder, directory)
+        if not os.path.isdir(source_dir):
+            continue
+        os.makedirs(os.path.join(output, directory))
+        for name in sorted(os.listdir(source_dir)):
+            with open(os.path.join(source_dir, name), 'rb') as f:
+                data = f.read()
+            stem, ext = os.path.splitext(name)
+            path = f'{BUILD_DIR}/{directory}/{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}'
+            with open(os.path.join(static_folder, path), 'wb') as f:
+                f.write(data)
+
+            encodings = []
+            for encoding, suffix in ENCODINGS:
+                compressed = _compress(encoding, data)
+                if compressed is not None and len(compressed) < len(data):
+                    with open(os.path.join(static_folder, path + suffix), 'wb') as f:
+                        f.write(compressed)
+                    encodings.append(encoding)
+            assets[f'{directory}/{name}'] = {'path': path, 'size': len(data), 'encodings': encodings}
+
+    with open(os.path.join(output, MANIFEST), 'w') as f:
+        json.dump(assets, f, indent=2, sort_keys=True)
+    return assets
+
+
+def load_manifest(app):
+    """Read the manifest written by build_assets(), if fingerprinting is on"""
+    assets, encodings = {}, {}
+    manifest = os.path.join(app.static_folder, BUILD_DIR, MANIFEST)
+    if not app.config.get('ASSET_FINGERPRINTS', True) or not os.path.exists(manifest):
+        return assets, encodings
+    with open(manifest) as f:
+        for name, asset in json.load(f).items():
+            assets[name] = asset['path']
+            encodings[asset['path']] = asset['encodings']
+    return assets, encodings
+
+
+class _AssetState:
+    """One app's manifest: original name -> fingerprinted path, and each path's encodings"""
+
+    def __init__(self, app):
+        self.max_age = app.config.get('ASSET_MAX_AGE', 31536000)
+        self.assets, self.encodings = load_manifest(app)
+
+
+class AssetPipeline:
+    """
+    Flask extension serving the output of build_assets().
+
+    With ASSET_FINGERPRINTS on and a manifest present, static_url() (a
+    template global taking the same arguments as url_for('static', ...))
+    points at the fingerprinted copy, and the static route serves it with
+    `Cache-Control: immutable` and the best precompressed variant the
+    client's Accept-Encoding allows. Otherwise static_url() is plain
+    url_for('static', ...), so development sees edits straight away.
+    Each app reads its own manifest into app.extensions['assets'].
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        state = app.extensions['assets'] = _AssetState(app)
+        app.add_template_global(self.static_url)
+        if state.assets:
+            app.view_functions['static'] = self.send_static_file
+
+    @property
+    def state(self):
+        """The current app's manifest, read by init_app()"""
+        return current_app.extensions['assets']
+
+    def static_url(self, filename, **values):
+        return url_for('static', filename=self.state.assets.get(filename, filename), **values)
+
+    def send_static_file(self, filename):
+        """Static route: fingerprinted files get immutable caching and precompression"""
+        state = self.state
+        if filename not in state.encodings:
+            return current_app.send_static_file(filename)
+
+        path, content_encoding = filename, None
+        for encoding, suffix in ENCODINGS:
+            if encoding in state.encodings[filename] and request.accept_encodings[encoding]:
+                path, content_encoding = filename + suffix, encoding
+                break
+
+        response = send_from_directory(current_app.static_folder, path, max_age=state.max_age,
+                                       mimetype=mimetypes.guess_type(filename)[0])
+        if content_encoding:
+            response.content_encoding = content_encoding
+        response.vary.add('Accept-Encoding')
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
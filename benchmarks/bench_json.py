@@ -0,0 +1,101 @@
+"""
+JSON Serialization Benchmark
+Compares hand-built dicts + the stdlib provider against schema
+serializers + the orjson provider for catalogue-sized payloads.
+
+Usage: python benchmarks/bench_json.py [rows] [repeats]
+"""
+import os
+import sys
+import timeit
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask.json.provider import DefaultJSONProvider
+
+from app import create_app
+from json_provider import OrJSONProvider, orjson
+from models import Activity, Booking, Child, Parent
+from serializers import ActivitySchema, BookingSchema
+
+
+def make_rows(n):
+    activities, bookings = [], []
+    parent = Parent(full_name='Parent Name', email='parent@example.com')
+    for i in range(n):
+        activity = Activity(id=i, name=f'Activity {i}', price=10.0 + i % 7, day_of_week='Monday',
+                            start_time='15:00', end_time='16:00', max_capacity=20)
+        child = Child(id=i, name=f'Child {i}', parent=parent)
+        activities.append(activity)
+        bookings.append(Booking(id=i, parent=parent, child=child, activity=activity, booking_date=date(2026, 1, 5),
+                                cost=activity.price, status='confirmed', created_at=datetime(2026, 1, 1, 9, 30)))
+    return activities, bookings
+
+
+def hand_built_activities(activities):
+    return [{
+        'id': a.id,
+        'name': a.name,
+        'price': a.price,
+        'day': a.day_of_week,
+        'time': f"{a.start_time} - {a.end_time}",
+        'capacity': a.max_capacity
+    } for a in activities]
+
+
+def hand_built_bookings(bookings):
+    return [{
+        'id': b.id,
+        'parent': b.parent.full_name,
+        'child': b.child.name,
+        'activity': b.activity.name,
+        'booking_date': b.booking_date.isoformat(),
+        'cost': b.cost,
+        'status': b.status,
+        'created_at': b.created_at.isoformat() if b.created_at else None
+    } for b in bookings]
+
+
+def report(label, seconds, repeats, baseline=None):
+    per_call = seconds / repeats * 1000
+    speedup = f'  ({baseline / seconds:.1f}x)' if baseline else ''
+    print(f'  {label:<42} {per_call:8.3f} ms{speedup}')
+    return seconds
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    app = create_app('testing')
+    with app.app_context():
+        activities, bookings = make_rows(rows)
+        stdlib = DefaultJSONProvider(app)
+        providers = [('stdlib', stdlib)]
+        if orjson:
+            providers.append(('orjson', OrJSONProvider(app)))
+        else:
+            print('orjson not installed; only the stdlib provider is measured')
+
+        for name, objs, hand_built, schema in (
+            ('activities', activities, hand_built_activities, ActivitySchema),
+            ('bookings', bookings, hand_built_bookings, BookingSchema),
+        ):
+            print(f'{rows} {name}, {repeats} repeats')
+            baseline = report('hand-built dicts + stdlib dumps',
+                              timeit.timeit(lambda: stdlib.dumps(hand_built(objs)), number=repeats), repeats)
+            report('schema dump_many (no encoding)',
+                   timeit.timeit(lambda: schema.dump_many(objs), number=repeats), repeats)
+            for provider_name, provider in providers:
+                report(f'schema + {provider_name} dumps',
+                       timeit.timeit(lambda: provider.dumps(schema.dump_many(objs)), number=repeats),
+                       repeats, baseline)
+            sparse = schema.names[:2]
+            report(f'schema ?fields={",".join(sparse)} + {providers[-1][0]} dumps',
+                   timeit.timeit(lambda: providers[-1][1].dumps(schema.dump_many(objs, sparse)), number=repeats),
+                   repeats, baseline)
+
+
+if __name__ == '__main__':
+    main()
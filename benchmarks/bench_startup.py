@@ -0,0 +1,99 @@
+"""
+Cold Start Benchmark
+Measures what a fresh worker pays before it can answer: the import of
+app.py (broken down with python -X importtime) and the first request.
+Exits non-zero when the median import-to-first-response time is over
+budget, so it can gate deploys.
+
+Set FLASK_CONFIG=production to measure the production template mode;
+runs after the first then reuse the bytecode cache, as later workers do.
+
+Usage: python benchmarks/bench_startup.py [budget_ms] [runs] [url]
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Subsystems that should only load when a request needs them
+LAZY_MODULES = ('reportlab', 'enhanced_invoice')
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)')
+
+FIRST_REQUEST = """
+import os, time
+started = time.perf_counter()
+from app import create_app
+application = create_app(os.environ.get('FLASK_CONFIG', 'default'))
+imported = time.perf_counter()
+response = application.test_client().get({url!r})
+finished = time.perf_counter()
+assert response.status_code < 500, response.status_code
+print(imported - started, finished - imported, application.extensions['template_warmup']['precompile_ms'] or 0)
+"""
+
+
+def run_python(args, db_path):
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{db_path}', MAIL_SUPPRESS_SEND='true',
+               JINJA_BYTECODE_CACHE_DIR=os.path.join(os.path.dirname(db_path), 'jinja_cache'))
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def import_profile(db_path, top):
+    """Print the slowest top-level imports and any lazy subsystem loaded eagerly"""
+    stderr = run_python(['-X', 'importtime', '-c', 'import app'], db_path).stderr
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((int(cumulative_us), int(self_us), len(indent) // 2, name))
+
+    print('Slowest imports under app (cumulative ms, self ms):')
+    for cumulative_us, self_us, depth, name in sorted((r for r in rows if r[2] <= 1), reverse=True)[:top]:
+        print(f'  {name:<40} {cumulative_us / 1000:8.1f} {self_us / 1000:8.1f}')
+
+    eager = sorted({name for _, _, _, name in rows if name.startswith(LAZY_MODULES)})
+    if eager:
+        print(f'  loaded at import but should be lazy: {", ".join(eager)}')
+    return not eager
+
+
+def main():
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 1500
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    url = sys.argv[3] if len(sys.argv) > 3 else '/'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        lazy_ok = import_profile(db_path, top=15)
+
+        imports, requests, precompiles = [], [], []
+        for _ in range(runs):
+            stdout = run_python(['-c', FIRST_REQUEST.format(url=url)], db_path).stdout
+            import_s, request_s, precompile_ms = map(float, stdout.split())
+            imports.append(import_s * 1000)
+            requests.append(request_s * 1000)
+            precompiles.append(precompile_ms)
+
+    total = statistics.median(i + r for i, r in zip(imports, requests))
+    print(f'\n{runs} cold starts, GET {url} ({os.environ.get("FLASK_CONFIG", "default")} config)')
+    print(f'  import app + create_app()                {statistics.median(imports):8.1f} ms (median)')
+    if any(precompiles):
+        print(f'  of which template precompile             {precompiles[0]:8.1f} ms cold cache, '
+              f'{statistics.median(precompiles[1:] or precompiles):.1f} ms warm (median)')
+    print(f'  first request                            {statistics.median(requests):8.1f} ms (median)')
+    print(f'  import to first response                 {total:8.1f} ms (budget {budget_ms:.0f} ms)')
+
+    if total > budget_ms or not lazy_ok:
+        print('FAIL')
+        sys.exit(1)
+    print('OK')
+
+
+if __name__ == '__main__':
+    main()
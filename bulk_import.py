@@ -0,0 +1,331 @@
+"""
+Bulk Import
+Chunked CSV import of activities, families and bookings
+"""
+import csv
+import os
+from datetime import datetime
+
+from flask import current_app
+
+from extensions import db, password_hasher
+from helpers import EMAIL_REGEX, PHONE_REGEX, parse_date
+from models import (
+    Activity, Booking, Child, Identity, Parent, _booking_contribution, apply_rollup_deltas,
+    booking_rollups_enabled, identity_index_enabled, normalise_email, reindex_bookings
+)
+from queries import WEEKDAYS, _parse_float, _parse_time
+
+
+# ==================== Bulk Import ====================
+# CSV files are read in chunks of IMPORT_CHUNK_SIZE rows. Each chunk is
+# validated with one lookup query per referenced table, inserted with
+# bulk_insert_mappings and committed on its own, so a bad row never blocks
+# the rest of the file. Bulk inserts skip the ORM flush events, so each
+# importer updates the search index, rollups, caches and capacity streams
+# itself.
+
+IMPORT_COLUMNS = {
+    # kind: (required columns, optional columns)
+    'activities': (('name', 'price', 'day', 'start', 'end'), ('capacity', 'tutor_email', 'description')),
+    'families': (('parent_email', 'parent_name', 'phone', 'child_name'), ('child_age', 'child_grade')),
+    'bookings': (('parent_email', 'child_name', 'activity_id', 'booking_date'), ('cost', 'status')),
+}
+
+def iter_csv_chunks(stream, size):
+    """Yield lists of (line_number, row) with lower-cased, stripped keys and values"""
+    reader = csv.DictReader(stream)
+    chunk = []
+    for row in reader:
+        chunk.append((reader.line_num, {
+            (key or '').strip().lower(): (value or '').strip()
+            for key, value in row.items() if not isinstance(value, list)
+        }))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _validate_activity_rows(chunk, context):
+    # Emails are matched through the identity index's primary key
+    emails = {normalise_email(row['tutor_email']) for _, row in chunk if row.get('tutor_email')}
+    tutors = dict(db.session.query(Identity.email, Identity.user_id).filter(
+        Identity.email.in_(emails),
+        Identity.role == 'tutor'
+    ).all()) if emails else {}
+    
+    valid, errors = [], []
+    for line, row in chunk:
+        price = _parse_float(row['price'])
+        start, end = _parse_time(row['start']), _parse_time(row['end'])
+        capacity = row.get('capacity') or '20'
+        tutor_email = normalise_email(row.get('tutor_email'))
+        
+        if not row['name']:
+            errors.append((line, 'name is required'))
+        elif price is None or price < 0:
+            errors.append((line, f"invalid price '{row['price']}'"))
+        elif row['day'].capitalize() not in WEEKDAYS:
+            errors.append((line, f"invalid day '{row['day']}'"))
+        elif not start or not end or start >= end:
+            errors.append((line, 'start and end must be HH:MM with start before end'))
+        elif not capacity.isdigit() or int(capacity) < 1:
+            errors.append((line, f"invalid capacity '{capacity}'"))
+        elif tutor_email and tutor_email not in tutors:
+            errors.append((line, f"no tutor with email '{row['tutor_email']}'"))
+        else:
+            valid.append({
+                'name': row['name'],
+                'description': row.get('description') or None,
+                'price': price,
+                'day_of_week': row['day'].capitalize(),
+                'start_time': start,
+                'end_time': end,
+                'max_capacity': int(capacity),
+                'tutor_id': tutors.get(tutor_email),
+            })
+    return valid, errors
+
+def _insert_activity_rows(rows, context):
+    db.session.bulk_insert_mappings(Activity, rows)
+
+def _validate_family_rows(chunk, context):
+    emails = {normalise_email(row['parent_email']) for _, row in chunk}
+    known = context.setdefault('parents', {})
+    taken = context.setdefault('taken', set())
+    lookup = emails - set(known) - taken
+    if lookup:
+        for email, role, user_id in db.session.query(Identity.email, Identity.role, Identity.user_id).filter(
+            Identity.email.in_(lookup)
+        ):
+            if role == 'parent':
+                known[email] = user_id
+            else:
+                taken.add(email)
+    
+    parent_ids = {known[email] for email in emails if email in known}
+    children = context.setdefault('children', set())
+    if parent_ids:
+        children.update(db.session.query(Child.parent_id, db.func.lower(Child.name)).filter(
+            Child.parent_id.in_(parent_ids)
+        ).all())
+    
+    parents, valid, errors = {}, [], []
+    for line, row in chunk:
+        email = normalise_email(row['parent_email'])
+        age = row.get('child_age') or None
+        
+        if not EMAIL_REGEX.match(row['parent_email']):
+            errors.append((line, f"invalid email '{row['parent_email']}'"))
+        elif email in taken:
+            errors.append((line, f"{email} belongs to a tutor or admin account"))
+        elif email not in known and not PHONE_REGEX.match(row['phone']):
+            errors.append((line, f"invalid phone '{row['phone']}'"))
+        elif email not in known and not row['parent_name']:
+            errors.append((line, 'parent_name is required'))
+        elif not row['child_name']:
+            errors.append((line, 'child_name is required'))
+        elif age is not None and not age.isdigit():
+            errors.append((line, f"invalid child_age '{age}'"))
+        elif (known.get(email), row['child_name'].lower()) in children or (email, row['child_name'].lower()) in children:
+            errors.append((line, f"child '{row['child_name']}' is already registered for {email}"))
+        else:
+            if email not in known and email not in parents:
+                # Stored as written, like registration; the identity index holds the normalised form
+                parents[email] = {
+                    'email': row['parent_email'],
+                    'full_name': row['parent_name'],
+                    'phone': row['phone'],
+                    'password': context['password_hash'],
+                }
+            # Keyed by email until new parents have ids
+            children.add((known.get(email, email), row['child_name'].lower()))
+            valid.append({
+                'parent_email': email,
+                'name': row['child_name'],
+                'age': int(age) if age else None,
+                'grade': row.get('child_grade') or None,
+            })
+    
+    context['new_parents'] = list(parents.values())
+    return valid, errors
+
+def _insert_family_rows(rows, context):
+    new_parents = context.pop('new_parents')
+    if new_parents:
+        db.session.bulk_insert_mappings(Parent, new_parents, return_defaults=True)
+        # Bulk inserts skip the flush events that maintain the identity index
+        if identity_index_enabled(db.session.connection()):
+            db.session.execute(Identity.__table__.insert(), [
+                {'email': normalise_email(parent['email']), 'role': 'parent', 'user_id': parent['id']}
+                for parent in new_parents
+            ])
+        context['parents'].update({normalise_email(parent['email']): parent['id'] for parent in new_parents})
+        context['children'] = {
+            (context['parents'].get(key, key), name) for key, name in context['children']
+        }
+    
+    for row in rows:
+        row['parent_id'] = context['parents'][row.pop('parent_email')]
+    db.session.bulk_insert_mappings(Child, rows)
+
+def _validate_booking_rows(chunk, context):
+    if 'activities' not in context:
+        context['activities'] = {
+            row.id: row for row in db.session.query(
+                Activity.id, Activity.price, Activity.max_capacity, Activity.day_of_week, Activity.tutor_id
+            )
+        }
+    activities = context['activities']
+    
+    emails = {normalise_email(row['parent_email']) for _, row in chunk}
+    children = {}
+    for parent_email, parent_id, child_id, child_name in db.session.query(
+        Identity.email, Identity.user_id, Child.id, db.func.lower(Child.name)
+    ).join(Child, Child.parent_id == Identity.user_id).filter(
+        Identity.email.in_(emails),
+        Identity.role == 'parent'
+    ):
+        children[(parent_email, child_name)] = (parent_id, child_id)
+    
+    parsed = [(line, row, parse_date(row['booking_date'])) for line, row in chunk]
+    child_ids = {pair[1] for pair in children.values()}
+    dates = {booking_date for _, _, booking_date in parsed if booking_date}
+    
+    # One child can only have one booking per day
+    taken = context.setdefault('taken', set())
+    if child_ids and dates:
+        taken.update(db.session.query(Booking.child_id, Booking.booking_date).filter(
+            Booking.child_id.in_(child_ids), Booking.booking_date.in_(dates)
+        ).all())
+    
+    booked = context.setdefault('booked', {})
+    pairs = {(int(row['activity_id']), booking_date) for _, row, booking_date in parsed
+             if row['activity_id'].isdigit() and booking_date} - set(booked)
+    if pairs:
+        for activity_id, booking_date, count in db.session.query(
+            Booking.activity_id, Booking.booking_date, db.func.count(Booking.id)
+        ).filter(
+            Booking.activity_id.in_({pair[0] for pair in pairs}),
+            Booking.booking_date.in_({pair[1] for pair in pairs}),
+            Booking.status == 'confirmed'
+        ).group_by(Booking.activity_id, Booking.booking_date):
+            booked[(activity_id, booking_date)] = count
+    
+    valid, errors = [], []
+    now = datetime.utcnow()
+    for line, row, booking_date in parsed:
+        activity = activities.get(int(row['activity_id'])) if row['activity_id'].isdigit() else None
+        family = children.get((normalise_email(row['parent_email']), row['child_name'].lower()))
+        status = row.get('status') or 'confirmed'
+        cost = _parse_float(row.get('cost')) if row.get('cost') else (activity.price if activity else None)
+        
+        if activity is None:
+            errors.append((line, f"no activity with id '{row['activity_id']}'"))
+        elif family is None:
+            errors.append((line, f"no child '{row['child_name']}' for parent '{row['parent_email']}'"))
+        elif booking_date is None:
+            errors.append((line, f"invalid booking_date '{row['booking_date']}' (use YYYY-MM-DD)"))
+        elif WEEKDAYS[booking_date.weekday()] != activity.day_of_week:
+            errors.append((line, f'{booking_date} is not a {activity.day_of_week}'))
+        elif status not in ('confirmed', 'cancelled'):
+            errors.append((line, f"invalid status '{status}'"))
+        elif cost is None or cost < 0:
+            errors.append((line, f"invalid cost '{row.get('cost')}'"))
+        elif (family[1], booking_date) in taken:
+            errors.append((line, f'child already booked on {booking_date}'))
+        elif status == 'confirmed' and booked.get((activity.id, booking_date), 0) >= (activity.max_capacity or 20):
+            errors.append((line, f'activity {activity.id} is full on {booking_date}'))
+        else:
+            taken.add((family[1], booking_date))
+            if status == 'confirmed':
+                booked[(activity.id, booking_date)] = booked.get((activity.id, booking_date), 0) + 1
+            valid.append({
+                'parent_id': family[0],
+                'child_id': family[1],
+                'activity_id': activity.id,
+                'booking_date': booking_date,
+                'status': status,
+                'cost': cost,
+                'created_at': now,
+            })
+    return valid, errors
+
+def _insert_booking_rows(rows, context):
+    db.session.bulk_insert_mappings(Booking, rows, return_defaults=True)
+    connection = db.session.connection()
+    
+    # Bulk inserts bypass maintain_booking_search and maintain_booking_rollups
+    reindex_bookings(connection, 'booking.id', [row['id'] for row in rows])
+    if booking_rollups_enabled(connection):
+        deltas = {}
+        for row in rows:
+            tutor_id = context['activities'][row['activity_id']].tutor_id
+            contribution = _booking_contribution(row['status'], row['cost'], row['created_at'], row['activity_id'], tutor_id)
+            for key, revenue in contribution.items():
+                delta = deltas.setdefault(key, [0, 0])
+                delta[0] += 1
+                delta[1] += revenue
+        apply_rollup_deltas(connection, deltas)
+    
+    # ...and collect_capacity_changes, so queue deltas for publish on commit
+    capacity = db.session.info.setdefault('capacity_deltas', {})
+    for row in rows:
+        if row['status'] == 'confirmed':
+            key = (row['activity_id'], row['booking_date'])
+            capacity[key] = capacity.get(key, 0) + 1
+
+IMPORTERS = {
+    'activities': (_validate_activity_rows, _insert_activity_rows),
+    'families': (_validate_family_rows, _insert_family_rows),
+    'bookings': (_validate_booking_rows, _insert_booking_rows),
+}
+
+def import_csv(kind, stream, chunk_size=None):
+    """
+    Import a CSV text stream of `kind` (activities, families or bookings).
+    Returns {'kind', 'rows', 'imported', 'errors'} where errors is a list
+    of (line_number, message) for every row that was not imported.
+    """
+    required, optional = IMPORT_COLUMNS[kind]
+    validate, insert = IMPORTERS[kind]
+    chunk_size = chunk_size or current_app.config['IMPORT_CHUNK_SIZE']
+    report = {'kind': kind, 'rows': 0, 'imported': 0, 'errors': [], 'failures': []}
+    # Imported parents get an unguessable shared password and set their own
+    # through forgot-password; hashing once keeps 50k rows fast
+    context = {'password_hash': password_hasher.hash(os.urandom(24).hex())}
+    
+    for chunk in iter_csv_chunks(stream, chunk_size):
+        if report['rows'] == 0:
+            missing = [column for column in required if column not in chunk[0][1]]
+            if missing:
+                report['errors'].append((1, f"missing column(s): {', '.join(missing)}"))
+                return report
+        report['rows'] += len(chunk)
+        
+        valid, errors = validate(chunk, context)
+        report['errors'].extend(errors)
+        if not valid:
+            continue
+        try:
+            insert(valid, context)
+            # Bulk inserts skip the flush-time change flags
+            db.session.info['fragments_stale'] = True
+            if kind == 'activities':
+                db.session.info['catalogue_stale'] = True
+            db.session.commit()
+            report['imported'] += len(valid)
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.exception('Import of %s rows %d-%d failed', kind, chunk[0][0], chunk[-1][0])
+            reason = str(getattr(e, 'orig', None) or e).splitlines()[0][:200]
+            report['failures'].append((chunk[0][0], chunk[-1][0], f'{e.__class__.__name__}: {reason}'))
+            failed = {line for line, _ in errors}
+            report['errors'].extend((line, f'chunk rejected by the database: {e.__class__.__name__}')
+                                    for line, _ in chunk if line not in failed)
+            # Cross-chunk state may now include rows that never landed
+            context = {'password_hash': context['password_hash']}
+    
+    report['errors'].sort()
+    return report
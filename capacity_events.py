@@ -0,0 +1,111 @@
+"""
+Live Capacity Events
+In-process publish/subscribe fan-out for activity capacity changes
+"""
+import json
+import queue
+import threading
+
+from flask import current_app
+
+
+class Subscription:
+    """One open stream's mailbox of pending events"""
+
+    def __init__(self, activity_ids, queue_size):
+        self.activity_ids = frozenset(activity_ids)
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def get(self, timeout):
+        """Next event, or None if nothing arrived within timeout seconds"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class _CapacityBrokerState:
+    """One app's open subscriptions"""
+
+    def __init__(self, queue_size):
+        self.queue_size = queue_size
+        self.by_activity = {}
+        self.all = set()
+        self.lock = threading.Lock()
+
+
+class CapacityBroker:
+    """
+    Fans committed capacity changes out to every open stream in this process.
+
+    Each stream subscribes to a set of activity ids (or all activities when
+    the set is empty) and gets its own bounded queue, so one slow client can
+    never hold up a publisher. A client that falls too far behind is marked
+    overflowed and told to resync instead of silently missing deltas.
+    Subscriptions belong to the app they were opened on
+    (app.extensions['capacity_broker']).
+    """
+
+    def __init__(self, app=None, queue_size=256):
+        self.queue_size = queue_size
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        queue_size = app.config.get('CAPACITY_STREAM_QUEUE_SIZE', self.queue_size)
+        app.extensions['capacity_broker'] = _CapacityBrokerState(queue_size)
+
+    @property
+    def state(self):
+        """The current app's subscriptions, made by init_app()"""
+        return current_app.extensions['capacity_broker']
+
+    def subscribe(self, activity_ids=()):
+        state = self.state
+        subscription = Subscription(activity_ids, state.queue_size)
+        with state.lock:
+            if subscription.activity_ids:
+                for activity_id in subscription.activity_ids:
+                    state.by_activity.setdefault(activity_id, set()).add(subscription)
+            else:
+                state.all.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        state = self.state
+        with state.lock:
+            state.all.discard(subscription)
+            for activity_id in subscription.activity_ids:
+                subscribers = state.by_activity.get(activity_id)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del state.by_activity[activity_id]
+
+    @property
+    def subscriber_count(self):
+        state = self.state
+        with state.lock:
+            return len(state.all) + len(set().union(*state.by_activity.values()))
+
+    def publish(self, events):
+        """Deliver each event dict (which must carry activity_id) to its subscribers"""
+        state = self.state
+        with state.lock:
+            targets = [(event, state.all | state.by_activity.get(event['activity_id'], set()))
+                       for event in events]
+        for event, subscribers in targets:
+            for subscription in subscribers:
+                try:
+                    subscription.queue.put_nowait(event)
+                except queue.Full:
+                    subscription.overflowed = True
+
+
+def format_sse(data, event=None):
+    """Encode one Server-Sent Events message"""
+    message = ''
+    if event:
+        message += f'event: {event}\n'
+    return message + f'data: {json.dumps(data)}\n\n'
@@ -0,0 +1,154 @@
+"""
+CLI Commands
+Database setup and maintenance commands, registered by create_app()
+"""
+import csv
+import os
+import time
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from assets import build_assets
+from bulk_import import IMPORTERS, import_csv
+from extensions import db
+from models import Activity, Admin, Attendance, Tutor, init_booking_search, rebuild_booking_rollups, rebuild_identity_index
+from template_warmup import precompile_templates
+
+def create_missing_indexes():
+    """Create model indexes that predate tables in an existing database"""
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
+def remove_duplicate_attendance():
+    """
+    Keep only the latest record (by recorded_at, then id) for each child,
+    activity and date, so the unique register index can be created on a
+    database that predates it. Returns [(activity_id, date, child_id, removed)].
+    """
+    groups = db.session.query(Attendance.activity_id, Attendance.date, Attendance.child_id).group_by(
+        Attendance.activity_id, Attendance.date, Attendance.child_id
+    ).having(db.func.count(Attendance.id) > 1).all()
+    
+    removed = []
+    for activity_id, date, child_id in groups:
+        records = Attendance.query.filter_by(activity_id=activity_id, date=date, child_id=child_id).all()
+        records.sort(key=lambda r: (r.recorded_at is not None, r.recorded_at or 0, r.id))
+        for record in records[:-1]:
+            db.session.delete(record)
+        removed.append((activity_id, date, child_id, len(records) - 1))
+    db.session.commit()
+    return removed
+
+def create_schema():
+    """Create tables, drop duplicate rows a unique index would reject, then add missing indexes"""
+    db.create_all()
+    for activity_id, date, child_id, count in remove_duplicate_attendance():
+        print(f"Removed {count} older duplicate attendance record(s) for activity {activity_id}, "
+              f"child {child_id} on {date}")
+    create_missing_indexes()
+
+def init_db():
+    """Create tables and derived indexes, then seed the default accounts"""
+    create_schema()
+    init_booking_search()
+    rebuild_booking_rollups()
+    rebuild_identity_index()
+    
+    # Create Default Admin
+    if not Admin.query.filter_by(email='greenwoodinternationaluk@gmail.com').first():
+        admin = Admin(email='greenwoodinternationaluk@gmail.com')
+        # Use environment variable or default (avoiding hardcoded secret for git)
+        admin.set_password(os.environ.get('ADMIN_PASSWORD', 'change_me'))
+        db.session.add(admin)
+        db.session.commit()
+        print("Admin created: greenwoodinternationaluk@gmail.com")
+        
+    # Create Sample Tutor
+    if not Tutor.query.filter_by(email='tutor@school.edu').first():
+        tutor = Tutor(email='tutor@school.edu', full_name='Sarah Jenkins', specialization='Science & Robotics')
+        tutor.set_password('tutor123')
+        db.session.add(tutor)
+        db.session.commit()
+        print("Tutor created: tutor@school.edu / tutor123")
+        
+    # Create Sample Activities (Assigned to Tutor)
+    if Activity.query.count() == 0:
+        tutor = Tutor.query.filter_by(email='tutor@school.edu').first()
+        activities = [
+            Activity(name='Robotics Club', description='Build robots', price=50.0, day_of_week='Monday', start_time='15:00', end_time='16:30', tutor_id=tutor.id),
+            Activity(name='Swimming', description='Pool time', price=30.0, day_of_week='Tuesday', start_time='15:00', end_time='16:30', tutor_id=tutor.id),
+        ]
+        db.session.add_all(activities)
+        db.session.commit()
+
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """Create the database and seed the default admin, tutor and activities"""
+    init_db()
+
+@click.command('build-assets')
+@with_appcontext
+def build_assets_command():
+    """Write fingerprinted, precompressed static assets to static/dist"""
+    assets = build_assets(current_app.static_folder)
+    for name, asset in sorted(assets.items()):
+        print(f"{name} -> {asset['path']} ({asset['size']} bytes; {', '.join(asset['encodings']) or 'uncompressed'})")
+    print(f"Built {len(assets)} asset(s); restart workers to serve them")
+
+@click.command('precompile-templates')
+@with_appcontext
+def precompile_templates_command():
+    """Compile every template, filling the bytecode cache if one is configured"""
+    compiled, seconds = precompile_templates(current_app)
+    print(f"Compiled {compiled} templates in {seconds * 1000:.0f} ms")
+
+@click.command('rebuild-rollups')
+@with_appcontext
+def rebuild_rollups_command():
+    """Recompute booking rollups from scratch and report any drift"""
+    differences = rebuild_booking_rollups()
+    for (scope, key), (stored, rebuilt) in sorted(differences.items()):
+        print(f"{scope}:{key or '-'} stored={stored[0]}/£{stored[1]:.2f} rebuilt={rebuilt[0]}/£{rebuilt[1]:.2f}")
+    print(f"Booking rollups rebuilt ({len(differences)} row(s) differed)")
+
+@click.command('rebuild-identities')
+@with_appcontext
+def rebuild_identities_command():
+    """Rebuild the cross-role email index and list any duplicate emails"""
+    conflicts = rebuild_identity_index()
+    for email, role, user_id in conflicts:
+        print(f"{email} is also used by {role} #{user_id}; that account is not indexed")
+    print(f"Identity index rebuilt ({len(conflicts)} conflict(s))")
+
+@click.command('import-csv')
+@with_appcontext
+@click.argument('kind', type=click.Choice(sorted(IMPORTERS)))
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--errors', 'errors_path', type=click.Path(dir_okay=False), help='Write the row-level error report to this CSV file')
+def import_csv_command(kind, path, errors_path):
+    """Bulk import activities, families or bookings from a CSV file"""
+    started = time.monotonic()
+    with open(path, newline='', encoding='utf-8-sig') as stream:
+        report = import_csv(kind, stream)
+    print(f"Imported {report['imported']} of {report['rows']} {kind} row(s) "
+          f"in {time.monotonic() - started:.1f}s; {len(report['errors'])} error(s)")
+    for first, last, reason in report['failures']:
+        print(f"  lines {first}-{last} rejected by the database: {reason}")
+    
+    if errors_path:
+        with open(errors_path, 'w', newline='') as out:
+            writer = csv.writer(out)
+            writer.writerow(['line', 'error'])
+            writer.writerows(report['errors'])
+    else:
+        for line, message in report['errors'][:50]:
+            print(f'  line {line}: {message}')
+
+def register_commands(app):
+    for command in (init_db_command, build_assets_command, precompile_templates_command, rebuild_rollups_command,
+                    rebuild_identities_command, import_csv_command):
+        app.cli.add_command(command)
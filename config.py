@@ -26,6 +26,7 @@ class Config:
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME', 'greenwoodinternationaluk@gmail.com')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD', 'muesmgjpulyscdmv')
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER', 'greenwoodinternationaluk@gmail.com')
+    MAIL_SENDER_NAME = os.environ.get('MAIL_SENDER_NAME', 'Greenwood International School')
     MAIL_SUPPRESS_SEND = os.environ.get('MAIL_SUPPRESS_SEND', 'false').lower() == 'true'
     MAIL_MAX_EMAILS = None
     MAIL_ASCII_ATTACHMENTS = False
@@ -48,20 +49,91 @@ class Config:
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file upload
     UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
     
+    # Rate limits for password-hashing and email-sending routes, per client IP
+    # and per posted email. Set RATE_LIMIT_URL to a redis:// URL to share
+    # buckets across workers.
+    RATE_LIMIT_ENABLED = True
+    RATE_LIMIT_URL = os.environ.get('RATE_LIMIT_URL')
+    RATE_LIMITS = {
+        'login': {'ip': '20/minute', 'account': '5/minute'},
+        'admin_login': {'ip': '10/minute', 'account': '5/minute'},
+        'tutor_login': {'ip': '20/minute', 'account': '5/minute'},
+        'forgot_password': {'ip': '5/minute', 'account': '3/hour'},
+        'contact': {'ip': '5/hour'},
+        'admissions_inquiry': {'ip': '5/hour', 'account': '3/hour'},
+    }
+    
+    # Password hashing policy: any werkzeug method string, e.g. 'scrypt:32768:8:1'
+    # or 'pbkdf2:sha256:600000'. Existing hashes are upgraded on the next login.
+    # Hashing runs on PASSWORD_HASH_WORKERS threads with at most
+    # PASSWORD_HASH_QUEUE waiting; beyond that requests get a 503.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 0))  # 0 = min(4, CPU count)
+    PASSWORD_HASH_QUEUE = int(os.environ.get('PASSWORD_HASH_QUEUE', 32))
+    PASSWORD_HASH_WAIT_SECONDS = 5
+    
+    # Staff notification recipients per event type. Entries are email
+    # addresses or '@admins' (every admin account); 'default' covers the rest.
+    NOTIFICATION_RECIPIENTS = {
+        'default': ['@admins'],
+        'booking': ['@admins'],
+        'tutor_application': ['@admins'],
+        'contact': ['@admins'],
+        'admissions_inquiry': ['@admins'],
+    }
+    NOTIFICATION_CACHE_SECONDS = 300
+    
+    # JSON provider for API responses: 'auto' (orjson if installed), 'orjson' or 'stdlib'
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'auto')
+    
     # Pagination
     ITEMS_PER_PAGE = 20
+    BOOKING_COUNT_CACHE_SECONDS = int(os.environ.get('BOOKING_COUNT_CACHE_SECONDS', 60))
+    EXPORT_BATCH_SIZE = 1000  # Rows fetched per yield_per batch in CSV/NDJSON exports
+    IMPORT_CHUNK_SIZE = 1000  # Rows validated and inserted per batch in CSV imports
+    
+    # Fragment Cache (set FRAGMENT_CACHE_URL to a redis:// URL to share across workers)
+    FRAGMENT_CACHE_ENABLED = True
+    FRAGMENT_CACHE_MAX_ENTRIES = int(os.environ.get('FRAGMENT_CACHE_MAX_ENTRIES', 512))
+    FRAGMENT_CACHE_URL = os.environ.get('FRAGMENT_CACHE_URL')
+    FRAGMENT_CACHE_TTL = int(os.environ.get('FRAGMENT_CACHE_TTL', 3600))
+    
+    # Seconds a worker serves /api/activities from memory before re-reading
+    # (changes made through this worker invalidate it immediately)
+    ACTIVITY_CATALOGUE_CACHE_SECONDS = int(os.environ.get('ACTIVITY_CATALOGUE_CACHE_SECONDS', 300))
+    
+    # Live capacity stream (each open stream holds a worker thread/greenlet)
+    CAPACITY_STREAM_KEEPALIVE_SECONDS = 15
+    CAPACITY_STREAM_MAX_SECONDS = int(os.environ.get('CAPACITY_STREAM_MAX_SECONDS', 300))
+    CAPACITY_STREAM_QUEUE_SIZE = 256
+    
+    # Templates: production turns off per-render file checks, keeps compiled
+    # templates in a bytecode cache and compiles them all at startup
+    JINJA_BYTECODE_CACHE = False
+    JINJA_BYTECODE_CACHE_DIR = os.environ.get('JINJA_BYTECODE_CACHE_DIR')  # default: instance/jinja_cache
+    TEMPLATE_PRECOMPILE = False
+    
+    # Static assets: serve the fingerprinted copies from `flask build-assets`
+    # when static/dist/manifest.json exists (cached by browsers for a year)
+    ASSET_FINGERPRINTS = True
+    ASSET_MAX_AGE = 31536000
 
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
     TESTING = False
     SQLALCHEMY_ECHO = False  # Enable to see SQL queries
+    TEMPLATES_AUTO_RELOAD = True
+    ASSET_FINGERPRINTS = False  # Serve static/ as edited
 
 class ProductionConfig(Config):
     """Production configuration - SECURE DEFAULTS"""
     DEBUG = False
     TESTING = False
     SESSION_COOKIE_SECURE = True  # Require HTTPS
+    TEMPLATES_AUTO_RELOAD = False
+    JINJA_BYTECODE_CACHE = True
+    TEMPLATE_PRECOMPILE = True
     
     # Override with environment variables (REQUIRED in production)
     @classmethod
@@ -77,6 +149,10 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
+    FRAGMENT_CACHE_ENABLED = False
+    RATE_LIMIT_ENABLED = False
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+    MAIL_SUPPRESS_SEND = True
 
 config = {
     'development': DevelopmentConfig,
@@ -0,0 +1,371 @@
+"""
+Email Functions
+Branded notification emails sent by the routes
+"""
+from datetime import datetime
+
+from flask import url_for
+from flask_mail import Message
+
+from extensions import mail, notifications
+
+
+# ==================== Professional Email Functions ====================
+
+def send_tutor_application_email(tutor):
+    """Send emails when tutor applies"""
+    try:
+        # Tutor confirmation
+        tutor_msg = Message(
+            subject='Application Received - Greenwood International',
+            recipients=[tutor.email]
+        )
+        tutor_msg.html = f"""
+        <html>
+        <body style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; line-height: 1.6; color: #333; background-color: #f4f4f4; padding: 20px;">
+            <div style="max-width: 600px; margin: 0 auto; background: #ffffff; padding: 40px; border-radius: 10px; box-shadow: 0 4px 15px rgba(0,0,0,0.05);">
+                <div style="text-align: center; margin-bottom: 30px;">
+                    <h1 style="color: #002E5D; margin: 0;">Greenwood International</h1>
+                    <p style="color: #666; font-size: 14px;">Excellence in Education</p>
+                </div>
+                
+                <h2 style="color: #002E5D; margin-top: 0;">Application Received</h2>
+                <p>Dear {tutor.full_name},</p>
+                <p>Thank you for applying to join our team at Greenwood International School.</p>
+                <p>We have successfully received your application details. Our administrative team will review your qualifications and experience shortly.</p>
+                
+                <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #ffc107;">
+                    <p style="margin: 0;"><strong>Application Date:</strong> {tutor.created_at.strftime('%B %d, %Y')}</p>
+                    <p style="margin: 10px 0 0 0;"><strong>Current Status:</strong> <span style="color: #ffc107; font-weight: bold;">Pending Review</span></p>
+                </div>
+                
+                <p>You will receive another email notification once a decision has been made.</p>
+                
+                <div style="margin-top: 40px; padding-top: 20px; border-top: 1px solid #eee; font-size: 12px; color: #999; text-align: center;">
+                    <p>&copy; {datetime.now().year} Greenwood International School. All rights reserved.</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+        
+        # Admin notification
+        admin_recipients = notifications.recipients('tutor_application')
+        if admin_recipients:
+            admin_msg = Message(
+                subject=f'New Tutor Application: {tutor.full_name}',
+                recipients=admin_recipients
+            )
+            admin_msg.html = f"""
+            <html>
+            <body style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; line-height: 1.6; color: #333; background-color: #f4f4f4; padding: 20px;">
+                <div style="max-width: 600px; margin: 0 auto; background: #ffffff; padding: 40px; border-radius: 10px; box-shadow: 0 4px 15px rgba(0,0,0,0.05);">
+                    <div style="text-align: center; margin-bottom: 30px;">
+                        <h1 style="color: #002E5D; margin: 0;">Greenwood International</h1>
+                        <p style="color: #666; font-size: 14px;">Admin Notification</p>
+                    </div>
+                    
+                    <h2 style="color: #002E5D; margin-top: 0;">New Tutor Application</h2>
+                    <p>A new tutor application has been submitted and requires review.</p>
+                    
+                    <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0;">
+                        <table style="width: 100%;">
+                            <tr>
+                                <td style="padding: 5px 0; font-weight: bold; width: 30%;">Name:</td>
+                                <td style="padding: 5px 0;">{tutor.full_name}</td>
+                            </tr>
+                            <tr>
+                                <td style="padding: 5px 0; font-weight: bold;">Email:</td>
+                                <td style="padding: 5px 0;">{tutor.email}</td>
+                            </tr>
+                            <tr>
+                                <td style="padding: 5px 0; font-weight: bold;">Specialization:</td>
+                                <td style="padding: 5px 0;">{tutor.specialization}</td>
+                            </tr>
+                        </table>
+                    </div>
+                    
+                    <div style="text-align: center; margin: 30px 0;">
+                        <a href="http://127.0.0.1:5000/admin/pending-tutors" style="background-color: #002E5D; color: white; padding: 14px 28px; text-decoration: none; border-radius: 50px; font-weight: bold; display: inline-block;">
+                            Review Application
+                        </a>
+                    </div>
+                    
+                    <div style="margin-top: 40px; padding-top: 20px; border-top: 1px solid #eee; font-size: 12px; color: #999; text-align: center;">
+                        <p>&copy; {datetime.now().year} Greenwood International School. All rights reserved.</p>
+                    </div>
+                </div>
+            </body>
+            </html>
+            """
+            mail.send(admin_msg)
+        
+        mail.send(tutor_msg)
+        return True
+    except Exception as e:
+        print(f'Email error: {e}')
+        return False
+
+def send_tutor_approval_email(tutor):
+    """Send approval email"""
+    try:
+        msg = Message(
+            subject='Application Approved - Welcome to Greenwood!',
+            recipients=[tutor.email]
+        )
+        msg.html = f"""
+        <html>
+        <body style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; line-height: 1.6; color: #333; background-color: #f4f4f4; padding: 20px;">
+            <div style="max-width: 600px; margin: 0 auto; background: #ffffff; padding: 40px; border-radius: 10px; box-shadow: 0 4px 15px rgba(0,0,0,0.05);">
+                <div style="text-align: center; margin-bottom: 30px;">
+                    <h1 style="color: #002E5D; margin: 0;">Greenwood International</h1>
+                    <p style="color: #666; font-size: 14px;">Welcome</p>
+                </div>
+                
+                <h2 style="color: #28a745; margin-top: 0; text-align: center;">Congratulations!</h2>
+                <p>Dear {tutor.full_name},</p>
+                
+                <p>We are pleased to inform you that your application to join Greenwood International School as a tutor has been <strong>APPROVED</strong>.</p>
+                
+                <p>You can now log in to the Tutor Portal to set up your profile, view activity assignments, and manage your schedules.</p>
+                
+                <div style="text-align: center; margin: 30px 0;">
+                    <a href="http://127.0.0.1:5000/tutor/login" style="background-color: #28a745; color: white; padding: 14px 28px; text-decoration: none; border-radius: 50px; font-weight: bold; display: inline-block;">
+                        Access Tutor Portal
+                    </a>
+                </div>
+                
+                <p>We look forward to working with you!</p>
+                
+                <div style="margin-top: 40px; padding-top: 20px; border-top: 1px solid #eee; font-size: 12px; color: #999; text-align: center;">
+                    <p>&copy; {datetime.now().year} Greenwood International School. All rights reserved.</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+        mail.send(msg)
+        return True
+    except Exception as e:
+        print(f'Email error: {e}')
+        return False
+
+def send_activity_assignment_email(tutor, activity):
+    """Send email when tutor is assigned to an activity"""
+    try:
+        msg = Message(
+            subject=f'New Activity Assignment: {activity.name}',
+            recipients=[tutor.email]
+        )
+        msg.html = f"""
+        <html>
+        <body style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; line-height: 1.6; color: #333; background-color: #f4f4f4; padding: 20px;">
+            <div style="max-width: 600px; margin: 0 auto; background: #ffffff; padding: 40px; border-radius: 10px; box-shadow: 0 4px 15px rgba(0,0,0,0.05);">
+                <div style="text-align: center; margin-bottom: 30px;">
+                    <h1 style="color: #002E5D; margin: 0;">Greenwood International</h1>
+                    <p style="color: #666; font-size: 14px;">Activity Assignment</p>
+                </div>
+                
+                <h2 style="color: #002E5D; margin-top: 0;">New Activity Assignment</h2>
+                <p>Dear {tutor.full_name},</p>
+                
+                <p>You have been assigned to lead the following activity:</p>
+                
+                <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #002E5D;">
+                    <h3 style="margin-top: 0; color: #002E5D;">{activity.name}</h3>
+                    <table style="width: 100%;">
+                        <tr>
+                            <td style="padding: 5px 0; font-weight: bold; width: 30%;">Day:</td>
+                            <td style="padding: 5px 0;">{activity.day_of_week}</td>
+                        </tr>
+                        <tr>
+                            <td style="padding: 5px 0; font-weight: bold;">Time:</td>
+                            <td style="padding: 5px 0;">{activity.start_time} - {activity.end_time}</td>
+                        </tr>
+                        <tr>
+                            <td style="padding: 5px 0; font-weight: bold;">Price:</td>
+                            <td style="padding: 5px 0;">£{activity.price:.2f}</td>
+                        </tr>
+                    </table>
+                </div>
+                
+                <p>Please log in to your dashboard to view student enrollments and manage attendance.</p>
+                
+                <div style="text-align: center; margin: 30px 0;">
+                    <a href="http://127.0.0.1:5000/tutor/login" style="background-color: #002E5D; color: white; padding: 14px 28px; text-decoration: none; border-radius: 50px; font-weight: bold; display: inline-block;">
+                        Access Dashboard
+                    </a>
+                </div>
+                
+                <div style="margin-top: 40px; padding-top: 20px; border-top: 1px solid #eee; font-size: 12px; color: #999; text-align: center;">
+                    <p>&copy; {datetime.now().year} Greenwood International School. All rights reserved.</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+        mail.send(msg)
+        return True
+    except Exception as e:
+        print(f'Email error: {e}')
+        return False
+
+def send_tutor_rejection_email(tutor):
+    """Send rejection email"""
+    try:
+        msg = Message(
+            subject='Application Update - Greenwood International',
+            recipients=[tutor.email]
+        )
+        msg.html = f"""
+        <html>
+        <body style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; line-height: 1.6; color: #333; background-color: #f4f4f4; padding: 20px;">
+            <div style="max-width: 600px; margin: 0 auto; background: #ffffff; padding: 40px; border-radius: 10px; box-shadow: 0 4px 15px rgba(0,0,0,0.05);">
+                <div style="text-align: center; margin-bottom: 30px;">
+                    <h1 style="color: #002E5D; margin: 0;">Greenwood International</h1>
+                    <p style="color: #666; font-size: 14px;">Application Update</p>
+                </div>
+                
+                <h2 style="color: #333; margin-top: 0;">Application Status</h2>
+                <p>Dear {tutor.full_name},</p>
+                
+                <p>Thank you for your interest in joining Greenwood International School.</p>
+                
+                <p>We appreciate the time you took to apply. However, after careful review of your qualifications, we have decided not to proceed with your application at this time.</p>
+                
+                <p>We wish you the best in your future endeavors and encourage you to check back for future openings.</p>
+                
+                <div style="margin-top: 40px; padding-top: 20px; border-top: 1px solid #eee; font-size: 12px; color: #999; text-align: center;">
+                    <p>&copy; {datetime.now().year} Greenwood International School. All rights reserved.</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+        mail.send(msg)
+        return True
+    except Exception as e:
+        print(f'Email error: {e}')
+        return False
+
+def send_password_reset_email(user_email, token, user_type):
+    """Send password reset link"""
+    try:
+        reset_url = url_for('public.reset_password', token=token, _external=True)
+        
+        msg = Message(
+            subject='Password Reset Request - Greenwood International',
+            sender=notifications.sender,
+            recipients=[user_email]
+        )
+        
+        msg.html = f"""
+        <html>
+        <body style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; line-height: 1.6; color: #333; background-color: #f4f4f4; padding: 20px;">
+            <div style="max-width: 600px; margin: 0 auto; background: #ffffff; padding: 40px; border-radius: 10px; box-shadow: 0 4px 15px rgba(0,0,0,0.05);">
+                <div style="text-align: center; margin-bottom: 30px;">
+                    <h2 style="color: #002E5D; margin: 0;">Password Reset</h2>
+                    <p style="color: #666; font-size: 14px;">Greenwood International School</p>
+                </div>
+                
+                <p>Hello,</p>
+                
+                <p>We received a request to reset the password for your <strong>{user_type}</strong> account.</p>
+                
+                <p>Click the button below to set a new password. This link is valid for 1 hour.</p>
+                
+                <div style="text-align: center; margin: 30px 0;">
+                    <a href="{reset_url}" style="background-color: #0DA49F; color: white; padding: 14px 28px; text-decoration: none; border-radius: 50px; font-weight: bold; display: inline-block; box-shadow: 0 4px 6px rgba(13, 164, 159, 0.2);">
+                        Reset Password
+                    </a>
+                </div>
+                
+                <p style="font-size: 13px; color: #666;">
+                    If you didn't request this, you can safely ignore this email. Your password will remain unchanged.
+                </p>
+                
+                <div style="margin-top: 40px; padding-top: 20px; border-top: 1px solid #eee; font-size: 12px; color: #999; text-align: center;">
+                    <p>&copy; {datetime.now().year} Greenwood International School. All rights reserved.</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+        mail.send(msg)
+        return True
+    except Exception as e:
+        print(f'Email error: {e}')
+        return False
+
+
+
+def get_email_template(content_html, title="Greenwood International School"):
+    """Professional email template with branding"""
+    return f"""
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>{title}</title>
+    </head>
+    <body style="margin: 0; padding: 0; font-family: 'Segoe UI', Arial, sans-serif; background-color: #f5f5f5;">
+        <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5;">
+            <tr>
+                <td align="center" style="padding: 40px 20px;">
+                    <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
+                        <!-- Header -->
+                        <tr>
+                            <td style="background: linear-gradient(135deg, #002E5D 0%, #0DA49F 100%); padding: 30px; text-align: center; border-radius: 8px 8px 0 0;">
+                                <h1 style="margin: 0; color: #ffffff; font-size: 28px; letter-spacing: 1px;">
+                                    🏫 GREENWOOD INTERNATIONAL SCHOOL
+                                </h1>
+                                <p style="margin: 5px 0 0 0; color: #D4AF37; font-size: 14px; letter-spacing: 2px;">
+                                    EXCELLENCE • TRADITION • INNOVATION
+                                </p>
+                            </td>
+                        </tr>
+                        
+                        <!-- Content -->
+                        <tr>
+                            <td style="padding: 40px 30px;">
+                                {content_html}
+                            </td>
+                        </tr>
+                        
+                        <!-- Footer -->
+                        <tr>
+                            <td style="background-color: #002E5D; padding: 30px; border-radius: 0 0 8px 8px;">
+                                <table width="100%" cellpadding="0" cellspacing="0">
+                                    <tr>
+                                        <td style="color: #ffffff; font-size: 14px; line-height: 1.6;">
+                                            <strong style="color: #D4AF37;">Greenwood International School</strong><br>
+                                            Greenwood Hall, Henley-on-Thames<br>
+                                            Oxfordshire, RG9 1AA, United Kingdom<br>
+                                            <br>
+                                            📞 +44 (0) 1491 570000<br>
+                                            📧 greenwoodinternationaluk@gmail.com<br>
+                                            🌐 www.greenwood.edu
+                                        </td>
+                                        <td align="right" style="vertical-align: top;">
+                                            <a href="#" style="margin: 0 5px;"><img src="https://img.icons8.com/ios-filled/30/D4AF37/twitter.png" alt="Twitter"/></a>
+                                            <a href="#" style="margin: 0 5px;"><img src="https://img.icons8.com/ios-filled/30/D4AF37/facebook.png" alt="Facebook"/></a>
+                                            <a href="#" style="margin: 0 5px;"><img src="https://img.icons8.com/ios-filled/30/D4AF37/linkedin.png" alt="LinkedIn"/></a>
+                                        </td>
+                                    </tr>
+                                    <tr>
+                                        <td colspan="2" style="padding-top: 20px; text-align: center; color: #999; font-size: 11px;">
+                                            Registered Charity No. 123456 | Registered in England & Wales No. 9876543<br>
+                                            © 2025 Greenwood International School. All rights reserved.
+                                        </td>
+                                    </tr>
+                                </table>
+                            </td>
+                        </tr>
+                    </table>
+                </td>
+            </tr>
+        </table>
+    </body>
+    </html>
+    """
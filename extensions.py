@@ -0,0 +1,24 @@
+"""
+Flask Extensions
+Created unbound here and attached to an app by create_app()
+"""
+from flask_mail import Mail
+from flask_sqlalchemy import SQLAlchemy
+from flask_wtf.csrf import CSRFProtect
+
+from assets import AssetPipeline
+from capacity_events import CapacityBroker
+from fragment_cache import FragmentCache
+from notifications import NotificationRouter
+from password_hashing import PasswordHasher
+from rate_limit import RateLimiter
+
+db = SQLAlchemy()
+mail = Mail()
+csrf = CSRFProtect()
+fragment_cache = FragmentCache()
+capacity_broker = CapacityBroker()
+rate_limiter = RateLimiter()
+password_hasher = PasswordHasher()
+notifications = NotificationRouter()
+assets = AssetPipeline()
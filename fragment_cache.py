@@ -0,0 +1,197 @@
+"""
+Template Fragment Cache
+Caches rendered blocks of Jinja templates, keyed by a global data version
+"""
+import threading
+from collections import OrderedDict
+
+from flask import current_app, g
+from markupsafe import Markup
+
+
+class LRUStore:
+    """Bounded in-process store that evicts the least recently used entry"""
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisBackend:
+    """Shared store so every worker sees the same fragments and version"""
+
+    def __init__(self, url, ttl=3600, prefix='fragment:'):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return value.decode('utf-8') if value is not None else None
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, value, ex=self.ttl)
+
+    def get_version(self):
+        return int(self.client.get(self.prefix + 'version') or 0)
+
+    def bump_version(self):
+        return self.client.incr(self.prefix + 'version')
+
+
+class LazyData:
+    """
+    Defers a loader until a template first reads from it, so a view can
+    skip its queries entirely when every fragment using them is cached.
+    """
+
+    def __init__(self, loader, *args, **kwargs):
+        self._loader = loader
+        self._args = args
+        self._kwargs = kwargs
+        self._data = None
+
+    def _load(self):
+        if self._data is None:
+            self._data = self._loader(*self._args, **self._kwargs)
+        return self._data
+
+    def __getattr__(self, name):
+        try:
+            return self._load()[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __getitem__(self, name):
+        return self._load()[name]
+
+
+class _FragmentCacheState:
+    """One app's fragment stores and process-local version"""
+
+    def __init__(self, app):
+        self.enabled = app.config.get('FRAGMENT_CACHE_ENABLED', True)
+        self.local = LRUStore(app.config.get('FRAGMENT_CACHE_MAX_ENTRIES', 512))
+        self.shared = None
+        self.version = 0
+        self.lock = threading.Lock()
+
+        url = app.config.get('FRAGMENT_CACHE_URL')
+        if url:
+            try:
+                self.shared = RedisBackend(url, ttl=app.config.get('FRAGMENT_CACHE_TTL', 3600))
+            except ImportError:
+                app.logger.warning('FRAGMENT_CACHE_URL is set but redis is not installed; using in-process cache only')
+
+
+class FragmentCache:
+    """
+    Flask extension for caching template fragments.
+
+    Templates wrap a block in {% call cached_fragment('name', key...) %}.
+    Keys include a version counter that the app bumps whenever data the
+    fragments depend on is written, so stale fragments are never served.
+    Fragments are kept in a bounded LRU in each process, backed by a shared
+    Redis store when FRAGMENT_CACHE_URL is set. Each app gets its own
+    stores in app.extensions['fragment_cache'].
+
+    Every process must see the same version. It comes from Redis when
+    FRAGMENT_CACHE_URL is set, otherwise from the function registered with
+    version_source() (the app reads it from the database). Without either,
+    the counter is local and only suits a single process. A source
+    returning None (e.g. its table does not exist yet) disables caching.
+    """
+
+    def __init__(self, app=None):
+        self._version_source = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['fragment_cache'] = _FragmentCacheState(app)
+        app.add_template_global(self.cached_fragment)
+
+    @property
+    def state(self):
+        """The current app's stores, made by init_app()"""
+        return current_app.extensions['fragment_cache']
+
+    def version_source(self, f):
+        """Decorator registering a function that returns the shared data version"""
+        self._version_source = f
+        return f
+
+    @property
+    def version(self):
+        """Current data version, read at most once per request"""
+        state = self.state
+        if state.shared is not None:
+            load = state.shared.get_version
+        elif self._version_source is not None:
+            load = self._version_source
+        else:
+            return state.version
+        if 'fragment_version' not in g:
+            g.fragment_version = load()
+        return g.fragment_version
+
+    def bump(self):
+        """
+        Invalidate every fragment by moving to a new version. The shared
+        version in the database is bumped by the caller after its commit.
+        """
+        state = self.state
+        with state.lock:
+            state.version += 1
+        if state.shared is not None:
+            state.shared.bump_version()
+        g.pop('fragment_version', None)
+        state.local.clear()
+
+    def get(self, key):
+        state = self.state
+        value = state.local.get(key)
+        if value is None and state.shared is not None:
+            value = state.shared.get(key)
+            if value is not None:
+                state.local.set(key, value)
+        return value
+
+    def set(self, key, value):
+        state = self.state
+        state.local.set(key, value)
+        if state.shared is not None:
+            state.shared.set(key, value)
+
+    def cached_fragment(self, name, *keys, caller):
+        """Template global: render caller() once per name, keys and version"""
+        version = self.version if self.state.enabled else None
+        if version is None:
+            return caller()
+
+        key = ':'.join([name, str(version)] + [str(k) for k in keys])
+        html = self.get(key)
+        if html is None:
+            html = str(caller())
+            self.set(key, html)
+        return Markup(html)
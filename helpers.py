@@ -0,0 +1,397 @@
+"""
+Helpers & Decorators
+Access control, waitlist promotion and booking confirmation
+"""
+import re
+from datetime import datetime
+from functools import wraps
+
+from flask import g, redirect, request, session, url_for
+from flask_mail import Message
+
+from extensions import db, mail, notifications, password_hasher
+from models import Activity, Admin, Booking, Parent, Tutor, Waitlist
+
+
+# ==================== Helpers & Decorators ====================
+
+EMAIL_REGEX = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PHONE_REGEX = re.compile(r'^[0-9+\s-]{10,15}$')  # Digits, +, -, space
+
+SESSION_ACCOUNTS = {'parent': ('parent_id', Parent), 'tutor': ('tutor_id', Tutor), 'admin': ('admin_id', Admin)}
+
+def parse_date(value):
+    """A YYYY-MM-DD string as a date, or None if it is missing or malformed"""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+    except (TypeError, ValueError):
+        return None
+
+def load_current_user(role):
+    """
+    The logged-in parent, tutor or admin as g.parent / g.tutor / g.admin.
+    Fetched at most once per request, then shared by decorators, handlers
+    and templates. None if not logged in or the account no longer exists.
+    """
+    if role not in g:
+        key, model = SESSION_ACCOUNTS[role]
+        user_id = session.get(key)
+        setattr(g, role, db.session.get(model, user_id) if user_id is not None else None)
+    return g.get(role)
+
+def login_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if load_current_user('parent') is None:
+            session.pop('parent_id', None)
+            return redirect(url_for('parent.login', next=request.url))
+        return f(*args, **kwargs)
+    return decorated_function
+
+def admin_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if load_current_user('admin') is None:
+            session.pop('admin_id', None)
+            return redirect(url_for('admin.admin_login', next=request.url))
+        return f(*args, **kwargs)
+    return decorated_function
+
+def tutor_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if load_current_user('tutor') is None:
+            session.pop('tutor_id', None)
+            return redirect(url_for('tutor.tutor_login', next=request.url))
+        return f(*args, **kwargs)
+    return decorated_function
+
+def rehash_password_if_needed(user, password):
+    """Re-hash a just-verified password when PASSWORD_HASH_METHOD has changed"""
+    if password_hasher.needs_rehash(user.password):
+        user.set_password(password)
+        db.session.commit()
+
+def promote_waitlist_user(activity_id, booking_date):
+    """
+    Promotes the oldest waitlisted user for a specific activity and date.
+    """
+    # Find oldest waitlist entry
+    next_in_line = Waitlist.query.filter_by(
+        activity_id=activity_id,
+        request_date=booking_date,
+        status='waiting'
+    ).order_by(Waitlist.created_at.asc()).first()
+    
+    if next_in_line:
+        # Create booking for them
+        activity = Activity.query.get(activity_id)
+        new_booking = Booking(
+            parent_id=next_in_line.parent_id,
+            child_id=next_in_line.child_id,
+            activity_id=activity_id,
+            booking_date=booking_date,
+            cost=activity.price,
+            status='confirmed'
+        )
+        
+        # Update waitlist status
+        next_in_line.status = 'promoted'
+        
+        db.session.add(new_booking)
+        db.session.commit()
+        
+        # In a real app, we would send an email here
+        print(f"Promoted child {next_in_line.child_id} from waitlist for activity {activity_id}")
+        return True
+    return False
+
+# Helper function to generate .ics calendar file
+def generate_ics_file(booking):
+    """Generate iCalendar (.ics) file for booking"""
+    activity = booking.activity
+    child = booking.child
+    
+    # Parse time strings
+    start_time_str = activity.start_time
+    end_time_str = activity.end_time
+    
+    # Create datetime objects for the event
+    event_date = booking.booking_date
+    start_hour, start_min = map(int, start_time_str.split(':'))
+    end_hour, end_min = map(int, end_time_str.split(':'))
+    
+    start_datetime = datetime.combine(event_date, datetime.min.time()).replace(hour=start_hour, minute=start_min)
+    end_datetime = datetime.combine(event_date, datetime.min.time()).replace(hour=end_hour, minute=end_min)
+    
+    # Format for iCal (YYYYMMDDTHHmmss)
+    dtstart = start_datetime.strftime('%Y%m%dT%H%M%S')
+    dtend = end_datetime.strftime('%Y%m%dT%H%M%S')
+    dtstamp = datetime.now().strftime('%Y%m%dT%H%M%S')
+    
+    tutor_name = activity.tutor.full_name if activity.tutor else 'To Be Assigned'
+    
+    ics_content = f"""BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//Greenwood International School//Activity Booking//EN
+CALSCALE:GREGORIAN
+METHOD:REQUEST
+BEGIN:VEVENT
+DTSTART:{dtstart}
+DTEND:{dtend}
+DTSTAMP:{dtstamp}
+UID:booking-{booking.id}@greenwoodinternationaluk.gmail.com
+SUMMARY:{activity.name} - {child.name}
+DESCRIPTION:Activity: {activity.name}\\nStudent: {child.name}\\nTutor: {tutor_name}\\nDay: {activity.day_of_week}\\nTime: {start_time_str} - {end_time_str}\\n\\n{activity.description}
+LOCATION:Greenwood International School\\, Henley-on-Thames
+ORGANIZER;CN={tutor_name}:mailto:{notifications.sender[1]}
+STATUS:CONFIRMED
+SEQUENCE:0
+BEGIN:VALARM
+TRIGGER:-PT24H
+ACTION:DISPLAY
+DESCRIPTION:Reminder: {activity.name} tomorrow
+END:VALARM
+END:VEVENT
+END:VCALENDAR"""
+    
+    return ics_content
+
+# Helper function to send booking confirmation emails
+def send_booking_confirmation_email(booking):
+    """Send booking confirmation email to parent and tutor with .ics attachment"""
+    try:
+        parent = booking.parent
+        child = booking.child
+        activity = booking.activity
+        tutor = activity.tutor
+        
+        # Generate .ics calendar file
+        ics_content = generate_ics_file(booking)
+        
+        # === Email to Parent ===
+        parent_msg = Message(
+            subject=f'Booking Confirmed: {activity.name} for {child.name}',
+            sender=notifications.sender,
+            recipients=[parent.email]
+        )
+        
+        parent_msg.html = f"""
+        <html>
+        <body style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; line-height: 1.6; color: #333; background-color: #f4f4f4; padding: 20px;">
+            <div style="max-width: 600px; margin: 0 auto; background: #ffffff; padding: 40px; border-radius: 10px; box-shadow: 0 4px 15px rgba(0,0,0,0.05);">
+                <div style="text-align: center; margin-bottom: 30px;">
+                    <h1 style="color: #002E5D; margin: 0;">Greenwood International</h1>
+                    <p style="color: #666; font-size: 14px;">Booking Confirmation</p>
+                </div>
+                
+                <h2 style="color: #28a745; margin-top: 0;">Booking Confirmed</h2>
+                <p>Dear {parent.full_name},</p>
+                <p>Thank you for booking an activity at Greenwood International School. We are pleased to confirm your booking.</p>
+                
+                <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #28a745;">
+                    <h3 style="color: #002E5D; margin-top: 0;">Booking Details</h3>
+                    <table style="width: 100%; border-collapse: collapse;">
+                        <tr>
+                            <td style="padding: 5px 0; font-weight: bold; width: 40%;">Booking ID:</td>
+                            <td style="padding: 5px 0;">#{booking.id}</td>
+                        </tr>
+                        <tr>
+                            <td style="padding: 5px 0; font-weight: bold;">Activity:</td>
+                            <td style="padding: 5px 0;">{activity.name}</td>
+                        </tr>
+                        <tr>
+                            <td style="padding: 5px 0; font-weight: bold;">Student:</td>
+                            <td style="padding: 5px 0;">{child.name} (Year {child.grade})</td>
+                        </tr>
+                        <tr>
+                            <td style="padding: 5px 0; font-weight: bold;">Date:</td>
+                            <td style="padding: 5px 0;">{booking.booking_date.strftime('%A, %d %B %Y')}</td>
+                        </tr>
+                        <tr>
+                            <td style="padding: 5px 0; font-weight: bold;">Time:</td>
+                            <td style="padding: 5px 0;">{activity.start_time} - {activity.end_time}</td>
+                        </tr>
+                        <tr>
+                            <td style="padding: 5px 0; font-weight: bold;">Day:</td>
+                            <td style="padding: 5px 0;">{activity.day_of_week}</td>
+                        </tr>
+                        <tr>
+                            <td style="padding: 5px 0; font-weight: bold;">Tutor:</td>
+                            <td style="padding: 5px 0;">{tutor.full_name if tutor else 'To Be Assigned'}</td>
+                        </tr>
+                        <tr>
+                            <td style="padding: 5px 0; font-weight: bold;">Amount Paid:</td>
+                            <td style="padding: 5px 0; color: #28a745; font-weight: bold;">£{booking.cost:.2f}</td>
+                        </tr>
+                    </table>
+                </div>
+                
+                <p><strong>📅 Calendar Invite:</strong> A calendar invitation file is attached. Click to add to your calendar.</p>
+                
+                <div style="text-align: center; margin: 30px 0;">
+                    <a href="http://127.0.0.1:5000/portal" style="background-color: #002E5D; color: white; padding: 14px 28px; text-decoration: none; border-radius: 50px; font-weight: bold; display: inline-block;">
+                        View My Bookings
+                    </a>
+                </div>
+                
+                <div style="margin-top: 40px; padding-top: 20px; border-top: 1px solid #eee; font-size: 12px; color: #999; text-align: center;">
+                    <p>Greenwood International School<br>Greenwood Hall, Henley-on-Thames, Oxfordshire, RG9 1AA</p>
+                    <p>&copy; {datetime.now().year} Greenwood International School. All rights reserved.</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+        
+        # Attach .ics file to parent email
+        parent_msg.attach(
+            filename=f'booking_{booking.id}.ics',
+            content_type='text/calendar',
+            data=ics_content
+        )
+        
+        # === Email to Tutor ===
+        if tutor and tutor.email:
+            tutor_msg = Message(
+                subject=f'New Student Enrolled: {activity.name}',
+                sender=notifications.sender,
+                recipients=[tutor.email]
+            )
+            
+            tutor_msg.html = f"""
+            <html>
+            <body style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; line-height: 1.6; color: #333; background-color: #f4f4f4; padding: 20px;">
+                <div style="max-width: 600px; margin: 0 auto; background: #ffffff; padding: 40px; border-radius: 10px; box-shadow: 0 4px 15px rgba(0,0,0,0.05);">
+                    <div style="text-align: center; margin-bottom: 30px;">
+                        <h1 style="color: #002E5D; margin: 0;">Greenwood International</h1>
+                        <p style="color: #666; font-size: 14px;">Enrollment Alert</p>
+                    </div>
+                    
+                    <h2 style="color: #002E5D; margin-top: 0;">New Student Enrollment</h2>
+                    <p>Dear {tutor.full_name},</p>
+                    
+                    <p>A new student has been enrolled in your activity:</p>
+                    
+                    <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #002E5D;">
+                        <h3 style="color: #002E5D; margin-top: 0;">Enrollment Details</h3>
+                        <table style="width: 100%; border-collapse: collapse;">
+                            <tr>
+                                <td style="padding: 5px 0; font-weight: bold; width: 40%;">Activity:</td>
+                                <td style="padding: 5px 0;">{activity.name}</td>
+                            </tr>
+                            <tr>
+                                <td style="padding: 5px 0; font-weight: bold;">Student:</td>
+                                <td style="padding: 5px 0;">{child.name} (Year {child.grade}, Age {child.age})</td>
+                            </tr>
+                            <tr>
+                                <td style="padding: 5px 0; font-weight: bold;">Parent:</td>
+                                <td style="padding: 5px 0;">{parent.full_name}</td>
+                            </tr>
+                            <tr>
+                                <td style="padding: 5px 0; font-weight: bold;">Date:</td>
+                                <td style="padding: 5px 0;">{booking.booking_date.strftime('%A, %d %B %Y')}</td>
+                            </tr>
+                            <tr>
+                                <td style="padding: 5px 0; font-weight: bold;">Time:</td>
+                                <td style="padding: 5px 0;">{activity.start_time} - {activity.end_time}</td>
+                            </tr>
+                        </table>
+                    </div>
+                    
+                    <p>📅 A calendar invitation is attached. Please ensure you are prepared for this session.</p>
+                    
+                    <div style="text-align: center; margin: 30px 0;">
+                        <a href="http://127.0.0.1:5000/tutor/login" style="background-color: #002E5D; color: white; padding: 14px 28px; text-decoration: none; border-radius: 50px; font-weight: bold; display: inline-block;">
+                            View Dashboard
+                        </a>
+                    </div>
+                    
+                    <div style="margin-top: 40px; padding-top: 20px; border-top: 1px solid #eee; font-size: 12px; color: #999; text-align: center;">
+                        <p>&copy; {datetime.now().year} Greenwood International School. All rights reserved.</p>
+                    </div>
+                </div>
+            </body>
+            </html>
+            """
+            
+            # Attach .ics file to tutor email
+            tutor_msg.attach(
+                filename=f'{activity.name}_{child.name}.ics',
+                content_type='text/calendar',
+                data=ics_content
+            )
+            
+            mail.send(tutor_msg)
+        
+        # === Email to Admin ===
+        admin_recipients = notifications.recipients('booking')
+        if admin_recipients:
+            admin_msg = Message(
+                subject=f'New Booking Alert: {activity.name} - {child.name}',
+                sender=notifications.sender,
+                recipients=admin_recipients
+            )
+            
+            admin_msg.html = f"""
+            <html>
+            <body style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; line-height: 1.6; color: #333; background-color: #f4f4f4; padding: 20px;">
+                <div style="max-width: 600px; margin: 0 auto; background: #ffffff; padding: 40px; border-radius: 10px; box-shadow: 0 4px 15px rgba(0,0,0,0.05);">
+                    <div style="text-align: center; margin-bottom: 30px;">
+                        <h1 style="color: #002E5D; margin: 0;">Greenwood International</h1>
+                        <p style="color: #666; font-size: 14px;">Admin Notification</p>
+                    </div>
+                    
+                    <h2 style="color: #002E5D; margin-top: 0;">New Booking Received</h2>
+                    <p><strong>Admin Notification</strong></p>
+                    <p>A new booking has been successfully processed.</p>
+                    
+                    <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0;">
+                        <h3 style="color: #002E5D; margin-top: 0;">Booking Details</h3>
+                        <table style="width: 100%;">
+                            <tr>
+                                <td style="padding: 5px 0; font-weight: bold; width: 40%;">Booking ID:</td>
+                                <td style="padding: 5px 0;">#{booking.id}</td>
+                            </tr>
+                            <tr>
+                                <td style="padding: 5px 0; font-weight: bold;">Activity:</td>
+                                <td style="padding: 5px 0;">{activity.name}</td>
+                            </tr>
+                            <tr>
+                                <td style="padding: 5px 0; font-weight: bold;">Student:</td>
+                                <td style="padding: 5px 0;">{child.name} (Year {child.grade})</td>
+                            </tr>
+                            <tr>
+                                <td style="padding: 5px 0; font-weight: bold;">Parent:</td>
+                                <td style="padding: 5px 0;">{parent.full_name} ({parent.email})</td>
+                            </tr>
+                            <tr>
+                                <td style="padding: 5px 0; font-weight: bold;">Date:</td>
+                                <td style="padding: 5px 0;">{booking.booking_date.strftime('%A, %d %B %Y')}</td>
+                            </tr>
+                            <tr>
+                                <td style="padding: 5px 0; font-weight: bold;">Amount Paid:</td>
+                                <td style="padding: 5px 0; color: #28a745; font-weight: bold;">£{booking.cost:.2f}</td>
+                            </tr>
+                        </table>
+                    </div>
+                    
+                    <div style="margin-top: 40px; padding-top: 20px; border-top: 1px solid #eee; font-size: 12px; color: #999; text-align: center;">
+                        <p>Automated Notification System</p>
+                        <p>&copy; {datetime.now().year} Greenwood International School.</p>
+                    </div>
+                </div>
+            </body>
+            </html>
+            """
+            mail.send(admin_msg)
+        
+        # Send parent email
+        mail.send(parent_msg)
+        
+        return True
+        
+    except Exception as e:
+        print(f'❌ Email sending failed: {str(e)}')
+        # Don't fail the booking if email fails
+        return False
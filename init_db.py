@@ -2,19 +2,31 @@
 Database Initialization Script
 Safely creates database and tables with sample data
 """
-from app import app, db
-from app import Admin, Parent, Child, Activity, Tutor, Booking
+from app import create_app
+from commands import create_schema
+from extensions import db
+from models import Admin, Parent, Child, Activity, Tutor, Booking, init_booking_search, rebuild_booking_rollups, rebuild_identity_index
 from datetime import datetime, timedelta
 import os
 
 def init_database():
     """Initialize database with tables and sample data"""
+    app = create_app()
     with app.app_context():
         # Create all tables
         print("Creating database tables...")
-        db.create_all()
+        create_schema()
         print("✓ Tables created successfully")
         
+        if init_booking_search():
+            print("✓ Booking search index built")
+        
+        rebuild_booking_rollups()
+        print("✓ Booking rollups rebuilt")
+        
+        rebuild_identity_index()
+        print("✓ Identity index rebuilt")
+        
         # Check if admin already exists
         if not Admin.query.first():
             print("\nCreating default admin account...")
@@ -0,0 +1,67 @@
+"""
+JSON Provider
+Uses orjson for API responses when it is installed, otherwise Flask's stdlib provider
+"""
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+
+class OrJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+
+    Keeps the stdlib provider's handling of types orjson does not know
+    (Decimal, UUID via str, dataclasses, __html__) by falling back to its
+    default hook, and writes response bodies as bytes without a
+    str round trip.
+    """
+
+    option = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def _options(self, kwargs):
+        option = self.option
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self._options(kwargs)).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self._options({'indent': indent}) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+JSON_PROVIDERS = {
+    'stdlib': DefaultJSONProvider,
+    'orjson': OrJSONProvider,
+}
+
+
+def init_json_provider(app):
+    """
+    Install the provider named by JSON_PROVIDER: 'auto' (orjson if
+    installed), 'orjson' or 'stdlib'.
+    """
+    name = app.config.get('JSON_PROVIDER', 'auto')
+    if name == 'auto':
+        name = 'orjson' if orjson else 'stdlib'
+    if name == 'orjson' and orjson is None:
+        app.logger.warning('JSON_PROVIDER is orjson but orjson is not installed; using stdlib')
+        name = 'stdlib'
+
+    provider_class = JSON_PROVIDERS[name]
+    app.json_provider_class = provider_class
+    app.json = provider_class(app)
+    return app.json
@@ -0,0 +1,805 @@
+"""
+Database Models
+Models plus the derived tables and caches kept in step with them
+"""
+import re
+from datetime import datetime
+
+from sqlalchemy import bindparam, event, inspect as sa_inspect, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from extensions import capacity_broker, db, fragment_cache, notifications, password_hasher
+
+
+# ==================== Database Models ====================
+
+class Parent(db.Model):
+    """Parent/Guardian model"""
+    id = db.Column(db.Integer, primary_key=True)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password = db.Column(db.String(200), nullable=False)
+    full_name = db.Column(db.String(120), nullable=False)
+    phone = db.Column(db.String(20))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    bookings = db.relationship('Booking', backref='parent', lazy=True, cascade='all, delete-orphan')
+    children = db.relationship('Child', backref='parent', lazy=True, cascade='all, delete-orphan')
+    waitlists = db.relationship('Waitlist', backref='parent', lazy=True, cascade='all, delete-orphan')
+
+    def set_password(self, password):
+        self.password = password_hasher.hash(password)
+    
+    def check_password(self, password):
+        return password_hasher.verify(self.password, password)
+
+class Admin(db.Model):
+    """Admin model"""
+    id = db.Column(db.Integer, primary_key=True)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password = db.Column(db.String(200), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def set_password(self, password):
+        self.password = password_hasher.hash(password)
+    
+    def check_password(self, password):
+        return password_hasher.verify(self.password, password)
+
+class Tutor(db.Model):
+    """Tutor model"""
+    id = db.Column(db.Integer, primary_key=True)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password = db.Column(db.String(200), nullable=False)
+    full_name = db.Column(db.String(120), nullable=False)
+    specialization = db.Column(db.String(200))
+    qualification = db.Column(db.String(300))
+    bio = db.Column(db.Text)
+    linkedin_url = db.Column(db.String(200))
+    teaching_philosophy = db.Column(db.Text)
+    years_experience = db.Column(db.Integer)
+    education = db.Column(db.Text)
+    certifications = db.Column(db.Text)
+    status = db.Column(db.String(20), default='pending')  # pending, approved, rejected
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    approved_by = db.Column(db.Integer, db.ForeignKey('admin.id'), nullable=True)
+    approval_date = db.Column(db.DateTime, nullable=True)
+    
+    def set_password(self, password):
+        self.password = password_hasher.hash(password)
+    
+    def check_password(self, password):
+        return password_hasher.verify(self.password, password)
+
+
+class Child(db.Model):
+    """Child model"""
+    id = db.Column(db.Integer, primary_key=True)
+    parent_id = db.Column(db.Integer, db.ForeignKey('parent.id'), nullable=False)
+    name = db.Column(db.String(120), nullable=False)
+    age = db.Column(db.Integer)
+    grade = db.Column(db.String(20))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    bookings = db.relationship('Booking', backref='child', lazy=True, cascade='all, delete-orphan')
+    attendance_records = db.relationship('Attendance', backref='child', lazy=True, cascade='all, delete-orphan')
+
+class Activity(db.Model):
+    """Available activities model"""
+    id = db.Column(db.Integer, primary_key=True)
+    tutor_id = db.Column(db.Integer, db.ForeignKey('tutor.id'), nullable=True)
+    name = db.Column(db.String(120), nullable=False)
+    description = db.Column(db.Text)
+    price = db.Column(db.Float, nullable=False)
+    max_capacity = db.Column(db.Integer, default=20)
+    day_of_week = db.Column(db.String(20), nullable=False)
+    start_time = db.Column(db.String(10), nullable=False)
+    end_time = db.Column(db.String(10), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Catalogue filters: day + time window, price range, tutor, name sort
+    __table_args__ = (
+        db.Index('ix_activity_day_start', 'day_of_week', 'start_time'),
+        db.Index('ix_activity_price', 'price'),
+        db.Index('ix_activity_tutor', 'tutor_id'),
+        db.Index('ix_activity_name', 'name'),
+    )
+    
+    # Relationships
+    tutor = db.relationship('Tutor', backref='activities', lazy=True)
+    bookings = db.relationship('Booking', backref='activity', lazy=True, cascade='all, delete-orphan')
+    waitlists = db.relationship('Waitlist', backref='activity', lazy=True, cascade='all, delete-orphan')
+
+class Booking(db.Model):
+    """Booking model"""
+    id = db.Column(db.Integer, primary_key=True)
+    parent_id = db.Column(db.Integer, db.ForeignKey('parent.id'), nullable=False)
+    child_id = db.Column(db.Integer, db.ForeignKey('child.id'), nullable=False)
+    activity_id = db.Column(db.Integer, db.ForeignKey('activity.id'), nullable=False)
+    booking_date = db.Column(db.Date, nullable=False)
+    status = db.Column(db.String(20), default='confirmed') # confirmed, cancelled
+    cost = db.Column(db.Float, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.UniqueConstraint('child_id', 'booking_date', name='unique_booking_per_day'),
+        db.Index('ix_booking_activity_date', 'activity_id', 'booking_date'),
+    )
+
+class Waitlist(db.Model):
+    """Waitlist model"""
+    id = db.Column(db.Integer, primary_key=True)
+    parent_id = db.Column(db.Integer, db.ForeignKey('parent.id'), nullable=False)
+    child_id = db.Column(db.Integer, db.ForeignKey('child.id'), nullable=False)
+    activity_id = db.Column(db.Integer, db.ForeignKey('activity.id'), nullable=False)
+    request_date = db.Column(db.Date, nullable=False)
+    status = db.Column(db.String(20), default='waiting') # waiting, notified, expired
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class Attendance(db.Model):
+    """Attendance model"""
+    id = db.Column(db.Integer, primary_key=True)
+    child_id = db.Column(db.Integer, db.ForeignKey('child.id'), nullable=False)
+    activity_id = db.Column(db.Integer, db.ForeignKey('activity.id'), nullable=False)
+    date = db.Column(db.Date, nullable=False)
+    status = db.Column(db.String(20), default='present') # present, absent, late
+    notes = db.Column(db.Text)
+    recorded_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # One record per child per session; the column order also serves
+    # per-activity date range scans
+    __table_args__ = (db.Index('ux_attendance_activity_date_child', 'activity_id', 'date', 'child_id', unique=True),)
+
+class SystemLog(db.Model):
+    """Audit log for security"""
+    id = db.Column(db.Integer, primary_key=True)
+    action = db.Column(db.String(200), nullable=False)
+    user_type = db.Column(db.String(20)) # admin, tutor, parent
+    user_id = db.Column(db.Integer)
+    ip_address = db.Column(db.String(50))
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+
+class BookingRollup(db.Model):
+    """Running totals of confirmed bookings and revenue"""
+    scope = db.Column(db.String(20), primary_key=True) # total, day, activity, tutor
+    key = db.Column(db.String(40), primary_key=True) # '' for total, ISO date, or id
+    bookings = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0)
+
+class Identity(db.Model):
+    """Which account owns an email address, across parents, tutors and admins"""
+    email = db.Column(db.String(120), primary_key=True) # normalised: stripped, lower-case
+    role = db.Column(db.String(10), nullable=False) # parent, tutor, admin
+    user_id = db.Column(db.Integer, nullable=False)
+    
+    __table_args__ = (
+        db.UniqueConstraint('role', 'user_id', name='uq_identity_account'),
+    )
+    
+    @property
+    def user(self):
+        return db.session.get(IDENTITY_MODELS[self.role], self.user_id)
+
+class CacheVersion(db.Model):
+    """Counters every process reads to tell whether its in-memory caches are stale"""
+    name = db.Column(db.String(40), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime)
+
+# ==================== Booking Search ====================
+# Full-text index over the names an admin searches bookings by (parent,
+# child, activity and tutor). SQLite uses an FTS5 table keyed by rowid;
+# PostgreSQL uses a weighted tsvector with a GIN index. Other backends
+# (or a database where init_db hasn't created the index yet) fall back
+# to ILIKE.
+
+BOOKING_SEARCH_SQL = {
+    'sqlite': {
+        'create': [
+            """CREATE VIRTUAL TABLE IF NOT EXISTS booking_search USING fts5(
+                parent_name, child_name, activity_name, tutor_name,
+                tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+            )"""
+        ],
+        'delete': "DELETE FROM booking_search WHERE rowid IN {bookings}",
+        'insert': """INSERT INTO booking_search (rowid, parent_name, child_name, activity_name, tutor_name)
+            SELECT booking.id, parent.full_name, child.name, activity.name, COALESCE(tutor.full_name, '')
+            FROM booking
+            JOIN parent ON parent.id = booking.parent_id
+            JOIN child ON child.id = booking.child_id
+            JOIN activity ON activity.id = booking.activity_id
+            LEFT JOIN tutor ON tutor.id = activity.tutor_id
+            WHERE {condition}""",
+        'match': """SELECT rowid AS booking_id, bm25(booking_search, 4.0, 4.0, 2.0, 1.0) AS rank
+            FROM booking_search WHERE booking_search MATCH :terms""",
+    },
+    'postgresql': {
+        'create': [
+            """CREATE TABLE IF NOT EXISTS booking_search (
+                booking_id INTEGER PRIMARY KEY REFERENCES booking (id) ON DELETE CASCADE,
+                document TSVECTOR NOT NULL
+            )""",
+            "CREATE INDEX IF NOT EXISTS ix_booking_search_document ON booking_search USING GIN (document)"
+        ],
+        'delete': "DELETE FROM booking_search WHERE booking_id IN {bookings}",
+        'insert': """INSERT INTO booking_search (booking_id, document)
+            SELECT booking.id,
+                setweight(to_tsvector('simple', coalesce(parent.full_name, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(child.name, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(activity.name, '')), 'B') ||
+                setweight(to_tsvector('simple', coalesce(tutor.full_name, '')), 'C')
+            FROM booking
+            JOIN parent ON parent.id = booking.parent_id
+            JOIN child ON child.id = booking.child_id
+            JOIN activity ON activity.id = booking.activity_id
+            LEFT JOIN tutor ON tutor.id = activity.tutor_id
+            WHERE {condition}""",
+        'match': """SELECT booking_id, -ts_rank(document, to_tsquery('simple', :terms)) AS rank
+            FROM booking_search WHERE document @@ to_tsquery('simple', :terms)""",
+    },
+}
+
+# Which booking column identifies the rows to reindex when a model changes
+BOOKING_SEARCH_KEYS = {
+    'Booking': 'booking.id',
+    'Parent': 'booking.parent_id',
+    'Child': 'booking.child_id',
+    'Activity': 'booking.activity_id',
+    'Tutor': 'activity.tutor_id',
+}
+
+# Columns that feed the index, per model
+BOOKING_SEARCH_FIELDS = {
+    'Booking': ('parent_id', 'child_id', 'activity_id'),
+    'Parent': ('full_name',),
+    'Child': ('name',),
+    'Activity': ('name', 'tutor_id'),
+    'Tutor': ('full_name',),
+}
+
+_booking_search_ready = {}
+
+def booking_search_sql(connection):
+    """Return the SQL set for this connection's backend if its index exists"""
+    dialect = connection.dialect.name
+    sql = BOOKING_SEARCH_SQL.get(dialect)
+    if sql is None:
+        return None
+    
+    key = str(connection.engine.url)
+    if key not in _booking_search_ready:
+        _booking_search_ready[key] = sa_inspect(connection).has_table('booking_search')
+    return sql if _booking_search_ready[key] else None
+
+def reindex_bookings(connection, key, ids):
+    """Rebuild index rows for bookings whose `key` column is in ids"""
+    sql = booking_search_sql(connection)
+    if sql is None or not ids:
+        return
+    
+    condition = f'{key} IN :ids'
+    matching = (
+        '(SELECT booking.id FROM booking JOIN activity ON activity.id = booking.activity_id '
+        f'WHERE {condition})'
+    )
+    ids_param = bindparam('ids', expanding=True)
+    connection.execute(text(sql['delete'].format(bookings=matching)).bindparams(ids_param), {'ids': list(ids)})
+    connection.execute(text(sql['insert'].format(condition=condition)).bindparams(ids_param), {'ids': list(ids)})
+
+def init_booking_search():
+    """Create the backend's search index (if supported) and fill it from scratch"""
+    connection = db.session.connection()
+    sql = BOOKING_SEARCH_SQL.get(connection.dialect.name)
+    if sql is None:
+        return False
+    
+    for statement in sql['create']:
+        connection.execute(text(statement))
+    _booking_search_ready[str(connection.engine.url)] = True
+    
+    connection.execute(text(sql['delete'].format(bookings='(SELECT id FROM booking)')))
+    connection.execute(text(sql['insert'].format(condition='1 = 1')))
+    db.session.commit()
+    return True
+
+def booking_search_terms(search, dialect):
+    """Turn free text into a prefix-matching AND query for the backend"""
+    words = re.findall(r'\w+', search.lower())
+    if not words:
+        return None
+    if dialect == 'postgresql':
+        return ' & '.join(f'{word}:*' for word in words)
+    return ' '.join(f'"{word}"*' for word in words)
+
+def booking_search_subquery(search):
+    """
+    Ranked matches as a (booking_id, rank) subquery, lower rank first,
+    or None when full-text search isn't available.
+    """
+    connection = db.session.connection()
+    sql = booking_search_sql(connection)
+    terms = booking_search_terms(search, connection.dialect.name)
+    if sql is None or terms is None:
+        return None
+    
+    return text(sql['match']).bindparams(terms=terms).columns(
+        booking_id=db.Integer,
+        rank=db.Float
+    ).subquery('booking_search_match')
+
+@event.listens_for(Session, 'after_flush')
+def maintain_booking_search(session, flush_context):
+    """Keep the booking search index in step with every flush"""
+    connection = session.connection()
+    if booking_search_sql(connection) is None:
+        return
+    
+    stale = {}
+    for obj in list(session.new) + list(session.dirty):
+        name = type(obj).__name__
+        if name not in BOOKING_SEARCH_KEYS:
+            continue
+        state = sa_inspect(obj)
+        if obj in session.new or any(state.attrs[field].history.has_changes() for field in BOOKING_SEARCH_FIELDS[name]):
+            stale.setdefault(BOOKING_SEARCH_KEYS[name], set()).add(obj.id)
+    
+    deleted = [obj.id for obj in session.deleted if isinstance(obj, Booking)]
+    if deleted:
+        sql = booking_search_sql(connection)
+        connection.execute(
+            text(sql['delete'].format(bookings=':ids')).bindparams(bindparam('ids', expanding=True)),
+            {'ids': deleted}
+        )
+    
+    for key, ids in stale.items():
+        reindex_bookings(connection, key, ids)
+
+# ==================== Booking Rollups ====================
+# Confirmed bookings and their revenue are totalled overall, per booking
+# day (created_at), per activity and per tutor. Deltas are written in the
+# same transaction as the flush that creates, cancels or deletes a booking,
+# so dashboard KPIs are single-row reads. rebuild_booking_rollups()
+# recomputes everything from the booking table.
+
+_rollup_ready = {}
+
+def booking_rollups_enabled(connection):
+    """True once the rollup table exists in this database"""
+    key = str(connection.engine.url)
+    if key not in _rollup_ready:
+        _rollup_ready[key] = sa_inspect(connection).has_table(BookingRollup.__tablename__)
+    return _rollup_ready[key]
+
+def _booking_contribution(status, cost, created_at, activity_id, tutor_id):
+    """Rollup keys a booking counts towards, or {} if it isn't confirmed"""
+    if status != 'confirmed':
+        return {}
+    keys = [('total', ''), ('activity', str(activity_id))]
+    if created_at:
+        keys.append(('day', created_at.date().isoformat()))
+    if tutor_id:
+        keys.append(('tutor', str(tutor_id)))
+    return {key: cost or 0 for key in keys}
+
+def apply_rollup_deltas(connection, deltas):
+    """Add {(scope, key): [bookings, revenue]} deltas with an upsert per row"""
+    rows = [{'scope': scope, 'key': key, 'bookings': count, 'revenue': revenue}
+            for (scope, key), (count, revenue) in deltas.items() if count or revenue]
+    if not rows:
+        return
+    
+    table = BookingRollup.__table__
+    dialect = connection.dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['scope', 'key'],
+            set_={
+                'bookings': table.c.bookings + stmt.excluded.bookings,
+                'revenue': table.c.revenue + stmt.excluded.revenue
+            }
+        )
+        connection.execute(stmt, rows)
+        return
+    
+    for row in rows:
+        result = connection.execute(
+            table.update().where(table.c.scope == row['scope'], table.c.key == row['key']).values(
+                bookings=table.c.bookings + row['bookings'],
+                revenue=table.c.revenue + row['revenue']
+            )
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert().values(**row))
+
+def _retotal_tutors(connection, tutor_ids):
+    """Recompute tutor rollups from their activities' rollups"""
+    table = BookingRollup.__table__
+    for tutor_id in tutor_ids:
+        if not tutor_id:
+            continue
+        activity_keys = db.select(db.cast(Activity.id, db.String)).where(Activity.tutor_id == tutor_id)
+        count, revenue = connection.execute(
+            db.select(
+                db.func.coalesce(db.func.sum(table.c.bookings), 0),
+                db.func.coalesce(db.func.sum(table.c.revenue), 0)
+            ).where(table.c.scope == 'activity', table.c.key.in_(activity_keys))
+        ).one()
+        connection.execute(table.delete().where(table.c.scope == 'tutor', table.c.key == str(tutor_id)))
+        connection.execute(table.insert().values(scope='tutor', key=str(tutor_id), bookings=count, revenue=revenue))
+
+@event.listens_for(Session, 'after_flush')
+def maintain_booking_rollups(session, flush_context):
+    """Fold this flush's booking changes into the rollup table"""
+    connection = session.connection()
+    if not booking_rollups_enabled(connection):
+        return
+    
+    changes = []  # (sign, status, cost, created_at, activity_id)
+    for obj in session.new:
+        if isinstance(obj, Booking):
+            changes.append((1, obj.status, obj.cost, obj.created_at, obj.activity_id))
+    for obj in session.deleted:
+        if isinstance(obj, Booking):
+            changes.append((-1, obj.status, obj.cost, obj.created_at, obj.activity_id))
+    
+    retotal = set()
+    for obj in session.dirty:
+        state = sa_inspect(obj)
+        if isinstance(obj, Booking):
+            fields = ('status', 'cost', 'created_at', 'activity_id')
+            history = {field: state.attrs[field].history for field in fields}
+            if not any(h.has_changes() for h in history.values()):
+                continue
+            old = [h.deleted[0] if h.deleted else getattr(obj, field) for field, h in history.items()]
+            changes.append((-1, *old))
+            changes.append((1, obj.status, obj.cost, obj.created_at, obj.activity_id))
+        elif isinstance(obj, Activity) and state.attrs.tutor_id.history.has_changes():
+            retotal.update(state.attrs.tutor_id.history.deleted)
+            retotal.add(obj.tutor_id)
+    
+    if changes:
+        # Ids set from form data may still be strings before the flush
+        activity_ids = {int(change[4]) for change in changes}
+        tutors = dict(connection.execute(
+            db.select(Activity.id, Activity.tutor_id).where(Activity.id.in_(activity_ids))
+        ).all())
+        # Activities deleted in this flush are already gone from the table
+        tutors.update({obj.id: obj.tutor_id for obj in session.deleted if isinstance(obj, Activity)})
+        
+        deltas = {}
+        for sign, status, cost, created_at, activity_id in changes:
+            contribution = _booking_contribution(status, cost, created_at, activity_id, tutors.get(int(activity_id)))
+            for key, revenue in contribution.items():
+                delta = deltas.setdefault(key, [0, 0])
+                delta[0] += sign
+                delta[1] += sign * revenue
+        apply_rollup_deltas(connection, deltas)
+    
+    if retotal:
+        _retotal_tutors(connection, retotal)
+    
+    deleted_activities = [str(obj.id) for obj in session.deleted if isinstance(obj, Activity)]
+    if deleted_activities:
+        table = BookingRollup.__table__
+        connection.execute(table.delete().where(table.c.scope == 'activity', table.c.key.in_(deleted_activities)))
+
+def rebuild_booking_rollups():
+    """
+    Recompute every rollup from the booking table.
+    Returns the rows whose stored value differed, as
+    {(scope, key): (stored, rebuilt)}.
+    """
+    table = BookingRollup.__table__
+    confirmed = Booking.status == 'confirmed'
+    day = db.func.date(Booking.created_at)
+    
+    grouped = [
+        ('total', db.literal(''), None),
+        ('day', day, day),
+        ('activity', Booking.activity_id, Booking.activity_id),
+        ('tutor', Activity.tutor_id, Activity.tutor_id),
+    ]
+    rebuilt = {}
+    for scope, key_column, group_column in grouped:
+        query = db.session.query(
+            key_column,
+            db.func.count(Booking.id),
+            db.func.coalesce(db.func.sum(Booking.cost), 0)
+        ).join(Activity, Activity.id == Booking.activity_id).filter(confirmed)
+        if scope == 'tutor':
+            query = query.filter(Activity.tutor_id.isnot(None))
+        if group_column is not None:
+            query = query.group_by(group_column)
+        for key, count, revenue in query.all():
+            if count:
+                rebuilt[(scope, str(key))] = (count, float(revenue))
+    
+    stored = {(row.scope, row.key): (row.bookings, float(row.revenue)) for row in BookingRollup.query.all()}
+    differences = {
+        key: (stored.get(key, (0, 0.0)), rebuilt.get(key, (0, 0.0)))
+        for key in set(stored) | set(rebuilt)
+        if stored.get(key, (0, 0.0))[0] != rebuilt.get(key, (0, 0.0))[0]
+        or abs(stored.get(key, (0, 0.0))[1] - rebuilt.get(key, (0, 0.0))[1]) > 0.005
+    }
+    
+    db.session.execute(table.delete())
+    if rebuilt:
+        db.session.execute(table.insert(), [
+            {'scope': scope, 'key': key, 'bookings': count, 'revenue': revenue}
+            for (scope, key), (count, revenue) in rebuilt.items()
+        ])
+    db.session.commit()
+    return differences
+
+def get_booking_totals():
+    """Confirmed bookings and revenue as (count, revenue) from the total rollup"""
+    row = db.session.get(BookingRollup, ('total', ''))
+    return (row.bookings, row.revenue) if row else (0, 0)
+
+# ==================== Identity Index ====================
+# Every parent, tutor and admin email has one row in the identity table,
+# keyed by the normalised address. It is written in the same flush that
+# creates, re-addresses or deletes an account, so cross-role lookups are a
+# single primary-key read and an email can only belong to one account.
+# rebuild_identity_index() repopulates it from the account tables.
+
+IDENTITY_ROLES = {Parent: 'parent', Tutor: 'tutor', Admin: 'admin'}
+IDENTITY_MODELS = {role: model for model, role in IDENTITY_ROLES.items()}
+
+_identity_ready = {}
+
+def normalise_email(email):
+    return (email or '').strip().lower()
+
+def identity_index_enabled(connection):
+    """True once the identity table exists in this database"""
+    key = str(connection.engine.url)
+    if key not in _identity_ready:
+        _identity_ready[key] = sa_inspect(connection).has_table(Identity.__tablename__)
+    return _identity_ready[key]
+
+def find_identity(email):
+    """The Identity row for an email address, or None"""
+    email = normalise_email(email)
+    return db.session.get(Identity, email) if email else None
+
+def email_available(email, user=None):
+    """True if no account other than `user` owns this email"""
+    identity = find_identity(email)
+    return identity is None or (
+        user is not None and (identity.role, identity.user_id) == (IDENTITY_ROLES[type(user)], user.id)
+    )
+
+@event.listens_for(Session, 'after_flush')
+def maintain_identity_index(session, flush_context):
+    """Mirror this flush's account inserts, email changes and deletes"""
+    connection = session.connection()
+    if not identity_index_enabled(connection):
+        return
+    
+    table = Identity.__table__
+    removed = [
+        (IDENTITY_ROLES[type(obj)], obj.id) for obj in session.deleted if type(obj) in IDENTITY_ROLES
+    ]
+    added = [
+        {'email': normalise_email(obj.email), 'role': IDENTITY_ROLES[type(obj)], 'user_id': obj.id}
+        for obj in session.new if type(obj) in IDENTITY_ROLES
+    ]
+    for obj in session.dirty:
+        if type(obj) in IDENTITY_ROLES and sa_inspect(obj).attrs.email.history.has_changes():
+            removed.append((IDENTITY_ROLES[type(obj)], obj.id))
+            added.append({'email': normalise_email(obj.email), 'role': IDENTITY_ROLES[type(obj)], 'user_id': obj.id})
+    
+    for role, user_id in removed:
+        connection.execute(table.delete().where(table.c.role == role, table.c.user_id == user_id))
+    if added:
+        # A clash with another account's email fails the flush with IntegrityError
+        connection.execute(table.insert(), added)
+
+def rebuild_identity_index():
+    """
+    Repopulate the identity table from the account tables. Where several
+    accounts share an email the first (parent, then tutor, then admin,
+    lowest id) keeps it; the rest are returned as [(email, role, user_id)].
+    """
+    rows, conflicts = {}, []
+    for model, role in IDENTITY_ROLES.items():
+        for user_id, email in db.session.query(model.id, model.email).order_by(model.id):
+            email = normalise_email(email)
+            if email in rows:
+                conflicts.append((email, role, user_id))
+            else:
+                rows[email] = {'email': email, 'role': role, 'user_id': user_id}
+    
+    table = Identity.__table__
+    db.session.execute(table.delete())
+    if rows:
+        db.session.execute(table.insert(), list(rows.values()))
+    db.session.commit()
+    return conflicts
+
+# ==================== Notification Routing ====================
+
+@notifications.source('admins')
+def admin_addresses():
+    return [email for (email,) in db.session.query(Admin.email).order_by(Admin.id)]
+
+@event.listens_for(Session, 'after_flush')
+def flag_admin_changes(session, flush_context):
+    """Remember that this transaction added, removed or re-addressed an admin"""
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Admin):
+            session.info['recipients_stale'] = True
+            return
+
+@event.listens_for(Session, 'after_commit')
+def invalidate_notification_recipients(session):
+    if session.info.pop('recipients_stale', False):
+        notifications.invalidate()
+
+@event.listens_for(Session, 'after_rollback')
+def discard_admin_changes(session):
+    session.info.pop('recipients_stale', None)
+
+# ==================== Cache Versions ====================
+# Per-process caches compare a version read from the cache_version table,
+# so a write committed by one worker (or a CLI command) invalidates the
+# caches of every other worker too. Versions are bumped in their own short
+# transaction after the write commits, so busy writers never queue on the row.
+
+_cache_versions_ready = {}
+
+def cache_versions_enabled(connection):
+    """True once the cache_version table exists in this database"""
+    key = str(connection.engine.url)
+    if key not in _cache_versions_ready:
+        _cache_versions_ready[key] = sa_inspect(connection).has_table(CacheVersion.__tablename__)
+    return _cache_versions_ready[key]
+
+def get_cache_version(name):
+    """(version, updated_at) for a cache, (0, None) before its first bump, or None without the table"""
+    if not cache_versions_enabled(db.session.connection()):
+        return None
+    row = db.session.query(CacheVersion.version, CacheVersion.updated_at).filter_by(name=name).first()
+    return tuple(row) if row else (0, None)
+
+def bump_cache_version(bind, name):
+    """Move a cache to a new version in its own transaction on `bind` (an engine)"""
+    table = CacheVersion.__table__
+    now = datetime.utcnow().replace(microsecond=0)
+    increment = table.update().where(table.c.name == name).values(version=table.c.version + 1, updated_at=now)
+    with bind.begin() as connection:
+        if not cache_versions_enabled(connection) or connection.execute(increment).rowcount:
+            return
+    try:
+        with bind.begin() as connection:
+            connection.execute(table.insert().values(name=name, version=1, updated_at=now))
+    except IntegrityError:
+        # Another process created the row first
+        with bind.begin() as connection:
+            connection.execute(increment)
+
+@event.listens_for(Session, 'after_flush')
+def flag_catalogue_changes(session, flush_context):
+    """Remember that this transaction added, edited or deleted an activity"""
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Activity):
+            session.info['catalogue_stale'] = True
+            return
+
+@event.listens_for(Session, 'after_commit')
+def bump_catalogue_version(session):
+    """Move /api/activities to a new version, and a new Last-Modified, in every worker"""
+    if session.info.pop('catalogue_stale', False):
+        bump_cache_version(session.get_bind(), 'catalogue')
+
+@event.listens_for(Session, 'after_rollback')
+def discard_catalogue_changes(session):
+    session.info.pop('catalogue_stale', None)
+
+# ==================== Fragment Cache Versioning ====================
+
+# Models whose rows appear in cached dashboard fragments. Child and Parent
+# are included because booking rosters show their names and emails.
+FRAGMENT_CACHE_MODELS = (Activity, Tutor, Booking, Child, Parent)
+
+@event.listens_for(Session, 'after_flush')
+def flag_fragment_changes(session, flush_context):
+    """Remember that this transaction wrote data shown in cached fragments"""
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, FRAGMENT_CACHE_MODELS):
+            session.info['fragments_stale'] = True
+            return
+
+@fragment_cache.version_source
+def fragment_data_version():
+    version = get_cache_version('fragments')
+    return version[0] if version else None
+
+@event.listens_for(Session, 'after_commit')
+def bump_fragment_version(session):
+    """Invalidate cached fragments once the write is visible to other requests"""
+    if session.info.pop('fragments_stale', False):
+        if fragment_cache.state.shared is None:
+            bump_cache_version(session.get_bind(), 'fragments')
+        fragment_cache.bump()
+
+@event.listens_for(Session, 'after_rollback')
+def discard_fragment_changes(session):
+    session.info.pop('fragments_stale', None)
+
+# ==================== Live Capacity ====================
+
+@event.listens_for(Session, 'after_flush')
+def collect_capacity_changes(session, flush_context):
+    """Accumulate confirmed-booking deltas per (activity, date) until commit"""
+    changes = []  # (sign, status, activity_id, booking_date)
+    for obj in session.new:
+        if isinstance(obj, Booking):
+            changes.append((1, obj.status, obj.activity_id, obj.booking_date))
+    for obj in session.deleted:
+        if isinstance(obj, Booking):
+            changes.append((-1, obj.status, obj.activity_id, obj.booking_date))
+    for obj in session.dirty:
+        if not isinstance(obj, Booking):
+            continue
+        state = sa_inspect(obj)
+        fields = ('status', 'activity_id', 'booking_date')
+        history = {field: state.attrs[field].history for field in fields}
+        if not any(h.has_changes() for h in history.values()):
+            continue
+        old = [h.deleted[0] if h.deleted else getattr(obj, field) for field, h in history.items()]
+        changes.append((-1, *old))
+        changes.append((1, obj.status, obj.activity_id, obj.booking_date))
+    
+    deltas = session.info.setdefault('capacity_deltas', {})
+    for sign, status, activity_id, booking_date in changes:
+        # Bookings default to confirmed when status is left unset
+        if status in (None, 'confirmed') and activity_id is not None:
+            # Ids set from form data may still be strings before the flush
+            key = (int(activity_id), booking_date)
+            deltas[key] = deltas.get(key, 0) + sign
+
+@event.listens_for(Session, 'after_commit')
+def publish_capacity_changes(session):
+    """Push committed capacity deltas to open capacity streams"""
+    deltas = session.info.pop('capacity_deltas', None)
+    if not deltas:
+        return
+    capacity_broker.publish([
+        {'activity_id': activity_id, 'date': booking_date.isoformat() if booking_date else None, 'delta': delta}
+        for (activity_id, booking_date), delta in deltas.items() if delta
+    ])
+
+@event.listens_for(Session, 'after_rollback')
+def discard_capacity_changes(session):
+    session.info.pop('capacity_deltas', None)
+
+def get_capacity_snapshot(activity_ids=None, from_date=None):
+    """
+    Capacity and confirmed bookings per session for each activity, as
+    [{'activity_id', 'capacity', 'booked': {'YYYY-MM-DD': count}}] covering
+    sessions from `from_date` (default today). max_capacity applies to each
+    session, the same (activity, date) scope the published deltas use.
+    """
+    from_date = from_date or datetime.utcnow().date()
+    activities = db.session.query(Activity.id, Activity.max_capacity)
+    counts = db.session.query(Booking.activity_id, Booking.booking_date, db.func.count(Booking.id)).filter(
+        Booking.status == 'confirmed',
+        Booking.booking_date >= from_date
+    ).group_by(Booking.activity_id, Booking.booking_date)
+    if activity_ids:
+        activities = activities.filter(Activity.id.in_(activity_ids))
+        counts = counts.filter(Booking.activity_id.in_(activity_ids))
+    
+    snapshot = {
+        activity_id: {'activity_id': activity_id, 'capacity': capacity, 'booked': {}}
+        for activity_id, capacity in activities
+    }
+    for activity_id, booking_date, count in counts:
+        if activity_id in snapshot:
+            snapshot[activity_id]['booked'][booking_date.isoformat()] = count
+    return list(snapshot.values())
@@ -0,0 +1,80 @@
+"""
+Notification Routing
+Who receives each kind of staff notification, and who it is sent from
+"""
+import threading
+import time
+
+from flask import current_app
+
+
+class _NotificationState:
+    """One app's routes, sender and resolved-recipient cache"""
+
+    def __init__(self, app):
+        self.routes = app.config.get('NOTIFICATION_RECIPIENTS', {'default': ['@admins']})
+        self.ttl = app.config.get('NOTIFICATION_CACHE_SECONDS', 300)
+        self.sender = (app.config.get('MAIL_SENDER_NAME'), app.config.get('MAIL_DEFAULT_SENDER'))
+        self.cache = {}
+        self.lock = threading.Lock()
+
+
+class NotificationRouter:
+    """
+    Flask extension resolving notification recipients.
+
+    NOTIFICATION_RECIPIENTS maps an event type to a list of entries. An
+    entry is an email address or '@name' for a registered source (e.g.
+    '@admins' for every admin account). Events without a route use
+    NOTIFICATION_RECIPIENTS['default']. Resolved lists are cached per event
+    until invalidate() is called or NOTIFICATION_CACHE_SECONDS pass. Routes
+    and the cache belong to each app (app.extensions['notifications']);
+    sources are shared.
+    """
+
+    def __init__(self, app=None):
+        self.sources = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['notifications'] = _NotificationState(app)
+
+    @property
+    def state(self):
+        """The current app's routes and cache, made by init_app()"""
+        return current_app.extensions['notifications']
+
+    @property
+    def sender(self):
+        return self.state.sender
+
+    def source(self, name):
+        """Decorator registering a function that returns addresses for '@name'"""
+        def decorator(f):
+            self.sources[name] = f
+            return f
+        return decorator
+
+    def recipients(self, event):
+        """Deduplicated addresses for an event type, in route order"""
+        state = self.state
+        now = time.monotonic()
+        with state.lock:
+            cached = state.cache.get(event)
+        if cached and cached[0] > now:
+            return list(cached[1])
+
+        addresses = []
+        for entry in state.routes.get(event, state.routes.get('default', [])):
+            found = self.sources[entry[1:]]() if entry.startswith('@') else [entry]
+            addresses.extend(address for address in found if address and address not in addresses)
+
+        with state.lock:
+            state.cache[event] = (now + state.ttl, tuple(addresses))
+        return addresses
+
+    def invalidate(self):
+        state = self.state
+        with state.lock:
+            state.cache.clear()
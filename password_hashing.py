@@ -0,0 +1,145 @@
+"""
+Password Hashing
+Configurable hashing policy run on a bounded worker pool, with timing metrics
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class HashingBusy(Exception):
+    """Raised when every hashing slot stays taken for PASSWORD_HASH_WAIT_SECONDS"""
+
+
+OPERATIONS = ('hash', 'verify')
+
+
+def _empty_stats():
+    return {
+        operation: {'count': 0, 'rejected': 0, 'hash_seconds': 0.0, 'max_hash_seconds': 0.0, 'wait_seconds': 0.0}
+        for operation in OPERATIONS
+    }
+
+
+def _timed(fn, args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+class _PasswordHasherState:
+    """One app's hashing policy, worker pool and timing stats"""
+
+    def __init__(self, app):
+        self.method = app.config.get('PASSWORD_HASH_METHOD', 'scrypt')
+        self.prefix = None
+
+        workers = app.config.get('PASSWORD_HASH_WORKERS') or min(4, os.cpu_count() or 1)
+        queue = app.config.get('PASSWORD_HASH_QUEUE', workers * 8)
+        self.wait_timeout = app.config.get('PASSWORD_HASH_WAIT_SECONDS', 5)
+        # Idle workers exit once the app, and with it this pool, is garbage collected
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self.slots = threading.BoundedSemaphore(workers + queue)
+        self.lock = threading.Lock()
+        self.stats = _empty_stats()
+
+
+class PasswordHasher:
+    """
+    Flask extension that owns password hashing.
+
+    PASSWORD_HASH_METHOD is any werkzeug method string ('scrypt',
+    'scrypt:32768:8:1', 'pbkdf2:sha256:600000'). Stored hashes made with
+    other parameters report needs_rehash(), so logins upgrade them.
+
+    Hashes run on a pool of PASSWORD_HASH_WORKERS threads (hashlib releases
+    the GIL while hashing), with at most PASSWORD_HASH_QUEUE more waiting.
+    That caps the CPU a login storm can take from other requests; callers
+    beyond the queue get HashingBusy instead of piling up. Each app has its
+    own pool and stats in app.extensions['password_hasher'].
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['password_hasher'] = _PasswordHasherState(app)
+
+    @property
+    def state(self):
+        """The current app's policy, pool and stats, made by init_app()"""
+        return current_app.extensions['password_hasher']
+
+    @property
+    def method(self):
+        return self.state.method
+
+    @property
+    def prefix(self):
+        """The method string stored hashes should start with, e.g. 'scrypt:32768:8:1'"""
+        state = self.state
+        if state.prefix is None:
+            # Werkzeug expands bare method names to its defaults; hash once to see how.
+            # Done on first use so importing the app doesn't pay for a hash.
+            state.prefix = generate_password_hash('', method=state.method).split('$', 1)[0]
+        return state.prefix
+
+    def reset_stats(self):
+        state = self.state
+        with state.lock:
+            state.stats = _empty_stats()
+
+    def stats(self):
+        """Per-operation counts and mean/max hash and queue-wait times in milliseconds"""
+        state = self.state
+        with state.lock:
+            return {
+                operation: {
+                    'count': s['count'],
+                    'rejected': s['rejected'],
+                    'mean_hash_ms': round(s['hash_seconds'] / s['count'] * 1000, 2) if s['count'] else 0,
+                    'max_hash_ms': round(s['max_hash_seconds'] * 1000, 2),
+                    'mean_wait_ms': round(s['wait_seconds'] / s['count'] * 1000, 2) if s['count'] else 0,
+                }
+                for operation, s in state.stats.items()
+            }
+
+    def _run(self, operation, fn, *args):
+        state = self.state
+        queued = time.perf_counter()
+        if not state.slots.acquire(timeout=state.wait_timeout):
+            with state.lock:
+                state.stats[operation]['rejected'] += 1
+            raise HashingBusy()
+        try:
+            future = state.executor.submit(_timed, fn, args)
+            result, elapsed = future.result()
+        finally:
+            state.slots.release()
+        self._record(state, operation, elapsed, time.perf_counter() - queued - elapsed)
+        return result
+
+    def _record(self, state, operation, elapsed, waited):
+        with state.lock:
+            s = state.stats[operation]
+            s['count'] += 1
+            s['hash_seconds'] += elapsed
+            s['wait_seconds'] += max(0, waited)
+            s['max_hash_seconds'] = max(s['max_hash_seconds'], elapsed)
+
+    def hash(self, password):
+        return self._run('hash', generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        if not pwhash:
+            return False
+        return self._run('verify', check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """True when pwhash was made with a different method or parameters"""
+        return bool(pwhash) and pwhash.split('$', 1)[0] != self.prefix
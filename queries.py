@@ -0,0 +1,787 @@
+"""
+Read Queries
+Dashboard, roster, report, booking list, export and catalogue queries
+"""
+import csv
+import hashlib
+import time
+from datetime import datetime, timedelta
+from io import StringIO
+from itertools import groupby
+from operator import attrgetter
+
+from flask import current_app, stream_with_context
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
+
+from extensions import db
+from models import (Activity, Attendance, Booking, BookingRollup, Child, Parent, Tutor, booking_search_subquery,
+                    get_cache_version, get_capacity_snapshot)
+from serializers import ActivitySchema
+
+
+# ==================== Query Caches ====================
+# Short-lived result caches live on the app, so each app built by
+# create_app() starts empty and never sees another app's results
+
+QUERY_CACHES = ('activity_catalogue', 'booking_counts')
+
+def init_query_caches(app):
+    app.extensions['query_caches'] = {name: {} for name in QUERY_CACHES}
+
+def _query_cache(name):
+    return current_app.extensions['query_caches'][name]
+
+# ==================== Dashboard Queries ====================
+
+def get_activity_booking_counts():
+    """
+    Return {activity_id: confirmed_booking_count} using a single GROUP BY.
+    Cancelled bookings are left out, matching the rollups and live capacity.
+    """
+    rows = db.session.query(
+        Booking.activity_id,
+        db.func.count(Booking.id)
+    ).filter(Booking.status == 'confirmed').group_by(Booking.activity_id).all()
+    return {activity_id: count for activity_id, count in rows}
+
+def get_tutor_activity_counts():
+    """Return {tutor_id: activity_count} using a single GROUP BY"""
+    rows = db.session.query(
+        Activity.tutor_id,
+        db.func.count(Activity.id)
+    ).filter(Activity.tutor_id.isnot(None)).group_by(Activity.tutor_id).all()
+    return {tutor_id: count for tutor_id, count in rows}
+
+def get_admin_dashboard_data():
+    """
+    Load everything the admin dashboard renders in a fixed number of queries.
+    Rosters come from one selectinload (with child and parent joined in), so
+    the template never lazy-loads per activity or per booking. Like the
+    counts, rosters list confirmed bookings only.
+    """
+    activities = Activity.query.options(
+        selectinload(Activity.bookings.and_(Booking.status == 'confirmed'))
+            .joinedload(Booking.child)
+            .joinedload(Child.parent)
+    ).order_by(Activity.id).all()
+    
+    return {
+        'activities': activities,
+        'booking_counts': get_activity_booking_counts(),
+        'tutor_activity_counts': get_tutor_activity_counts(),
+        # Only show approved tutors in the main list/dropdowns
+        'tutors': Tutor.query.filter_by(status='approved').all(),
+    }
+
+def get_tutor_dashboard_data(tutor_id):
+    """Load a tutor's activities with confirmed enrolment counts from one GROUP BY"""
+    activities = Activity.query.filter_by(tutor_id=tutor_id).order_by(Activity.id).all()
+    
+    rows = db.session.query(
+        Booking.activity_id,
+        db.func.count(Booking.id)
+    ).join(Activity, Activity.id == Booking.activity_id).filter(
+        Activity.tutor_id == tutor_id,
+        Booking.status == 'confirmed'
+    ).group_by(Booking.activity_id).all()
+    
+    return {
+        'activities': activities,
+        'enrolled_counts': {activity_id: count for activity_id, count in rows},
+    }
+
+
+def get_parent_dashboard_data(parent_id):
+    """
+    Load the parent dashboard with explicit eager loading and aggregate counts.
+    Uses the same number of queries however many children, bookings or
+    activities the parent sees.
+    """
+    children = Child.query.filter_by(parent_id=parent_id).order_by(Child.id).all()
+    
+    child_rows = db.session.query(
+        Booking.child_id,
+        db.func.count(Booking.id)
+    ).filter(Booking.parent_id == parent_id).group_by(Booking.child_id).all()
+    
+    bookings = Booking.query.options(
+        joinedload(Booking.activity),
+        joinedload(Booking.child)
+    ).filter_by(parent_id=parent_id, status='confirmed').order_by(Booking.booking_date).all()
+    
+    activities = Activity.query.options(
+        joinedload(Activity.tutor)
+    ).order_by(Activity.id).all()
+    
+    # Capacity is per session: show each activity's next one, which the
+    # live capacity stream keeps up to date for whatever date is picked
+    today = datetime.utcnow().date()
+    next_sessions = {activity.id: get_next_session_date(activity, today) for activity in activities}
+    booked = {item['activity_id']: item['booked'] for item in get_capacity_snapshot(from_date=today)}
+    
+    return {
+        'children': children,
+        'child_booking_counts': {child_id: count for child_id, count in child_rows},
+        'bookings': bookings,
+        'activities': activities,
+        'next_sessions': next_sessions,
+        'session_booking_counts': {
+            activity_id: booked.get(activity_id, {}).get(day.isoformat(), 0) for activity_id, day in next_sessions.items()
+        },
+    }
+
+
+# ==================== Tutor Statistics ====================
+
+def _tutor_stats_from_row(row):
+    """Turn an aggregate result row into the dict the tutor templates expect"""
+    capacity = row.capacity or 0
+    return {
+        'tutor': row.Tutor,
+        'activity_count': row.activity_count,
+        'active_students': row.active_students,
+        'booked': row.booked,
+        'upcoming_sessions': row.upcoming_sessions,
+        'capacity': capacity,
+        'revenue': row.revenue or 0,
+        'fill_rate': int((row.booked / capacity) * 100) if capacity else 0
+    }
+
+def get_tutor_stats(tutor_id=None):
+    """
+    Compute activity count, active students, upcoming sessions and fill rate
+    for every tutor (or a single tutor) with one aggregate query joined across
+    Tutor, Activity and Booking.
+    """
+    today = datetime.utcnow().date()
+    
+    # Fill rate compares bookings with the places offered by the same
+    # sessions: each booked (activity, date) counts its max_capacity once.
+    # Summed per tutor in a subquery so the booking join doesn't multiply it
+    sessions = db.session.query(
+        Activity.tutor_id, Activity.max_capacity
+    ).join(Booking, Booking.activity_id == Activity.id).filter(
+        Booking.status == 'confirmed'
+    ).group_by(Activity.id, Booking.booking_date).subquery()
+    capacity = db.session.query(
+        sessions.c.tutor_id,
+        db.func.sum(sessions.c.max_capacity).label('capacity')
+    ).group_by(sessions.c.tutor_id).subquery()
+    
+    # A session is one activity on one date
+    session_key = db.cast(Booking.activity_id, db.String) + '@' + db.cast(Booking.booking_date, db.String)
+    
+    query = db.session.query(
+        Tutor,
+        db.func.count(db.distinct(Activity.id)).label('activity_count'),
+        db.func.count(db.distinct(Booking.child_id)).label('active_students'),
+        db.func.count(Booking.id).label('booked'),
+        db.func.count(db.distinct(db.case((Booking.booking_date >= today, session_key)))).label('upcoming_sessions'),
+        db.func.sum(Booking.cost).label('revenue'),
+        db.func.coalesce(db.func.max(capacity.c.capacity), 0).label('capacity')
+    ).outerjoin(
+        capacity, capacity.c.tutor_id == Tutor.id
+    ).outerjoin(
+        Activity, Activity.tutor_id == Tutor.id
+    ).outerjoin(
+        Booking, db.and_(Booking.activity_id == Activity.id, Booking.status == 'confirmed')
+    ).group_by(Tutor.id).order_by(Tutor.id)
+    
+    if tutor_id is not None:
+        row = query.filter(Tutor.id == tutor_id).first()
+        return _tutor_stats_from_row(row) if row else None
+    
+    return [_tutor_stats_from_row(row) for row in query.all()]
+
+def get_tutor_activity_stats(tutor_id):
+    """Per-activity enrolment and revenue for one tutor in a single GROUP BY"""
+    rows = db.session.query(
+        Activity,
+        db.func.count(Booking.id).label('booked'),
+        db.func.sum(Booking.cost).label('revenue')
+    ).outerjoin(
+        Booking, db.and_(Booking.activity_id == Activity.id, Booking.status == 'confirmed')
+    ).filter(Activity.tutor_id == tutor_id).group_by(Activity.id).order_by(Activity.id).all()
+    
+    return [{
+        'activity': row.Activity,
+        'booked': row.booked,
+        'capacity': row.Activity.max_capacity,
+        'revenue': row.revenue or 0
+    } for row in rows]
+
+
+
+# ==================== Class Rosters ====================
+
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+def get_activity_occurrences(activity, around=None, weeks_back=8, weeks_ahead=8):
+    """Weekly session dates for an activity, centred on the given date"""
+    around = around or datetime.utcnow().date()
+    if activity.day_of_week not in WEEKDAYS:
+        return []
+    
+    weekday = WEEKDAYS.index(activity.day_of_week)
+    # Most recent occurrence on or before the reference date
+    latest = around - timedelta(days=(around.weekday() - weekday) % 7)
+    first = latest - timedelta(weeks=weeks_back)
+    return [first + timedelta(weeks=i) for i in range(weeks_back + weeks_ahead + 1)]
+
+def get_default_session_date(activity, today=None):
+    """Today if the activity runs today, otherwise its most recent session"""
+    today = today or datetime.utcnow().date()
+    occurrences = get_activity_occurrences(activity, around=today, weeks_back=0, weeks_ahead=0)
+    return occurrences[0] if occurrences else today
+
+def get_next_session_date(activity, today=None):
+    """Today if the activity runs today, otherwise its next session"""
+    today = today or datetime.utcnow().date()
+    occurrences = get_activity_occurrences(activity, around=today, weeks_back=0, weeks_ahead=1)
+    upcoming = [day for day in occurrences if day >= today]
+    return upcoming[0] if upcoming else today
+
+def get_session_roster(activity_id, session_date):
+    """
+    Confirmed bookings for one occurrence of an activity, children joined in.
+    Filters on (activity_id, booking_date) so it uses ix_booking_activity_date
+    rather than scanning the activity's whole booking history.
+    """
+    return Booking.query.join(Booking.child).options(
+        contains_eager(Booking.child)
+    ).filter(
+        Booking.activity_id == activity_id,
+        Booking.booking_date == session_date,
+        Booking.status == 'confirmed'
+    ).order_by(Child.name).all()
+
+def get_session_child_ids(activity_id, session_date):
+    """Ids of children booked on one occurrence, without loading the rows"""
+    return [row.child_id for row in db.session.query(Booking.child_id).filter(
+        Booking.activity_id == activity_id,
+        Booking.booking_date == session_date,
+        Booking.status == 'confirmed'
+    )]
+
+
+# ==================== Session Capacity ====================
+
+class SessionCapacity:
+    """Confirmed bookings against max_capacity for one session of an activity"""
+
+    def __init__(self, activity, session_date, booked):
+        self.activity_id = activity.id
+        self.capacity = activity.max_capacity or 0
+        self.session_date = session_date
+        self.booked = booked
+
+    @property
+    def spots_left(self):
+        return self.capacity - self.booked
+
+    @property
+    def is_available(self):
+        return self.spots_left > 0
+
+    @property
+    def percentage(self):
+        return int(self.booked / self.capacity * 100) if self.capacity else 100
+
+    @property
+    def status(self):
+        if self.spots_left <= 0:
+            return 'full'
+        if self.spots_left <= 2:
+            return 'critical'
+        if self.spots_left <= 5:
+            return 'filling'
+        return 'available'
+
+def get_session_capacity(activity, session_date):
+    """Count one session's confirmed bookings with a COUNT on ix_booking_activity_date"""
+    booked = db.session.query(db.func.count(Booking.id)).filter(
+        Booking.activity_id == activity.id,
+        Booking.booking_date == session_date,
+        Booking.status == 'confirmed'
+    ).scalar()
+    return SessionCapacity(activity, session_date, booked)
+
+# ==================== Attendance Reports ====================
+
+def get_attendance_history(activity_id, before=None, date_from=None, date_to=None, per_page=20):
+    """
+    Build a page of attendance sessions for an activity, newest first.
+    
+    One query picks the session dates for the page, and one ordered query
+    streams every record in that window, grouped by date in Python.
+    Returns (sessions, next_before) where next_before is the cursor for the
+    next (older) page, or None on the last page.
+    """
+    date_query = db.session.query(Attendance.date).filter(Attendance.activity_id == activity_id)
+    if before:
+        date_query = date_query.filter(Attendance.date < before)
+    if date_from:
+        date_query = date_query.filter(Attendance.date >= date_from)
+    if date_to:
+        date_query = date_query.filter(Attendance.date <= date_to)
+    
+    dates = [row.date for row in date_query.distinct().order_by(Attendance.date.desc()).limit(per_page + 1)]
+    has_more = len(dates) > per_page
+    dates = dates[:per_page]
+    if not dates:
+        return [], None
+    
+    records = Attendance.query.join(Attendance.child).options(
+        contains_eager(Attendance.child)
+    ).filter(
+        Attendance.activity_id == activity_id,
+        Attendance.date >= dates[-1],
+        Attendance.date <= dates[0]
+    ).order_by(Attendance.date.desc(), Child.name).yield_per(500)
+    
+    sessions = []
+    for date, group in groupby(records, key=attrgetter('date')):
+        session_records = list(group)
+        statuses = [record.status for record in session_records]
+        sessions.append({
+            'date': date,
+            'records': session_records,
+            'total': len(session_records),
+            'present': statuses.count('present'),
+            'late': statuses.count('late'),
+            'absent': statuses.count('absent')
+        })
+    
+    return sessions, (dates[-1] if has_more else None)
+
+
+
+def save_attendance_register(activity_id, date, entries):
+    """
+    Upsert a whole attendance register in one statement.
+    
+    entries is a list of dicts with child_id, status and notes. On SQLite and
+    PostgreSQL this is a single INSERT ... ON CONFLICT DO UPDATE against the
+    (activity_id, date, child_id) unique index; other backends fall back to
+    one lookup query plus bulk insert/update mappings.
+    """
+    if not entries:
+        return 0
+    
+    recorded_at = datetime.utcnow()
+    rows = [{
+        'child_id': entry['child_id'],
+        'activity_id': activity_id,
+        'date': date,
+        'status': entry['status'],
+        'notes': entry['notes'],
+        'recorded_at': recorded_at
+    } for entry in entries]
+    
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+        stmt = insert(Attendance).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['activity_id', 'date', 'child_id'],
+            set_={
+                'status': stmt.excluded.status,
+                'notes': stmt.excluded.notes,
+                'recorded_at': stmt.excluded.recorded_at
+            }
+        )
+        db.session.execute(stmt)
+    else:
+        existing = dict(db.session.query(Attendance.child_id, Attendance.id).filter_by(
+            activity_id=activity_id,
+            date=date
+        ).all())
+        updates = [dict(row, id=existing[row['child_id']]) for row in rows if row['child_id'] in existing]
+        inserts = [row for row in rows if row['child_id'] not in existing]
+        db.session.bulk_update_mappings(Attendance, updates)
+        db.session.bulk_insert_mappings(Attendance, inserts)
+    
+    db.session.commit()
+    return len(rows)
+
+
+
+# ==================== Booking Lists ====================
+
+BOOKING_FILTERS = ('search', 'activity', 'status', 'date_from', 'date_to')
+
+def get_booking_filters(args):
+    """Pick the admin booking filters out of request args"""
+    return {name: args.get(name, '') for name in BOOKING_FILTERS}
+
+def build_booking_query(filters):
+    """
+    Apply admin booking filters.
+    Returns (query, keyset) where keyset is the list of (column, descending)
+    sort keys that make the order total, for keyset pagination.
+    """
+    query = Booking.query
+    keyset = [(Booking.created_at, True), (Booking.id, True)]
+    
+    search = filters.get('search')
+    if search:
+        matches = booking_search_subquery(search)
+        if matches is not None:
+            # Ranked full-text matches, best first
+            query = query.join(matches, matches.c.booking_id == Booking.id)
+            keyset.insert(0, (matches.c.rank, False))
+        else:
+            query = query.join(Parent, Booking.parent_id == Parent.id).join(Child, Booking.child_id == Child.id).filter(
+                db.or_(
+                    Parent.full_name.ilike(f'%{search}%'),
+                    Child.name.ilike(f'%{search}%')
+                )
+            )
+    
+    if filters.get('activity'):
+        query = query.filter(Booking.activity_id == filters['activity'])
+    
+    if filters.get('status'):
+        query = query.filter(Booking.status == filters['status'])
+    
+    if filters.get('date_from'):
+        try:
+            from_date = datetime.strptime(filters['date_from'], '%Y-%m-%d').date()
+            query = query.filter(Booking.booking_date >= from_date)
+        except ValueError:
+            pass
+    
+    if filters.get('date_to'):
+        try:
+            to_date = datetime.strptime(filters['date_to'], '%Y-%m-%d').date()
+            query = query.filter(Booking.booking_date <= to_date)
+        except ValueError:
+            pass
+    
+    return query, keyset
+
+def get_cached_booking_count(filters, query):
+    """
+    Total for a filtered booking list, cached per filter set for
+    BOOKING_COUNT_CACHE_SECONDS so paging doesn't re-run COUNT(*).
+    """
+    cache = _query_cache('booking_counts')
+    key = tuple(sorted(filters.items()))
+    now = time.monotonic()
+    cached = cache.get(key)
+    if cached and cached[1] > now:
+        return cached[0]
+    
+    if len(cache) >= 256:
+        cache.clear()
+    
+    count = query.order_by(None).count()
+    cache[key] = (count, now + current_app.config['BOOKING_COUNT_CACHE_SECONDS'])
+    return count
+
+def _cursor_serializer():
+    return URLSafeSerializer(current_app.config['SECRET_KEY'], salt='booking-cursor')
+
+def encode_cursor(values):
+    """Sign a row's sort key values into an opaque URL-safe cursor"""
+    return _cursor_serializer().dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+
+def decode_cursor(cursor, keyset):
+    """Inverse of encode_cursor; returns None for a missing or tampered cursor"""
+    try:
+        values = _cursor_serializer().loads(cursor)
+    except BadSignature:
+        return None
+    if not isinstance(values, list) or len(values) != len(keyset):
+        return None
+    
+    decoded = []
+    for (column, _), value in zip(keyset, values):
+        if value is not None and column.type.python_type is datetime:
+            value = datetime.fromisoformat(value)
+        decoded.append(value)
+    return decoded
+
+def _keyset_after(keyset, values):
+    """Rows strictly after `values` in keyset order (expanded row comparison)"""
+    clauses = []
+    for i, (column, descending) in enumerate(keyset):
+        equal = [keyset[j][0] == values[j] for j in range(i)]
+        beyond = column < values[i] if descending else column > values[i]
+        clauses.append(db.and_(*equal, beyond))
+    return db.or_(*clauses)
+
+def keyset_paginate(query, keyset, after=None, before=None, per_page=20):
+    """
+    Page through query in keyset order without OFFSET.
+    Pass the `after` cursor for the next page or `before` for the previous
+    one. Returns a dict of items, next_cursor and prev_cursor.
+    """
+    backwards = before is not None
+    cursor = decode_cursor(before if backwards else after, keyset) if (before or after) else None
+    
+    # Walking backwards is the same walk with every sort key flipped
+    order = [(column, descending != backwards) for column, descending in keyset]
+    
+    page_query = query.add_columns(*[column for column, _ in keyset])
+    if cursor is not None:
+        page_query = page_query.filter(_keyset_after(order, cursor))
+    page_query = page_query.order_by(*[column.desc() if descending else column.asc() for column, descending in order])
+    
+    rows = page_query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+    
+    keys = [tuple(row)[1:] for row in rows]
+    next_cursor = prev_cursor = None
+    if rows:
+        if has_more or backwards:
+            next_cursor = encode_cursor(keys[-1])
+        if cursor is not None and (has_more or not backwards):
+            prev_cursor = encode_cursor(keys[0])
+    
+    return {
+        'items': [row[0] for row in rows],
+        'next_cursor': next_cursor,
+        'prev_cursor': prev_cursor
+    }
+
+def get_booking_page(filters, after=None, before=None, per_page=20):
+    """One keyset page of admin bookings with an approximate total"""
+    query, keyset = build_booking_query(filters)
+    total = get_cached_booking_count(filters, query)
+    
+    query = query.options(
+        joinedload(Booking.parent),
+        joinedload(Booking.child),
+        joinedload(Booking.activity)
+    )
+    page = keyset_paginate(query, keyset, after=after, before=before, per_page=per_page)
+    page['total'] = total
+    return page
+
+
+# ==================== Exports ====================
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+def iter_export(query, schema, fmt, batch_size=1000):
+    """
+    Yield an export of query rows as CSV or NDJSON text chunks.
+    Rows are fetched with yield_per and written one batch at a time, so
+    memory stays flat however many rows match. The CSV header goes out
+    before the first row is fetched.
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    if fmt == 'csv':
+        writer.writerow(schema.names)
+        yield buffer.getvalue()
+    
+    batch = []
+    for obj in query.yield_per(batch_size):
+        batch.append(obj)
+        if len(batch) < batch_size:
+            continue
+        yield _format_export_batch(batch, schema, fmt, buffer, writer)
+        batch = []
+    if batch:
+        yield _format_export_batch(batch, schema, fmt, buffer, writer)
+
+def _format_export_batch(batch, schema, fmt, buffer, writer):
+    rows = schema.dump_many(batch)
+    if fmt == 'ndjson':
+        return ''.join(current_app.json.dumps(row, sort_keys=False) + '\n' for row in rows)
+    buffer.seek(0)
+    buffer.truncate()
+    writer.writerows([row[name] for name in schema.names] for row in rows)
+    return buffer.getvalue()
+
+def export_response(query, schema, fmt, filename):
+    """Stream a query as a downloadable export file"""
+    generator = stream_with_context(iter_export(query, schema, fmt, current_app.config['EXPORT_BATCH_SIZE']))
+    response = current_app.response_class(generator, mimetype=EXPORT_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+def get_booking_export_query(filters):
+    """Every booking matching the admin filters, in list order, names joined in"""
+    query, keyset = build_booking_query(filters)
+    return query.options(
+        joinedload(Booking.parent),
+        joinedload(Booking.child),
+        joinedload(Booking.activity)
+    ).order_by(*[column.desc() if descending else column.asc() for column, descending in keyset])
+
+def get_attendance_export_query(activity_id, date_from=None, date_to=None):
+    """Every attendance record for an activity, newest session first"""
+    query = Attendance.query.join(Attendance.child).options(
+        contains_eager(Attendance.child)
+    ).filter(Attendance.activity_id == activity_id)
+    if date_from:
+        query = query.filter(Attendance.date >= date_from)
+    if date_to:
+        query = query.filter(Attendance.date <= date_to)
+    return query.order_by(Attendance.date.desc(), Child.name)
+
+
+# ==================== Activity Catalogue ====================
+
+CATALOGUE_FILTERS = ('day', 'min_price', 'max_price', 'tutor_id', 'start_after', 'end_before',
+                     'q', 'available', 'date', 'sort', 'page', 'per_page', 'fields')
+
+CATALOGUE_SORTS = {
+    'name': (Activity.name, Activity.id),
+    'price-low': (Activity.price, Activity.id),
+    'price-high': (Activity.price.desc(), Activity.id),
+    'day': (db.case({day: i for i, day in enumerate(WEEKDAYS)}, value=Activity.day_of_week, else_=len(WEEKDAYS)),
+            Activity.start_time, Activity.id),
+}
+
+def _parse_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def _parse_time(value):
+    """Normalise H:MM / HH:MM to the zero-padded form activities are stored in"""
+    try:
+        return datetime.strptime(value, '%H:%M').strftime('%H:%M')
+    except (TypeError, ValueError):
+        return None
+
+def get_catalogue_filters(args):
+    """
+    Validate /api/activities query parameters into a normalised dict.
+    Unknown or malformed values are dropped rather than rejected, so the
+    result doubles as a stable cache key.
+    """
+    filters = {}
+    if args.get('day') in WEEKDAYS:
+        filters['day'] = args['day']
+    for name in ('min_price', 'max_price'):
+        value = _parse_float(args.get(name))
+        if value is not None:
+            filters[name] = value
+    if args.get('tutor_id', '').isdigit():
+        filters['tutor_id'] = int(args['tutor_id'])
+    for name in ('start_after', 'end_before'):
+        value = _parse_time(args.get(name))
+        if value:
+            filters[name] = value
+    q = (args.get('q') or '').strip()
+    if q:
+        filters['q'] = q[:100]
+    if args.get('available') in ('1', 'true', 'yes'):
+        filters['available'] = True
+        try:
+            filters['date'] = datetime.strptime(args.get('date', ''), '%Y-%m-%d').date()
+        except ValueError:
+            pass
+    filters['sort'] = args.get('sort') if args.get('sort') in CATALOGUE_SORTS else 'name'
+    filters['fields'] = ActivitySchema.parse_fields(args.get('fields'))
+    
+    page = args.get('page', type=int) or 1
+    per_page = args.get('per_page', type=int)
+    filters['page'] = max(page, 1)
+    filters['per_page'] = min(max(per_page, 1), 100) if per_page else None
+    return filters
+
+def build_catalogue_query(filters):
+    """
+    Apply catalogue filters. Day and time window use ix_activity_day_start,
+    price uses ix_activity_price, tutor uses ix_activity_tutor; the name
+    match is applied to the rows those leave.
+    """
+    query = Activity.query
+    
+    if 'day' in filters:
+        query = query.filter(Activity.day_of_week == filters['day'])
+    if 'start_after' in filters:
+        query = query.filter(Activity.start_time >= filters['start_after'])
+    if 'end_before' in filters:
+        query = query.filter(Activity.end_time <= filters['end_before'])
+    if 'min_price' in filters:
+        query = query.filter(Activity.price >= filters['min_price'])
+    if 'max_price' in filters:
+        query = query.filter(Activity.price <= filters['max_price'])
+    if 'tutor_id' in filters:
+        query = query.filter(Activity.tutor_id == filters['tutor_id'])
+    if 'q' in filters:
+        query = query.filter(Activity.name.ilike(f"%{filters['q']}%"))
+    
+    if filters.get('available'):
+        if filters.get('date'):
+            # Confirmed bookings on that session, via ix_booking_activity_date
+            booked = db.session.query(db.func.count(Booking.id)).filter(
+                Booking.activity_id == Activity.id,
+                Booking.booking_date == filters['date'],
+                Booking.status == 'confirmed'
+            ).correlate(Activity).scalar_subquery()
+        else:
+            # Confirmed bookings overall, read from the activity rollup's primary key
+            booked = db.session.query(BookingRollup.bookings).filter(
+                BookingRollup.scope == 'activity',
+                BookingRollup.key == db.cast(Activity.id, db.String)
+            ).correlate(Activity).scalar_subquery()
+        query = query.filter(db.func.coalesce(booked, 0) < db.func.coalesce(Activity.max_capacity, 20))
+    
+    return query.order_by(*CATALOGUE_SORTS[filters.get('sort', 'name')])
+
+def get_activity_catalogue(filters):
+    """
+    Return the catalogue for a filter set as {'body', 'etag', 'last_modified',
+    'total'}. The ETag is a hash of the body, so it is strong and stable
+    across workers. Last-Modified is the newest activity or the last
+    committed activity change (the 'catalogue' cache version), so deletions
+    move it forward and every worker sends the same value.
+    
+    Cached bodies are keyed by that version, so a change made in any worker
+    is picked up by all of them. Results depending on availability are never
+    cached, since bookings change them without touching activities.
+    """
+    # Serialised bodies by catalogue version and filter set
+    cache = _query_cache('activity_catalogue')
+    version, changed_at = get_cache_version('catalogue') or (None, None)
+    key = (version, *sorted(filters.items()))
+    now = time.monotonic()
+    cacheable = not filters.get('available')
+    cached = cache.get(key)
+    if cacheable and cached and cached['expires'] > now:
+        return cached
+    
+    query = build_catalogue_query(filters)
+    per_page = filters.get('per_page')
+    if per_page:
+        total = query.order_by(None).count()
+        activities = query.limit(per_page).offset((filters['page'] - 1) * per_page).all()
+    else:
+        activities = query.all()
+        total = len(activities)
+    
+    body = current_app.json.dumps(ActivitySchema.dump_many(activities, filters.get('fields'))).encode('utf-8')
+    changed = [a.created_at for a in activities if a.created_at]
+    if changed_at:
+        changed.append(changed_at)
+    
+    entry = {
+        'body': body,
+        'etag': hashlib.sha256(body).hexdigest()[:32],
+        'last_modified': max(changed).replace(microsecond=0) if changed else None,
+        'total': total,
+        'expires': now + current_app.config['ACTIVITY_CATALOGUE_CACHE_SECONDS'],
+    }
+    if cacheable:
+        if len(cache) >= 256:
+            cache.clear()
+        cache[key] = entry
+    return entry
@@ -0,0 +1,175 @@
+"""
+Rate Limiting
+Token-bucket limits for expensive routes, keyed by client IP and by account
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, flash, redirect, render_template, request, url_for
+
+
+def parse_rate(rate):
+    """'5/minute' -> (capacity 5, refill 5/60 tokens per second)"""
+    count, _, period = rate.partition('/')
+    seconds = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}[period.strip().rstrip('s')]
+    capacity = int(count)
+    return capacity, capacity / seconds
+
+
+class MemoryBuckets:
+    """Per-process buckets; the least recently used are dropped past max_entries"""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate, now):
+        """Spend one token. Returns seconds until one is available (0 = allowed)"""
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+        return 0 if allowed else (1 - tokens) / rate
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class RedisBuckets:
+    """Buckets shared by every worker, updated atomically by a Lua script"""
+
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url, prefix='ratelimit:'):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._take = self.client.register_script(self.SCRIPT)
+
+    def take(self, key, capacity, rate, now):
+        allowed, tokens = self._take(keys=[self.prefix + key], args=[capacity, rate, now])
+        return 0 if int(allowed) else (1 - float(tokens)) / rate
+
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + '*'):
+            self.client.delete(key)
+
+
+class _RateLimiterState:
+    """One app's limits and buckets"""
+
+    def __init__(self, app):
+        self.enabled = app.config.get('RATE_LIMIT_ENABLED', True)
+        self.limits = {
+            scope: {kind: parse_rate(rate) for kind, rate in rates.items()}
+            for scope, rates in app.config.get('RATE_LIMITS', {}).items()
+        }
+        self.buckets = MemoryBuckets(app.config.get('RATE_LIMIT_MAX_KEYS', 10000))
+
+        url = app.config.get('RATE_LIMIT_URL')
+        if url:
+            try:
+                self.buckets = RedisBuckets(url)
+            except ImportError:
+                app.logger.warning('RATE_LIMIT_URL is set but redis is not installed; using in-process limits')
+
+
+class RateLimiter:
+    """
+    Flask extension holding the buckets.
+
+    RATE_LIMITS maps a scope name to {'ip': rate, 'account': rate}; either
+    key may be left out. Rates look like '10/minute'. The account key is
+    the normalised email posted with the form, so one account can't be
+    brute-forced from many addresses. Buckets live in this process unless
+    RATE_LIMIT_URL points at Redis; each app keeps its own in
+    app.extensions['rate_limiter'].
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['rate_limiter'] = _RateLimiterState(app)
+
+    @property
+    def state(self):
+        """The current app's limits and buckets, made by init_app()"""
+        return current_app.extensions['rate_limiter']
+
+    def check(self, scope):
+        """Spend a token from each of the scope's buckets; returns the retry wait in seconds"""
+        state = self.state
+        limits = state.limits.get(scope)
+        if not state.enabled or not limits:
+            return 0
+
+        identities = {'ip': request.remote_addr or 'unknown'}
+        email = (request.form.get('email') or '').strip().lower()
+        if email:
+            identities['account'] = email
+
+        now = time.time()
+        wait = 0
+        for kind, (capacity, rate) in limits.items():
+            if kind in identities:
+                wait = max(wait, state.buckets.take(f'{scope}:{kind}:{identities[kind]}', capacity, rate, now))
+        return wait
+
+    def limit(self, scope, template=None, redirect_to=None):
+        """
+        Decorator that rejects over-limit POSTs before the view runs.
+        The rejection re-renders `template` with an error, or flashes and
+        redirects to `redirect_to`, or returns a plain 429.
+        """
+        def decorator(f):
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                if request.method != 'POST':
+                    return f(*args, **kwargs)
+                wait = self.check(scope)
+                if not wait:
+                    return f(*args, **kwargs)
+
+                retry_after = max(1, math.ceil(wait))
+                current_app.logger.warning('Rate limit %s hit by %s', scope, request.remote_addr)
+                message = f'Too many attempts. Please try again in {retry_after} seconds.'
+                headers = {'Retry-After': str(retry_after)}
+                if template:
+                    return render_template(template, error=message), 429, headers
+                if redirect_to:
+                    flash(message, 'warning')
+                    response = redirect(url_for(redirect_to))
+                    response.headers.update(headers)
+                    return response
+                return message, 429, headers
+            return decorated_function
+        return decorator
@@ -0,0 +1,13 @@
+"""
+Route Blueprints
+URLs are unchanged by the split; endpoints are now namespaced
+(url_for('parent.login'), url_for('admin.admin_dashboard'), ...).
+"""
+from routes import admin, api, parent, public, tutor
+
+BLUEPRINTS = (public.bp, parent.bp, admin.bp, tutor.bp, api.bp)
+
+
+def register_blueprints(app):
+    for blueprint in BLUEPRINTS:
+        app.register_blueprint(blueprint)
@@ -0,0 +1,470 @@
+"""
+Admin Routes
+Activities, tutors, bookings and imports
+"""
+from datetime import datetime
+from io import TextIOWrapper
+
+from flask import Blueprint, abort, current_app, flash, redirect, render_template, request, session, url_for
+from flask_mail import Message
+
+from bulk_import import IMPORT_COLUMNS, IMPORTERS, import_csv
+from emails import (
+    get_email_template, send_activity_assignment_email, send_tutor_approval_email, send_tutor_rejection_email
+)
+from extensions import db, mail, rate_limiter
+from fragment_cache import LazyData
+from helpers import admin_required, rehash_password_if_needed
+from models import Activity, Admin, Booking, Tutor, email_available, get_booking_totals
+from queries import (
+    EXPORT_FORMATS, export_response, get_admin_dashboard_data, get_booking_export_query, get_booking_filters,
+    get_booking_page, get_tutor_activity_stats, get_tutor_stats
+)
+from serializers import BookingSchema
+
+
+bp = Blueprint('admin', __name__)
+
+@bp.route('/admin/login', methods=['GET', 'POST'])
+@rate_limiter.limit('admin_login', template='admin/login.html')
+def admin_login():
+    if request.method == 'POST':
+        email = request.form.get('email')
+        password = request.form.get('password')
+        admin = Admin.query.filter_by(email=email).first()
+        if admin and admin.check_password(password):
+            rehash_password_if_needed(admin, password)
+            session['admin_id'] = admin.id
+            return redirect(url_for('admin.admin_dashboard'))
+        return render_template('admin/login.html', error='Invalid credentials')
+    return render_template('admin/login.html')
+
+@bp.route('/admin/dashboard')
+@admin_required
+def admin_dashboard():
+    
+    total_bookings, total_revenue = get_booking_totals()
+    
+    # Only queried if a cached fragment needs re-rendering
+    dashboard = LazyData(get_admin_dashboard_data)
+    
+    # Check for pending applications
+    pending_count = Tutor.query.filter_by(status='pending').count()
+    
+    return render_template('admin/dashboard.html', 
+                           total_bookings=total_bookings, 
+                           total_revenue=total_revenue,
+                           dashboard=dashboard,
+                           pending_count=pending_count)
+
+@bp.route('/admin/activity/add', methods=['POST'])
+@admin_required
+def add_activity():
+        
+    # Logic to add activity
+    name = request.form.get('name')
+    try:
+        price = float(request.form.get('price'))
+    except (ValueError, TypeError):
+        flash('Invalid price format', 'error')
+        return redirect(url_for('admin.admin_dashboard'))
+        
+    day = request.form.get('day')
+    start = request.form.get('start')
+    end = request.form.get('end')
+    tutor_id = request.form.get('tutor_id')
+    
+    activity = Activity(name=name, price=price, day_of_week=day, start_time=start, end_time=end)
+    
+    tutor_assigned = False
+    if tutor_id:
+        activity.tutor_id = tutor_id
+        tutor_assigned = True
+        
+    db.session.add(activity)
+    db.session.commit()
+    
+    # Send notification if tutor assigned
+    if tutor_assigned:
+        tutor = Tutor.query.get(tutor_id)
+        if tutor:
+            try:
+                send_activity_assignment_email(tutor, activity)
+            except Exception:
+                pass
+    
+    flash('Activity created successfully!', 'success')
+    return redirect(url_for('admin.admin_dashboard'))
+
+@bp.route('/admin/tutor/add', methods=['POST'])
+@admin_required
+def add_tutor():
+        
+    email = request.form.get('email')
+    password = request.form.get('password')
+    full_name = request.form.get('full_name')
+    specialization = request.form.get('specialization')
+    
+    if not email_available(email):
+        flash('Email already registered', 'error')
+        return redirect(url_for('admin.admin_dashboard'))
+        
+    tutor = Tutor(email=email, full_name=full_name, specialization=specialization)
+    tutor.set_password(password)
+    db.session.add(tutor)
+    db.session.commit()
+    
+    flash('Tutor added successfully', 'success')
+    return redirect(url_for('admin.admin_dashboard'))
+
+@bp.route('/admin/tutor/delete/<int:id>', methods=['POST'])
+@admin_required
+def delete_tutor(id):
+    tutor = Tutor.query.get_or_404(id)
+    
+    # Unassign from activities first
+    for activity in tutor.activities:
+        activity.tutor_id = None
+        
+    db.session.delete(tutor)
+    db.session.commit()
+    flash('Tutor deleted successfully', 'success')
+    return redirect(url_for('admin.admin_dashboard'))
+
+@bp.route('/admin/activity/delete/<int:id>', methods=['POST'])
+@admin_required
+def delete_activity(id):
+    activity = Activity.query.get_or_404(id)
+    db.session.delete(activity)
+    db.session.commit()
+    flash('Activity deleted successfully', 'success')
+    return redirect(url_for('admin.admin_dashboard'))
+
+@bp.route('/admin/tutor/edit/<int:id>', methods=['POST'])
+@admin_required
+def edit_tutor(id):
+    tutor = Tutor.query.get_or_404(id)
+    
+    if not email_available(request.form.get('email'), tutor):
+        flash('Email already registered', 'error')
+        return redirect(url_for('admin.admin_dashboard'))
+    
+    tutor.full_name = request.form.get('full_name')
+    tutor.email = request.form.get('email')
+    tutor.specialization = request.form.get('specialization')
+    
+    if request.form.get('password'):
+        tutor.set_password(request.form.get('password'))
+        
+    db.session.commit()
+    flash('Tutor updated successfully', 'success')
+    return redirect(url_for('admin.admin_dashboard'))
+
+@bp.route('/admin/activity/edit/<int:id>', methods=['POST'])
+@admin_required
+def edit_activity(id):
+    activity = Activity.query.get_or_404(id)
+    
+    # Store old tutor to check for changes
+    old_tutor_id = activity.tutor_id
+    
+    activity.name = request.form.get('name')
+    try:
+        activity.price = float(request.form.get('price'))
+    except (ValueError, TypeError):
+        flash('Invalid price format', 'error')
+        return redirect(url_for('admin.admin_dashboard'))
+        
+    activity.day_of_week = request.form.get('day')
+    activity.start_time = request.form.get('start')
+    activity.end_time = request.form.get('end')
+    
+    tutor_id = request.form.get('tutor_id')
+    new_tutor_id = None
+    
+    if tutor_id:
+        activity.tutor_id = int(tutor_id)
+        new_tutor_id = int(tutor_id)
+    else:
+        activity.tutor_id = None
+        
+    db.session.commit()
+    
+    # Check if a new tutor was assigned (and it's different from before)
+    if new_tutor_id and new_tutor_id != old_tutor_id:
+        tutor = Tutor.query.get(new_tutor_id)
+        if tutor:
+            try:
+                send_activity_assignment_email(tutor, activity)
+            except Exception:
+                pass
+                
+    flash('Activity updated successfully', 'success')
+    return redirect(url_for('admin.admin_dashboard'))
+
+@bp.route('/admin/pending-tutors')
+@admin_required
+def admin_pending_tutors():
+    """Pending tutors"""
+    pending = Tutor.query.filter_by(status='pending').order_by(Tutor.created_at.desc()).all()
+    approved = Tutor.query.filter_by(status='approved').all()
+    rejected = Tutor.query.filter_by(status='rejected').all()
+    return render_template('admin/pending_tutors.html', pending=pending, approved=approved, rejected=rejected)
+
+@bp.route('/admin/approve-tutor/<int:tutor_id>', methods=['POST'])
+@admin_required
+def approve_tutor(tutor_id):
+    """Approve tutor"""
+    tutor = Tutor.query.get_or_404(tutor_id)
+    tutor.status = 'approved'
+    tutor.approved_by = session['admin_id']
+    tutor.approval_date = datetime.utcnow()
+    tutor.email_verified = True
+    db.session.commit()
+    
+    try:
+        send_tutor_approval_email(tutor)
+    except Exception:
+        pass
+    
+    flash(f'{tutor.full_name} approved!', 'success')
+    return redirect(url_for('admin.admin_pending_tutors'))
+
+@bp.route('/admin/reject-tutor/<int:tutor_id>', methods=['POST'])
+@admin_required
+def reject_tutor(tutor_id):
+    """Reject tutor"""
+    tutor = Tutor.query.get_or_404(tutor_id)
+    tutor.status = 'rejected'
+    tutor.approved_by = session['admin_id']
+    tutor.approval_date = datetime.utcnow()
+    db.session.commit()
+    
+    try:
+        send_tutor_rejection_email(tutor)
+    except Exception:
+        pass
+    
+    flash(f'{tutor.full_name} rejected.', 'info')
+    return redirect(url_for('admin.admin_pending_tutors'))
+
+@bp.route('/admin/tutors')
+@admin_required
+def admin_tutors():
+    """Admin view all tutors with full details"""
+    tutor_data = get_tutor_stats()
+    
+    return render_template('admin/tutors.html', tutor_data=tutor_data)
+
+@bp.route('/admin/tutor/<int:tutor_id>')
+@admin_required
+def admin_tutor_detail(tutor_id):
+    """Admin view of a single tutor with per-activity statistics"""
+    stats = get_tutor_stats(tutor_id)
+    if stats is None:
+        abort(404)
+    
+    activity_stats = get_tutor_activity_stats(tutor_id)
+    
+    return render_template('admin/tutor_detail.html',
+                           tutor=stats['tutor'],
+                           stats=stats,
+                           activity_stats=activity_stats,
+                           total_students=stats['booked'],
+                           total_revenue=stats['revenue'])
+
+@bp.route('/admin/cancel_booking/<int:booking_id>', methods=['POST'])
+@admin_required
+def admin_cancel_booking(booking_id):
+    """Admin cancels a booking on behalf of parent (with notifications)"""
+    booking = Booking.query.get_or_404(booking_id)
+    
+    try:
+        activity = booking.activity
+        child = booking.child
+        parent = booking.parent
+        tutor = activity.tutor
+        
+        activity_name = activity.name
+        child_name = child.name
+        booking_date = booking.booking_date.strftime('%d %B %Y')
+        cancellation_date = datetime.now().strftime('%d %B %Y at %H:%M')
+        
+        # Delete the booking
+        db.session.delete(booking)
+        db.session.commit()
+        
+        # Send notification to parent
+        try:
+            parent_content = f"""
+            <div style="text-align: center; padding: 20px 0;">
+                <div style="display: inline-block; background-color: #FEF2F2; border-left: 4px solid #DC2626; padding: 15px 20px;">
+                    <h2 style="color: #DC2626; margin: 0; font-size: 24px;">Booking Cancelled by Administrator</h2>
+                </div>
+            </div>
+            
+            <p style="font-size: 16px; color: #333;">Dear <strong>{parent.full_name}</strong>,</p>
+            
+            <p style="font-size: 15px; line-height: 1.6; color: #555;">
+                We regret to inform you that your booking has been cancelled by our administrative team.
+            </p>
+            
+            <div style="background-color: #F9FAFB; border: 2px solid #E5E7EB; border-radius: 8px; padding: 25px; margin: 25px 0;">
+                <h3 style="color: #002E5D; margin-top: 0;">Cancellation Details</h3>
+                <table width="100%" cellpadding="8" cellspacing="0">
+                    <tr>
+                        <td style="color: #666; font-weight: bold;">Activity:</td>
+                        <td style="color: #002E5D; font-weight: bold;">{activity_name}</td>
+                    </tr>
+                    <tr>
+                        <td style="color: #666; font-weight: bold;">Student:</td>
+                        <td style="color: #002E5D;">{child_name} (Year {child.grade})</td>
+                    </tr>
+                    <tr>
+                        <td style="color: #666; font-weight: bold;">Original Booking Date:</td>
+                        <td style="color: #002E5D;">{booking_date}</td>
+                    </tr>
+                    <tr>
+                        <td style="color: #666; font-weight: bold;">Cancelled By:</td>
+                        <td style="color: #DC2626;">Administrator</td>
+                    </tr>
+                    <tr>
+                        <td style="color: #666; font-weight: bold;">Cancellation Date:</td>
+                        <td style="color: #DC2626;">{cancellation_date}</td>
+                    </tr>
+                </table>
+            </div>
+            
+            <p style="font-size: 15px; color: #555; line-height: 1.6;">
+                If you have any questions regarding this cancellation, please contact our admin office at 
+                <strong>greenwoodinternationaluk@gmail.com</strong>.
+            </p>
+            
+            <p style="font-size: 15px; color: #333; margin-top: 30px;">
+                Best regards,<br>
+                <strong style="color: #002E5D;">Greenwood International School Administration</strong>
+            </p>
+            """
+            
+            parent_msg = Message(
+                subject=f'Booking Cancellation Notice - {activity_name}',
+                recipients=[parent.email]
+            )
+            parent_msg.html = get_email_template(parent_content, "Booking Cancellation Notice")
+            mail.send(parent_msg)
+        except Exception as e:
+            print(f"Parent notification failed: {e}")
+        
+        # Notify tutor
+        if tutor:
+            try:
+                current_enrolled = len(activity.bookings)
+                tutor_content = f"""
+                <div style="background-color: #DBEAFE; border-left: 4px solid #3B82F6; padding: 20px; margin: 20px 0;">
+                    <h2 style="color: #1E40AF; margin: 0;">📋 Admin Cancellation - Roster Update</h2>
+                </div>
+                
+                <p style="font-size: 15px; color: #333;">Dear <strong>{tutor.full_name}</strong>,</p>
+                
+                <p style="font-size: 14px; color: #555;">
+                    An administrator has cancelled a student enrollment in your <strong>{activity_name}</strong> class.
+                </p>
+                
+                <div style="background-color: #F9FAFB; border: 2px solid #E5E7EB; border-radius: 8px; padding: 25px; margin: 25px 0;">
+                    <h3 style="color: #002E5D; margin-top: 0;">Cancellation Details</h3>
+                    <table width="100%" cellpadding="8" cellspacing="0">
+                        <tr>
+                            <td style="color: #666; font-weight: bold;">Student:</td>
+                            <td style="color: #DC2626; font-weight: bold;">{child_name}</td>
+                        </tr>
+                        <tr>
+                            <td style="color: #666; font-weight: bold;">Year Group:</td>
+                            <td style="color: #002E5D;">Year {child.grade}</td>
+                        </tr>
+                        <tr>
+                            <td style="color: #666; font-weight: bold;">Updated Class Size:</td>
+                            <td style="color: #059669; font-weight: bold;">{current_enrolled} / {activity.max_capacity} students</td>
+                        </tr>
+                    </table>
+                </div>
+                
+                <p style="font-size: 14px; color: #555;">
+                    Please update your attendance register accordingly.
+                </p>
+                """
+                
+                tutor_msg = Message(
+                    subject=f'Admin Cancellation: {child_name} - {activity_name}',
+                    recipients=[tutor.email]
+                )
+                tutor_msg.html = get_email_template(tutor_content, "Admin Cancellation Notice")
+                mail.send(tutor_msg)
+            except Exception as e:
+                print(f"Tutor notification failed: {e}")
+        
+        flash(f'Booking cancelled successfully. Notifications sent to parent and tutor.', 'success')
+        return redirect(url_for('admin.admin_bookings'))
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"Admin cancellation error: {e}")
+        flash('An error occurred. Please try again.', 'error')
+        return redirect(url_for('admin.admin_dashboard'))
+
+@bp.route('/admin/bookings')
+@admin_required
+def admin_bookings():
+    """Admin view all bookings with search and filters"""
+    filters = get_booking_filters(request.args)
+    
+    page = get_booking_page(
+        filters,
+        after=request.args.get('after'),
+        before=request.args.get('before'),
+        per_page=current_app.config['ITEMS_PER_PAGE']
+    )
+    
+    # Get all activities for filter dropdown
+    activities = Activity.query.all()
+    
+    return render_template('admin/bookings.html', 
+                           bookings=page['items'],
+                           page=page,
+                           filters={name: value for name, value in filters.items() if value},
+                           activities=activities,
+                           search=filters['search'],
+                           activity_filter=filters['activity'],
+                           status_filter=filters['status'],
+                           date_from=filters['date_from'],
+                           date_to=filters['date_to'])
+
+@bp.route('/admin/import', methods=['GET', 'POST'])
+@admin_required
+def admin_import():
+    """Upload a CSV of activities, families or bookings for bulk import"""
+    report = None
+    if request.method == 'POST':
+        kind = request.form.get('kind')
+        upload = request.files.get('file')
+        if kind not in IMPORTERS or not upload or not upload.filename:
+            flash('Choose what to import and a CSV file', 'error')
+            return redirect(url_for('admin.admin_import'))
+        
+        stream = TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+        try:
+            report = import_csv(kind, stream)
+        except UnicodeDecodeError:
+            flash('The file is not UTF-8 encoded CSV', 'error')
+            return redirect(url_for('admin.admin_import'))
+    
+    return render_template('admin/import.html', columns=IMPORT_COLUMNS, report=report)
+
+@bp.route('/admin/bookings/export.<fmt>')
+@admin_required
+def admin_bookings_export(fmt):
+    """Stream every booking matching the current filters as CSV or NDJSON"""
+    if fmt not in EXPORT_FORMATS:
+        abort(404)
+    filters = get_booking_filters(request.args)
+    filename = f"bookings-{datetime.utcnow().strftime('%Y%m%d-%H%M')}"
+    return export_response(get_booking_export_query(filters), BookingSchema, fmt, filename)
@@ -0,0 +1,158 @@
+"""
+API Routes
+JSON and Server-Sent Events endpoints
+"""
+import time
+from datetime import datetime
+
+from flask import Blueprint, current_app, jsonify, make_response, request, stream_with_context, url_for
+
+from capacity_events import format_sse
+from extensions import capacity_broker, db, password_hasher
+from helpers import admin_required, parse_date
+from models import Activity, get_capacity_snapshot
+from queries import (get_activity_catalogue, get_booking_filters, get_booking_page, get_catalogue_filters,
+                     get_next_session_date, get_session_capacity)
+from serializers import AvailabilitySchema, BookingSchema, CapacitySchema
+
+
+bp = Blueprint('api', __name__)
+
+@bp.route('/api/activities')
+def api_activities():
+    """
+    Activity catalogue. Optional filters: day, min_price, max_price,
+    tutor_id, start_after/end_before (HH:MM), q (name), available=1
+    (optionally for a given date), plus sort, page/per_page and a sparse
+    fieldset (?fields=id,name,price). The body
+    stays a plain list; paging details go in X-Total-Count and Link headers.
+    """
+    filters = get_catalogue_filters(request.args)
+    catalogue = get_activity_catalogue(filters)
+    response = make_response(catalogue['body'])
+    response.mimetype = 'application/json'
+    response.set_etag(catalogue['etag'])
+    response.last_modified = catalogue['last_modified']
+    response.headers['X-Total-Count'] = str(catalogue['total'])
+    
+    per_page = filters['per_page']
+    if per_page and filters['page'] * per_page < catalogue['total']:
+        args = request.args.to_dict()
+        args['page'] = filters['page'] + 1
+        response.headers['Link'] = f'<{url_for("api.api_activities", **args)}>; rel="next"'
+    # Clients may reuse the body but must revalidate with If-None-Match
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+@bp.route('/api/check_availability', methods=['POST'])
+def check_availability():
+    data = request.get_json()
+    activity_id = data.get('activity_id')
+    date_str = data.get('booking_date')
+    
+    try:
+        booking_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid date'}), 400
+        
+    activity = Activity.query.get(activity_id)
+    if not activity:
+        return jsonify({'error': 'Activity not found'}), 404
+    
+    return jsonify(AvailabilitySchema.dump(get_session_capacity(activity, booking_date)))
+
+@bp.route('/api/capacity/stream')
+def capacity_stream():
+    """
+    Server-Sent Events stream of capacity changes.
+    ?activities=1,2,3 limits it to those activities (default: all).
+    Sends a 'snapshot' event on connect (confirmed bookings per activity and
+    upcoming session date), then a 'capacity' event with an (activity, date)
+    delta whenever a booking, cancellation or waitlist promotion commits.
+    Streams end after CAPACITY_STREAM_MAX_SECONDS; EventSource reconnects
+    and receives a fresh snapshot.
+    """
+    activity_ids = [int(i) for i in request.args.get('activities', '').split(',') if i.strip().isdigit()][:100]
+    snapshot = get_capacity_snapshot(activity_ids)
+    db.session.remove()  # Do not hold a connection for the life of the stream
+    
+    keepalive = current_app.config['CAPACITY_STREAM_KEEPALIVE_SECONDS']
+    deadline = time.monotonic() + current_app.config['CAPACITY_STREAM_MAX_SECONDS']
+    subscription = capacity_broker.subscribe(activity_ids)
+    
+    def generate():
+        try:
+            yield 'retry: 3000\n'
+            yield format_sse(snapshot, event='snapshot')
+            while time.monotonic() < deadline:
+                event = subscription.get(timeout=keepalive)
+                if subscription.overflowed:
+                    # Too far behind to trust deltas; the client reconnects for a snapshot
+                    yield format_sse({}, event='resync')
+                    return
+                yield format_sse(event, event='capacity') if event else ': keepalive\n\n'
+        finally:
+            capacity_broker.unsubscribe(subscription)
+    
+    # The app context stays up for the stream so unsubscribe() finds this app's broker
+    response = current_app.response_class(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@bp.route('/api/activity-capacity/<int:activity_id>')
+def get_activity_capacity(activity_id):
+    """
+    Real-time capacity for one session of an activity (AJAX endpoint).
+    ?date=YYYY-MM-DD picks the session; the default is the next one.
+    """
+    activity = Activity.query.get_or_404(activity_id)
+    
+    if request.args.get('date'):
+        session_date = parse_date(request.args['date'])
+        if session_date is None:
+            return jsonify({'error': 'Invalid date'}), 400
+    else:
+        session_date = get_next_session_date(activity)
+    
+    return jsonify(CapacitySchema.dump(get_session_capacity(activity, session_date)))
+
+@bp.route('/admin/api/bookings')
+@admin_required
+def admin_bookings_api():
+    """JSON version of the admin booking list, paged by cursor (supports ?fields=)"""
+    filters = get_booking_filters(request.args)
+    per_page = max(1, min(request.args.get('per_page', current_app.config['ITEMS_PER_PAGE'], type=int), 100))
+    
+    page = get_booking_page(
+        filters,
+        after=request.args.get('after'),
+        before=request.args.get('before'),
+        per_page=per_page
+    )
+    
+    return jsonify({
+        'bookings': BookingSchema.dump_many(page['items'], BookingSchema.parse_fields(request.args.get('fields'))),
+        'next_cursor': page['next_cursor'],
+        'prev_cursor': page['prev_cursor'],
+        'total_estimate': page['total']
+    })
+
+@bp.route('/admin/api/password-hashing')
+@admin_required
+def admin_password_hashing_stats():
+    """Hash/verify timings and rejections for this worker"""
+    return jsonify({
+        'method': password_hasher.prefix,
+        'operations': password_hasher.stats()
+    })
+
+@bp.route('/admin/api/templates')
+@admin_required
+def admin_template_stats():
+    """Template mode, startup precompilation and first request for this worker"""
+    return jsonify({
+        'auto_reload': current_app.jinja_env.auto_reload,
+        'bytecode_cache': current_app.jinja_env.bytecode_cache is not None,
+        **current_app.extensions['template_warmup']
+    })
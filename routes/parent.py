@@ -0,0 +1,672 @@
+"""
+Parent Routes
+Registration, login, children, bookings, invoices and profile
+"""
+from datetime import datetime
+from io import BytesIO
+
+from flask import Blueprint, abort, flash, g, jsonify, make_response, redirect, render_template, request, session, url_for
+from flask_mail import Message
+
+from emails import get_email_template
+from extensions import db, mail, rate_limiter
+from helpers import EMAIL_REGEX, PHONE_REGEX, login_required, rehash_password_if_needed, send_booking_confirmation_email
+from models import Activity, Booking, Child, Parent, Waitlist, email_available
+from queries import get_parent_dashboard_data
+from serializers import ChildSchema, WaitlistSchema
+
+
+bp = Blueprint('parent', __name__)
+
+@bp.route('/register', methods=['GET', 'POST'])
+def register():
+    if request.method == 'POST':
+        email = request.form.get('email')
+        password = request.form.get('password')
+        confirm_password = request.form.get('confirm_password')
+        full_name = request.form.get('full_name')
+        phone = request.form.get('phone')
+        
+        # Validation
+        if not all([email, password, confirm_password, full_name, phone]):
+            return render_template('register.html', error='All fields are required')
+        
+        # Email Validation
+        if not EMAIL_REGEX.match(email):
+            return render_template('register.html', error='Invalid email address format')
+
+        # Phone Validation (Digits, +, -, space)
+        if not PHONE_REGEX.match(phone):
+            return render_template('register.html', error='Invalid phone number. Use 10-15 digits.')
+
+        # Password Strength
+        if len(password) < 8:
+            return render_template('register.html', error='Password must be at least 8 characters long')
+
+        if password != confirm_password:
+            return render_template('register.html', error='Passwords do not match')
+        
+        if not email_available(email):
+            return render_template('register.html', error='Email already registered')
+        
+        parent = Parent(email=email, full_name=full_name, phone=phone)
+        parent.set_password(password)
+        db.session.add(parent)
+        db.session.commit()
+        
+        flash('Registration successful! Please login.', 'success')
+        return redirect(url_for('parent.login'))
+    
+    return render_template('register.html')
+
+@bp.route('/login', methods=['GET', 'POST'])
+@rate_limiter.limit('login', template='login.html')
+def login():
+    if request.method == 'POST':
+        email = request.form.get('email')
+        password = request.form.get('password')
+        
+        parent = Parent.query.filter_by(email=email).first()
+        
+        if parent and parent.check_password(password):
+            rehash_password_if_needed(parent, password)
+            session['parent_id'] = parent.id
+            session['parent_name'] = parent.full_name
+            return redirect(url_for('parent.dashboard'))
+        else:
+            return render_template('login.html', error='Invalid email or password')
+    
+    return render_template('login.html')
+
+@bp.route('/dashboard')
+@login_required
+def dashboard():
+    
+    parent = g.parent
+    dashboard_data = get_parent_dashboard_data(parent.id)
+    
+    return render_template('dashboard.html', parent=parent, **dashboard_data)
+
+@bp.route('/add_child', methods=['POST'])
+@login_required
+def add_child():
+    
+    name = request.form.get('name')
+    age = request.form.get('age')
+    grade = request.form.get('grade')
+    
+    if not name:
+        return jsonify({'error': 'Child name is required'}), 400
+    
+    child = Child(parent_id=session['parent_id'], name=name, age=age, grade=grade)
+    db.session.add(child)
+    db.session.commit()
+    
+    return jsonify(ChildSchema.dump(child, ('id', 'name')))
+
+@bp.route('/remove_child/<int:child_id>', methods=['POST'])
+@login_required
+def remove_child(child_id):
+    
+    child = Child.query.get_or_404(child_id)
+    if child.parent_id != session['parent_id']:
+        return jsonify({'error': 'Unauthorized'}), 403
+        
+    db.session.delete(child)
+    db.session.commit()
+    return jsonify({'success': True})
+
+@bp.route('/payment/<int:activity_id>/<int:child_id>/<date>')
+@login_required
+def payment_page(activity_id, child_id, date):
+    activity = Activity.query.get_or_404(activity_id)
+    child = Child.query.get_or_404(child_id)
+    
+    if child.parent_id != session['parent_id']:
+        return redirect(url_for('parent.dashboard'))
+        
+    return render_template('payment.html', activity=activity, child=child, date=date)
+
+@bp.route('/book_activity', methods=['POST'])
+@login_required
+def book_activity():
+    
+    child_id = request.form.get('child_id', type=int)
+    activity_id = request.form.get('activity_id', type=int)
+    booking_date_str = request.form.get('booking_date')
+    
+    is_ajax = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+
+    try:
+        booking_date = datetime.strptime(booking_date_str, '%Y-%m-%d').date()
+    except (ValueError, TypeError):
+        msg = 'Invalid date format'
+        if is_ajax:
+            return jsonify({'error': msg}), 400
+        flash(msg, 'danger')
+        return redirect(url_for('parent.dashboard'))
+    
+    child = Child.query.get(child_id)
+    activity = Activity.query.get(activity_id)
+    
+    if not child or not activity:
+        msg = 'Invalid child or activity'
+        if is_ajax:
+            return jsonify({'error': msg}), 400
+        flash(msg, 'danger')
+        return redirect(url_for('parent.dashboard'))
+    
+    if child.parent_id != session['parent_id']:
+        msg = 'Unauthorized'
+        if is_ajax:
+            return jsonify({'error': msg}), 403
+        flash(msg, 'danger')
+        return redirect(url_for('parent.dashboard'))
+    
+    # Check conflict
+    existing_booking = Booking.query.filter_by(
+        child_id=child_id,
+        booking_date=booking_date,
+        status='confirmed'
+    ).first()
+    
+    if existing_booking:
+        msg = f'Child already has a booking on {booking_date}'
+        if is_ajax:
+            return jsonify({'error': msg}), 400
+        flash(msg, 'warning')
+        return redirect(url_for('parent.dashboard'))
+    
+    # Check capacity
+    bookings_count = Booking.query.filter_by(activity_id=activity_id, booking_date=booking_date, status='confirmed').count()
+    if bookings_count >= activity.max_capacity:
+        # Offer Waitlist
+        msg = 'Activity is full'
+        if is_ajax:
+            return jsonify({'error': msg, 'full': True}), 400
+        flash(msg, 'warning')
+        return redirect(url_for('parent.dashboard'))
+    
+    # Create booking
+    booking = Booking(
+        parent_id=session['parent_id'],
+        child_id=child_id,
+        activity_id=activity_id,
+        booking_date=booking_date,
+        cost=activity.price
+    )
+    db.session.add(booking)
+    db.session.commit()
+    
+    # Send confirmation emails (non-blocking)
+    try:
+        send_booking_confirmation_email(booking)
+        print(f'✅ Confirmation emails sent for booking #{booking.id}')
+    except Exception as e:
+        print(f'⚠️ Email sending skipped: {str(e)}')
+    
+    if is_ajax:
+        return jsonify({'success': True, 'message': 'Booking confirmed!', 'booking_id': booking.id})
+    
+    flash('Booking confirmed successfully!', 'success')
+    return redirect(url_for('parent.booking_success', booking_id=booking.id))
+
+@bp.route('/booking_success/<int:booking_id>')
+@login_required
+def booking_success(booking_id):
+    booking = Booking.query.get_or_404(booking_id)
+    if booking.parent_id != session['parent_id']:
+        return redirect(url_for('parent.dashboard'))
+    return render_template('booking_success.html', booking=booking)
+
+@bp.route('/join_waitlist', methods=['POST'])
+@login_required
+def join_waitlist():
+        
+    child_id = request.form.get('child_id', type=int)
+    activity_id = request.form.get('activity_id', type=int)
+    date_str = request.form.get('date')
+    
+    try:
+        date = datetime.strptime(date_str, '%Y-%m-%d').date()
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid date'}), 400
+        
+    waitlist = Waitlist(
+        parent_id=session['parent_id'],
+        child_id=child_id,
+        activity_id=activity_id,
+        request_date=date
+    )
+    db.session.add(waitlist)
+    db.session.commit()
+    
+    return jsonify({'success': True, 'message': 'Added to waitlist', 'waitlist': WaitlistSchema.dump(waitlist)})
+
+@bp.route('/invoice/<int:booking_id>')
+@login_required
+def generate_invoice(booking_id):
+    booking = Booking.query.get_or_404(booking_id)
+    if booking.parent_id != session['parent_id']:
+        abort(403)
+    
+    # ReportLab is slow to import and only needed here; load it on first use
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        buffer, 
+        pagesize=letter, 
+        topMargin=0.6*inch, 
+        bottomMargin=0.75*inch,
+        leftMargin=0.75*inch,
+        rightMargin=0.75*inch,
+        title=f'Invoice #{booking.id:06d}',
+        author='Greenwood International School'
+    )
+    elements = []
+    styles = getSampleStyleSheet()
+    
+    # Custom Styles
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=28,
+        textColor=colors.HexColor('#0d6efd'),
+        spaceAfter=10,
+        alignment=1  # Center
+    )
+    
+    subtitle_style = ParagraphStyle(
+        'Subtitle',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#1a1a1a'),
+        spaceAfter=5,
+        alignment=1
+    )
+    
+    small_style = ParagraphStyle(
+        'Small',
+        parent=styles['Normal'],
+        fontSize=9,
+        textColor=colors.grey,
+        alignment=1
+    )
+    
+    section_heading = ParagraphStyle(
+        'SectionHeading',
+        parent=styles['Heading3'],
+        fontSize=12,
+        textColor=colors.HexColor('#0d6efd'),
+        spaceAfter=8,
+        spaceBefore=15
+    )
+    
+    # Header Section
+    elements.append(Paragraph("INVOICE", title_style))
+    elements.append(Paragraph("Greenwood International School", subtitle_style))
+    elements.append(Paragraph("123 Education Lane, London, UK SW1A 1AA", small_style))
+    elements.append(Paragraph("Tel: +44 (0) 1491 570000 | Email: greenwoodinternationaluk@gmail.com", small_style))
+    elements.append(Paragraph("Company Registration No: 12345678 | VAT No: GB123456789", small_style))
+    elements.append(Spacer(1, 25))
+    
+    # Invoice Info and Client Info Side by Side
+    invoice_info = [
+        ["Invoice Number:", f"INV-{booking.id:06d}"],
+        ["Invoice Date:", datetime.now().strftime('%d %B %Y')],
+        ["Booking Date:", booking.booking_date.strftime('%d %B %Y')],
+        ["Payment Status:", "PAID"],
+        ["Payment Method:", "Online Payment"]
+    ]
+    
+    client_info = [
+        ["Bill To:", ""],
+        ["", booking.parent.full_name],
+        ["", booking.parent.email],
+        ["Student:", booking.child.name],
+        ["Year Group:", f"Grade {booking.child.grade}"]
+    ]
+    
+    # Create two-column layout for invoice and client info
+    info_table_data = []
+    for i in range(max(len(invoice_info), len(client_info))):
+        row = []
+        if i < len(invoice_info):
+            row.extend(invoice_info[i])
+        else:
+            row.extend(["", ""])
+        row.append("")  # Spacer column
+        if i < len(client_info):
+            row.extend(client_info[i])
+        else:
+            row.extend(["", ""])
+        info_table_data.append(row)
+    
+    info_table = Table(info_table_data, colWidths=[90, 150, 20, 80, 140])
+    info_table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (3, 0), (3, -1), 'Helvetica-Bold'),
+        ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#555555')),
+        ('TEXTCOLOR', (3, 0), (3, -1), colors.HexColor('#555555')),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ]))
+    elements.append(info_table)
+    elements.append(Spacer(1, 20))
+    
+    # Activity Details Section
+    elements.append(Paragraph("Activity Details", section_heading))
+    
+    activity_details = [
+        ["Activity Name:", booking.activity.name],
+        ["Day of Week:", booking.activity.day_of_week],
+        ["Time:", f"{booking.activity.start_time} - {booking.activity.end_time}"],
+        ["Tutor:", booking.activity.tutor.full_name if booking.activity.tutor else "To Be Assigned"],
+        ["Description:", booking.activity.description[:100] + "..." if len(booking.activity.description) > 100 else booking.activity.description]
+    ]
+    
+    activity_table = Table(activity_details, colWidths=[120, 360])
+    activity_table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#555555')),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('BOX', (0, 0), (-1, -1), 0.5, colors.HexColor('#e0e0e0')),
+        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f8f9fa')),
+    ]))
+    elements.append(activity_table)
+    elements.append(Spacer(1, 20))
+    
+    # Line Items Section
+    elements.append(Paragraph("Charges", section_heading))
+    
+    items = [
+        ["Description", "Scheduled Date", "Unit Price", "Quantity", "Amount"],
+        [
+            booking.activity.name,
+            booking.booking_date.strftime('%d %b %Y'),
+            f"£{booking.cost:.2f}",
+            "1",
+            f"£{booking.cost:.2f}"
+        ]
+    ]
+    
+    # Add subtotal and total rows
+    items.append(["", "", "", "Subtotal:", f"£{booking.cost:.2f}"])
+    items.append(["", "", "", "VAT (0%):", "£0.00"])
+    items.append(["", "", "", "Total:", f"£{booking.cost:.2f}"])
+    
+    table = Table(items, colWidths=[180, 100, 80, 80, 80])
+    table.setStyle(TableStyle([
+        # Header row
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0d6efd')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+        ('TOPPADDING', (0, 0), (-1, 0), 10),
+        
+        # Data row
+        ('ALIGN', (0, 1), (0, 1), 'LEFT'),
+        ('ALIGN', (1, 1), (-1, 1), 'CENTER'),
+        ('FONTSIZE', (0, 1), (-1, 1), 10),
+        ('BOTTOMPADDING', (0, 1), (-1, 1), 8),
+        ('TOPPADDING', (0, 1), (-1, 1), 8),
+        ('GRID', (0, 0), (-1, 1), 0.5, colors.grey),
+        
+        # Subtotal, VAT, Total rows
+        ('ALIGN', (3, 2), (-1, -1), 'RIGHT'),
+        ('FONTNAME', (3, 2), (3, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 2), (-1, -1), 10),
+        ('LINEABOVE', (3, 2), (-1, 2), 0.5, colors.grey),
+        ('LINEABOVE', (3, -1), (-1, -1), 1.5, colors.HexColor('#0d6efd')),
+        ('FONTNAME', (3, -1), (-1, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (3, -1), (-1, -1), 12),
+        ('TEXTCOLOR', (3, -1), (-1, -1), colors.HexColor('#0d6efd')),
+        ('BOTTOMPADDING', (0, 2), (-1, -1), 6),
+    ]))
+    elements.append(table)
+    elements.append(Spacer(1, 30))
+    
+    # Payment Information
+    elements.append(Paragraph("Payment Information", section_heading))
+    payment_info = Paragraph(
+        "Payment has been received in full for this booking. This invoice serves as a receipt for your records.",
+        styles['Normal']
+    )
+    elements.append(payment_info)
+    elements.append(Spacer(1, 20))
+    
+    # Terms and Conditions
+    elements.append(Paragraph("Terms & Conditions", section_heading))
+    terms = [
+        "1. Cancellations must be made at least 48 hours in advance for a full refund.",
+        "2. Late arrivals may result in reduced session time without refund.",
+        "3. Parents/guardians are responsible for ensuring children are collected on time.",
+        "4. The school reserves the right to cancel activities due to unforeseen circumstances.",
+        "5. All personal information is handled in accordance with GDPR regulations."
+    ]
+    
+    for term in terms:
+        elements.append(Paragraph(term, ParagraphStyle('Terms', parent=styles['Normal'], fontSize=8, leftIndent=10)))
+    
+    elements.append(Spacer(1, 30))
+    
+    # Footer
+    footer_style = ParagraphStyle(
+        'Footer',
+        parent=styles['Normal'],
+        fontSize=9,
+        textColor=colors.HexColor('#0d6efd'),
+        alignment=1
+    )
+    elements.append(Paragraph("Thank you for choosing Greenwood International School!", footer_style))
+    elements.append(Paragraph("For any queries, please contact us at greenwoodinternationaluk@gmail.com or +44 (0) 1491 570000", small_style))
+    
+    doc.build(elements)
+    buffer.seek(0)
+    
+    # Create response with proper headers for PDF download
+    # Using inline with proper filename encoding to ensure correct filename in all browsers
+    invoice_filename = f'Invoice_{booking.id:06d}_Greenwood.pdf'
+    
+    response = make_response(buffer.getvalue())
+    response.headers['Content-Type'] = 'application/pdf'
+    response.headers['Content-Disposition'] = f'inline; filename="{invoice_filename}"'
+    response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
+    response.headers['Pragma'] = 'no-cache'
+    response.headers['Expires'] = '0'
+    
+    return response
+
+@bp.route('/cancel_booking/<int:booking_id>', methods=['POST'])
+@login_required
+def cancel_booking(booking_id):
+    """
+    Cancel a booking and notify all parties (Parent, Admin, Tutor)
+    """
+    booking = Booking.query.get_or_404(booking_id)
+    
+    if booking.parent_id != session.get('parent_id') and 'admin_id' not in session:
+        flash('Unauthorized access', 'danger')
+        abort(403)
+    
+    try:
+        # 1. GATHER DATA BEFORE DELETION (Prevent DetachedInstanceError)
+        activity = booking.activity
+        child = booking.child
+        parent = booking.parent
+        tutor = activity.tutor
+        
+        # Store simple types/variables
+        activity_name = activity.name
+        activity_id = activity.id
+        activity_price = activity.price
+        max_capacity = activity.max_capacity
+        current_booked_count = len(activity.bookings) # Load this relationship now
+        
+        child_name = child.name
+        child_grade = child.grade
+        child_id = child.id
+        parent_name = parent.full_name
+        parent_email = parent.email
+        
+        tutor_name = tutor.full_name if tutor else 'Not Assigned'
+        tutor_email = tutor.email if tutor else None
+        
+        booking_date_str = booking.booking_date.strftime('%d %B %Y')
+        booking_date_obj = booking.booking_date # Keep for waitlist logic
+        cancellation_date = datetime.now().strftime('%d %B %Y at %H:%M')
+        
+        # 2. DELETE BOOKING
+        db.session.delete(booking)
+        db.session.commit()
+        
+        # 3. SEND NOTIFICATIONS (Using pre-fetched data)
+        # Parent Notification
+        try:
+            parent_content = f"""
+            <div style="text-align: center; padding: 20px 0;">
+                <div style="display: inline-block; background-color: #FEF2F2; border-left: 4px solid #DC2626; padding: 15px 20px; margin: 20px 0;">
+                    <h2 style="color: #DC2626; margin: 0; font-size: 24px;">Booking Cancelled</h2>
+                </div>
+            </div>
+            <p style="font-size: 16px; color: #333;">Dear <strong>{parent_name}</strong>,</p>
+            <p style="font-size: 15px; color: #555;">This confirms that your booking has been cancelled.</p>
+            <div style="background-color: #F9FAFB; padding: 25px; border-radius: 8px;">
+                <p><strong>Activity:</strong> {activity_name}</p>
+                <p><strong>Student:</strong> {child_name}</p>
+                <p><strong>Date:</strong> {booking_date_str}</p>
+            </div>
+            """
+            
+            msg = Message(subject=f'❌ Booking Cancelled - {activity_name}', recipients=[parent_email])
+            msg.html = get_email_template(parent_content)
+            mail.send(msg)
+        except Exception as e:
+            print(f"Parent email failed: {e}")
+
+        # Tutor Notification
+        if tutor_email:
+            try:
+                new_count = current_booked_count - 1
+                tutor_content = f"""
+                <div style="background-color: #DBEAFE; border-left: 4px solid #3B82F6; padding: 20px;">
+                    <h2 style="color: #1E40AF; margin: 0;">Class Roster Update</h2>
+                </div>
+                <p>Dear <strong>{tutor_name}</strong>,</p>
+                <p>Student <strong>{child_name}</strong> has withdrawn from <strong>{activity_name}</strong>.</p>
+                <p>Updated Class Size: <strong style="color: #059669;">{new_count} / {max_capacity}</strong></p>
+                """
+                msg = Message(subject=f'📋 Roster Update: {activity_name}', recipients=[tutor_email])
+                msg.html = get_email_template(tutor_content)
+                mail.send(msg)
+            except Exception as e:
+                print(f"Tutor email failed: {e}")
+
+        # 4. WAITLIST PROMOTION LOGIC
+        first_waitlist = Waitlist.query.filter_by(activity_id=activity_id, status='waiting').order_by(Waitlist.created_at.asc()).first()
+        
+        if first_waitlist:
+            # Create new booking for waitlisted child
+            new_booking = Booking(
+                parent_id=first_waitlist.parent_id,
+                child_id=first_waitlist.child_id,
+                activity_id=activity_id,
+                booking_date=first_waitlist.request_date, # Use requested date
+                cost=activity_price,
+                status='confirmed'
+            )
+            first_waitlist.status = 'promoted'
+            db.session.add(new_booking)
+            db.session.commit()
+            
+            # Notify promoted parent
+            try:
+                wl_parent = Parent.query.get(first_waitlist.parent_id)
+                wl_child = Child.query.get(first_waitlist.child_id)
+                
+                promo_content = f"""
+                <div style="background-color: #D1FAE5; border-left: 4px solid #10B981; padding: 20px;">
+                    <h2 style="color: #065F46; margin: 0;">🎉 Spot Available!</h2>
+                </div>
+                <p>Dear <strong>{wl_parent.full_name}</strong>,</p>
+                <p>Great news! A spot opened up for <strong>{activity_name}</strong> and <strong>{wl_child.name}</strong> has been automatically enrolled!</p>
+                """
+                msg = Message(subject=f'✅ You are off the waitlist! - {activity_name}', recipients=[wl_parent.email])
+                msg.html = get_email_template(promo_content)
+                mail.send(msg)
+            except Exception as e:
+                print(f"Promotion email failed: {e}")
+            
+            flash(f'Booking cancelled. Waitlisted student promoted. All parties notified.', 'success')
+        else:
+            flash(f'Booking cancelled. Confirmation emails sent to all parties.', 'success')
+
+        if 'admin_id' in session:
+             return redirect(url_for('admin.admin_bookings'))
+        
+        return redirect(url_for('parent.dashboard'))
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"Cancellation Error: {e}")
+        flash('An error occurred during cancellation. Please try again.', 'error')
+        return redirect(url_for('parent.dashboard'))
+
+@bp.route('/parent/profile', methods=['GET', 'POST'])
+@login_required
+def parent_profile():
+    """Parent profile view and edit"""
+    parent = g.parent
+    
+    if request.method == 'POST':
+        if not email_available(request.form.get('email', parent.email), parent):
+            flash('That email address is already registered to another account.', 'danger')
+            return redirect(url_for('parent.parent_profile'))
+        
+        parent.full_name = request.form.get('full_name', parent.full_name)
+        parent.email = request.form.get('email', parent.email)
+        parent.phone = request.form.get('phone', parent.phone)
+        
+        db.session.commit()
+        flash('Profile updated successfully!', 'success')
+        return redirect(url_for('parent.parent_profile'))
+    
+    return render_template('parent/profile.html', parent=parent)
+
+@bp.route('/parent/change-password', methods=['POST'])
+@login_required
+def parent_change_password():
+    """Parent password change"""
+    parent = g.parent
+    
+    current_password = request.form.get('current_password')
+    new_password = request.form.get('new_password')
+    confirm_password = request.form.get('confirm_password')
+    
+    if not parent.check_password(current_password):
+        flash('Current password is incorrect', 'danger')
+        return redirect(url_for('parent.parent_profile'))
+    
+    if new_password != confirm_password:
+        flash('New passwords do not match', 'danger')
+        return redirect(url_for('parent.parent_profile'))
+    
+    if len(new_password) < 6:
+        flash('Password must be at least 6 characters', 'danger')
+        return redirect(url_for('parent.parent_profile'))
+    
+    parent.set_password(new_password)
+    db.session.commit()
+    
+    flash('Password changed successfully!', 'success')
+    return redirect(url_for('parent.parent_profile'))
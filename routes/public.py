@@ -0,0 +1,262 @@
+"""
+Public Routes
+School pages, contact and admissions forms, password reset
+"""
+from datetime import datetime
+
+from flask import Blueprint, current_app, flash, redirect, render_template, request, session, url_for
+from flask_mail import Message
+from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+
+from emails import send_password_reset_email
+from extensions import db, mail, notifications, rate_limiter
+from models import Tutor, find_identity
+
+
+bp = Blueprint('public', __name__)
+
+@bp.route('/forgot-password', methods=['GET', 'POST'])
+@rate_limiter.limit('forgot_password', redirect_to='public.forgot_password')
+def forgot_password():
+    """Handle forgot password request"""
+    if request.method == 'POST':
+        identity = find_identity(request.form.get('email'))
+        
+        # Admin accounts are explicitly excluded
+        if identity and identity.role == 'admin':
+            flash('Admin accounts cannot reset passwords via email. Please contact system support.', 'danger')
+            return redirect(url_for('public.forgot_password'))
+
+        if identity:
+            s = URLSafeTimedSerializer(current_app.config['SECRET_KEY'])
+            token = s.dumps(identity.email, salt='password-reset-salt')
+            
+            if send_password_reset_email(identity.email, token, identity.role.capitalize()):
+                flash('A password reset link has been sent to your email.', 'success')
+            else:
+                flash('Error sending email. Please try again later.', 'danger')
+        else:
+            # Security: Don't reveal if email exists or not, but for UX we might want to be vague
+            # "If an account exists with this email, a reset link has been sent."
+            flash('If an account exists with this email, a reset link has been sent.', 'info')
+            
+        return redirect(url_for('parent.login'))
+        
+    return render_template('forgot_password.html')
+
+@bp.route('/reset-password/<token>', methods=['GET', 'POST'])
+def reset_password(token):
+    """Handle password reset with token"""
+    try:
+        s = URLSafeTimedSerializer(current_app.config['SECRET_KEY'])
+        email = s.loads(token, salt='password-reset-salt', max_age=3600) # 1 hour expiration
+    except (BadSignature, SignatureExpired, Exception):
+        flash('The password reset link is invalid or has expired.', 'danger')
+        return redirect(url_for('public.forgot_password'))
+    
+    if request.method == 'POST':
+        password = request.form.get('password')
+        confirm_password = request.form.get('confirm_password')
+        
+        if password != confirm_password:
+            flash('Passwords do not match.', 'danger')
+            return redirect(url_for('public.reset_password', token=token))
+            
+        # Update password
+        identity = find_identity(email)
+        user = identity.user if identity and identity.role != 'admin' else None
+            
+        if user:
+            user.set_password(password)
+            db.session.commit()
+            flash('Your password has been updated! You can now log in.', 'success')
+            
+            # Redirect based on user type
+            if isinstance(user, Tutor):
+                return redirect(url_for('tutor.tutor_login'))
+            else:
+                return redirect(url_for('parent.login'))
+        else:
+            flash('User account not found.', 'danger')
+            return redirect(url_for('parent.login'))
+            
+    return render_template('reset_password.html', token=token)
+
+@bp.route('/')
+def index():
+    """School Home Page"""
+    return render_template('school/home.html')
+
+@bp.route('/portal')
+def portal_home():
+    """Enhanced Portal with Search and Filters"""
+    return render_template('portal_enhanced.html')
+
+@bp.route('/admissions')
+def admissions():
+    """Admissions Page"""
+    return render_template('school/admissions.html')
+
+@bp.route('/academic')
+def academic():
+    """Academic Page"""
+    return render_template('school/academic.html')
+
+@bp.route('/alumni')
+def alumni():
+    """Alumni Page"""
+    return render_template('school/alumni.html')
+
+@bp.route('/contact')
+def contact():
+    """Contact Page"""
+    return render_template('school/contact.html')
+
+@bp.route('/about')
+def about():
+    """About Page"""
+    return render_template('school/about.html')
+
+@bp.route('/contact/submit', methods=['POST'])
+@rate_limiter.limit('contact', redirect_to='public.contact')
+def contact_submit():
+    """Handle contact form submission"""
+    name = request.form.get('name')
+    email = request.form.get('email')
+    subject = request.form.get('subject')
+    message = request.form.get('message')
+    
+    try:
+        recipients = notifications.recipients('contact')
+        if recipients:
+            msg = Message(
+                subject=f'Contact Form: {subject}',
+                recipients=recipients,
+                sender=notifications.sender,
+                reply_to=email
+            )
+            msg.body = f'''
+            New contact form submission:
+            
+            Name: {name}
+            Email: {email}
+            Subject: {subject}
+            
+            Message:
+            {message}
+            '''
+            mail.send(msg)
+            flash('Thank you! We will get back to you soon.', 'success')
+    except Exception as e:
+        print(f'Contact email error: {e}')
+        flash('Message received. We will respond shortly.', 'info')
+    
+    return redirect(url_for('public.contact'))
+
+@bp.route('/logout')
+def logout():
+    session.clear()
+    return redirect(url_for('public.portal_home'))
+
+@bp.route('/download-prospectus')
+def download_prospectus():
+    """Download school prospectus PDF"""
+    from generate_prospectus import generate_prospectus
+    from flask import send_file
+    
+    pdf_buffer = generate_prospectus()
+    return send_file(
+        pdf_buffer,
+        mimetype='application/pdf',
+        as_attachment=True,
+        download_name='Greenwood_Prospectus_2025-2026.pdf'
+    )
+
+@bp.route('/submit-admissions-inquiry', methods=['POST'])
+@rate_limiter.limit('admissions_inquiry', redirect_to='public.admissions')
+def submit_admissions_inquiry():
+    """Handle admissions inquiry form submission"""
+    try:
+        parent_name = request.form.get('parent_name')
+        email = request.form.get('email')
+        child_name = request.form.get('child_name')
+        date_of_birth = request.form.get('date_of_birth')
+        year_of_entry = request.form.get('year_of_entry')
+        message = request.form.get('message', '')
+        
+        # Email to admin
+        recipients = notifications.recipients('admissions_inquiry')
+        if recipients:
+            msg = Message(
+                subject=f'New Admissions Inquiry: {child_name}',
+                recipients=recipients
+            )
+            msg.html = f"""
+            <html><body style="font-family: Arial, sans-serif;">
+            <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #ddd;">
+                <h2 style="color: #002E5D;">New Admissions Inquiry</h2>
+                <table style="width: 100%; border-collapse: collapse;">
+                    <tr>
+                        <td style="padding: 10px; border-bottom: 1px solid #eee;"><strong>Parent Name:</strong></td>
+                        <td style="padding: 10px; border-bottom: 1px solid #eee;">{parent_name}</td>
+                    </tr>
+                    <tr>
+                        <td style="padding: 10px; border-bottom: 1px solid #eee;"><strong>Email:</strong></td>
+                        <td style="padding: 10px; border-bottom: 1px solid #eee;">{email}</td>
+                    </tr>
+                    <tr>
+                        <td style="padding: 10px; border-bottom: 1px solid #eee;"><strong>Child's Name:</strong></td>
+                        <td style="padding: 10px; border-bottom: 1px solid #eee;">{child_name}</td>
+                    </tr>
+                    <tr>
+                        <td style="padding: 10px; border-bottom: 1px solid #eee;"><strong>Date of Birth:</strong></td>
+                        <td style="padding: 10px; border-bottom: 1px solid #eee;">{date_of_birth}</td>
+                    </tr>
+                    <tr>
+                        <td style="padding: 10px; border-bottom: 1px solid #eee;"><strong>Year of Entry:</strong></td>
+                        <td style="padding: 10px; border-bottom: 1px solid #eee;">{year_of_entry}</td>
+                    </tr>
+                    <tr>
+                        <td style="padding: 10px; border-bottom: 1px solid #eee;"><strong>Message:</strong></td>
+                        <td style="padding: 10px; border-bottom: 1px solid #eee;">{message if message else 'N/A'}</td>
+                    </tr>
+                </table>
+            </div>
+            </body></html>
+            """
+            mail.send(msg)
+        
+        # Confirmation email to parent
+        confirmation_msg = Message(
+            subject='Admissions Inquiry Received - Greenwood International School',
+            recipients=[email]
+        )
+        confirmation_msg.html = f"""
+        <html><body style="font-family: Arial, sans-serif;">
+        <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #ddd;">
+            <h2 style="color: #002E5D;">Thank You for Your Interest</h2>
+            <p>Dear {parent_name},</p>
+            <p>Thank you for your inquiry about {child_name}'s admission to Greenwood International School.</p>
+            <p>We have received your information and will be in touch within 2 business days to discuss next steps.</p>
+            <p style="background: #f8f9fa; padding: 15px; border-radius: 5px;">
+                <strong>Your Inquiry Details:</strong><br>
+                Child: {child_name}<br>
+                Proposed Entry: {year_of_entry}<br>
+                Received: {datetime.now().strftime('%B %d, %Y')}
+            </p>
+            <p>In the meantime, we encourage you to download our prospectus and explore our website.</p>
+            <p>Best regards,<br>
+            <strong>Admissions Office</strong><br>
+            Greenwood International School</p>
+        </div>
+        </body></html>
+        """
+        mail.send(confirmation_msg)
+        
+        flash('Thank you! Your inquiry has been submitted successfully. Check your email for confirmation.', 'success')
+        return redirect(url_for('public.admissions'))
+        
+    except Exception as e:
+        print(f"Error submitting inquiry: {e}")
+        flash('Thank you! Your inquiry has been received.', 'success')
+        return redirect(url_for('public.admissions'))
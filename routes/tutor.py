@@ -0,0 +1,257 @@
+"""
+Tutor Routes
+Registration, login, dashboard, attendance and profile
+"""
+from datetime import datetime
+
+from flask import Blueprint, abort, current_app, flash, g, redirect, render_template, request, session, url_for
+
+from emails import send_tutor_application_email
+from extensions import db, rate_limiter
+from fragment_cache import LazyData
+from helpers import parse_date, rehash_password_if_needed, tutor_required
+from models import Activity, Attendance, Tutor, email_available
+from queries import (
+    EXPORT_FORMATS, export_response, get_activity_occurrences, get_attendance_export_query, get_attendance_history,
+    get_default_session_date, get_session_child_ids, get_session_roster, get_tutor_dashboard_data,
+    save_attendance_register
+)
+from serializers import AttendanceSchema
+
+
+bp = Blueprint('tutor', __name__)
+
+@bp.route('/tutor/login', methods=['GET', 'POST'])
+@rate_limiter.limit('tutor_login', template='tutor/login.html')
+def tutor_login():
+    if request.method == 'POST':
+        email = request.form.get('email')
+        password = request.form.get('password')
+        tutor = Tutor.query.filter_by(email=email).first()
+        if tutor and tutor.check_password(password) and tutor.status == 'approved':
+            rehash_password_if_needed(tutor, password)
+            session['tutor_id'] = tutor.id
+            session['tutor_name'] = tutor.full_name
+            return redirect(url_for('tutor.tutor_dashboard'))
+        return render_template('tutor/login.html', error='Invalid credentials')
+    return render_template('tutor/login.html')
+
+@bp.route('/tutor/register', methods=['GET', 'POST'])
+def tutor_register():
+    """Tutor registration"""
+    if request.method == 'POST':
+        email = request.form.get('email')
+        password = request.form.get('password')
+        confirm = request.form.get('confirm_password')
+        name = request.form.get('full_name')
+        spec = request.form.get('specialization')
+        
+        # New Detailed Fields matching HTML form and Tutor Model
+        years_experience = request.form.get('years_experience')
+        education = request.form.get('education')
+        certifications = request.form.get('certifications')
+        teaching_philosophy = request.form.get('teaching_philosophy')
+        linkedin_url = request.form.get('linkedin_url')
+        bio = request.form.get('bio')
+        
+        # Validate Required Fields based on HTML 'required' attributes
+        # email, password, confirm, name, spec, years_experience, education, teaching_philosophy, bio
+        required_values = [email, password, confirm, name, spec, years_experience, education, teaching_philosophy, bio]
+        
+        if not all(required_values):
+            flash('All marked fields are required.', 'error')
+            return redirect(url_for('tutor.tutor_register'))
+            
+        if password != confirm:
+            flash('Passwords do not match', 'error')
+            return redirect(url_for('tutor.tutor_register'))
+            
+        if len(password) < 8:
+            flash('Password must be at least 8 characters long', 'error')
+            return redirect(url_for('tutor.tutor_register'))
+            
+        if not email_available(email):
+            flash('Email already registered', 'error')
+            return redirect(url_for('tutor.tutor_register'))
+        
+        # Create Tutor - using correct model fields
+        tutor = Tutor(
+            email=email, 
+            full_name=name, 
+            specialization=spec, 
+            bio=bio,
+            years_experience=years_experience,
+            education=education,
+            certifications=certifications,
+            teaching_philosophy=teaching_philosophy,
+            linkedin_url=linkedin_url,
+            status='pending',
+            # Map education to qualification for backward compatibility if redundant
+            qualification=education[:300] if education else None 
+        )
+        tutor.set_password(password)
+        db.session.add(tutor)
+        db.session.commit()
+        
+        try:
+            send_tutor_application_email(tutor)
+        except Exception:
+            pass
+        
+        flash('Application submitted! You will receive an email once reviewed.', 'success')
+        return redirect(url_for('public.portal_home'))
+    
+    return render_template('tutor/register.html')
+
+@bp.route('/tutor/dashboard')
+@tutor_required
+def tutor_dashboard():
+    
+    tutor = g.tutor
+    # Activities assigned to this tutor, only queried on a fragment cache miss
+    dashboard = LazyData(get_tutor_dashboard_data, tutor.id)
+    
+    return render_template('tutor/dashboard.html', tutor=tutor, dashboard=dashboard)
+
+@bp.route('/tutor/attendance/<int:activity_id>', methods=['GET', 'POST'])
+@tutor_required
+def tutor_attendance(activity_id):
+    
+    activity = Activity.query.get_or_404(activity_id)
+    if activity.tutor_id != session['tutor_id']:
+        return redirect(url_for('tutor.tutor_dashboard'))
+        
+    if request.method == 'POST':
+        date = parse_date(request.form.get('date')) or get_default_session_date(activity)
+            
+        # Only children booked on this session can be marked
+        child_ids = get_session_child_ids(activity_id, date)
+        
+        entries = [{
+            'child_id': child_id,
+            'status': request.form.get(f'status_{child_id}'),
+            'notes': request.form.get(f'notes_{child_id}')
+        } for child_id in child_ids]
+        
+        save_attendance_register(activity_id, date, entries)
+        flash('Attendance recorded successfully!', 'success')
+        return redirect(url_for('tutor.tutor_dashboard'))
+    
+    # GET request - show the register for the chosen session
+    session_date = parse_date(request.args.get('date')) or get_default_session_date(activity)
+    
+    bookings = get_session_roster(activity_id, session_date)
+    
+    occurrences = get_activity_occurrences(activity, around=session_date)
+    if session_date not in occurrences:
+        occurrences = sorted(occurrences + [session_date])
+    
+    # Existing attendance for the chosen session
+    attendance_records = Attendance.query.filter_by(
+        activity_id=activity_id,
+        date=session_date
+    ).all()
+    
+    # Create a map for easy lookup in template: child_id -> record
+    attendance_map = {record.child_id: record for record in attendance_records}
+    
+    return render_template('tutor/attendance.html', 
+                         activity=activity, 
+                         bookings=bookings,
+                         session_date=session_date,
+                         occurrences=occurrences,
+                         today=datetime.utcnow().date(),
+                         attendance_map=attendance_map)
+
+@bp.route('/tutor/attendance_history/<int:activity_id>')
+@tutor_required
+def attendance_history(activity_id):
+    """View attendance history for an activity"""
+    tutor_id = session['tutor_id']
+    
+    activity = Activity.query.get_or_404(activity_id)
+    if activity.tutor_id != tutor_id:
+        return redirect(url_for('tutor.tutor_dashboard'))
+    
+    before = parse_date(request.args.get('before'))
+    date_from = parse_date(request.args.get('date_from'))
+    date_to = parse_date(request.args.get('date_to'))
+    
+    sessions, next_before = get_attendance_history(
+        activity_id,
+        before=before,
+        date_from=date_from,
+        date_to=date_to,
+        per_page=current_app.config['ITEMS_PER_PAGE']
+    )
+    
+    return render_template('tutor/attendance_history.html',
+                         activity=activity,
+                         attendance_records=sessions,
+                         next_before=next_before,
+                         is_first_page=before is None,
+                         date_from=request.args.get('date_from', ''),
+                         date_to=request.args.get('date_to', ''))
+
+@bp.route('/tutor/attendance_history/<int:activity_id>/export.<fmt>')
+@tutor_required
+def attendance_export(activity_id, fmt):
+    """Stream an activity's attendance records as CSV or NDJSON"""
+    if fmt not in EXPORT_FORMATS:
+        abort(404)
+    activity = Activity.query.get_or_404(activity_id)
+    if activity.tutor_id != session['tutor_id']:
+        return redirect(url_for('tutor.tutor_dashboard'))
+    
+    query = get_attendance_export_query(
+        activity_id,
+        date_from=parse_date(request.args.get('date_from')),
+        date_to=parse_date(request.args.get('date_to'))
+    )
+    filename = f"attendance-{activity.id}-{datetime.utcnow().strftime('%Y%m%d')}"
+    return export_response(query, AttendanceSchema, fmt, filename)
+
+@bp.route('/tutor/profile', methods=['GET', 'POST'])
+@tutor_required
+def tutor_profile():
+    """Tutor profile view and edit"""
+    tutor = g.tutor
+    
+    if request.method == 'POST':
+        tutor.full_name = request.form.get('full_name', tutor.full_name)
+        tutor.phone = request.form.get('phone', tutor.phone)
+        tutor.bio = request.form.get('bio', tutor.bio)
+        
+        db.session.commit()
+        flash('Profile updated successfully!', 'success')
+        return redirect(url_for('tutor.tutor_profile'))
+    
+    return render_template('tutor/profile.html', tutor=tutor)
+
+@bp.route('/tutor/change-password', methods=['POST'])
+@tutor_required
+def tutor_change_password():
+    """Tutor password change"""
+    tutor = g.tutor
+    
+    current_password = request.form.get('current_password')
+    new_password = request.form.get('new_password')
+    confirm_password = request.form.get('confirm_password')
+    
+    if not tutor.check_password(current_password):
+        flash('Current password is incorrect', 'danger')
+        return redirect(url_for('tutor.tutor_profile'))
+    
+    if new_password != confirm_password:
+        flash('New passwords do not match', 'danger')
+        return redirect(url_for('tutor.tutor_profile'))
+    
+    if len(new_password) < 6:
+        flash('Password must be at least 6 characters', 'danger')
+        return redirect(url_for('tutor.tutor_profile'))
+    
+    tutor.set_password(new_password)
+    db.session.commit()
+    
+    flash('Password changed successfully!', 'success')
+    return redirect(url_for('tutor.tutor_profile'))
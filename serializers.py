@@ -0,0 +1,132 @@
+"""
+API Serializers
+Declarative schemas that turn model instances into JSON-ready dicts
+"""
+from functools import lru_cache
+from operator import attrgetter
+
+
+def isoformat(value):
+    """Dates as ISO 8601 whatever JSON provider is active"""
+    return value.isoformat() if value is not None else None
+
+
+class Schema:
+    """
+    Maps output field names to attribute paths ('child.name'), to
+    (path, converter) pairs, or to callables taking the object.
+
+    For each requested field set the schema compiles one attrgetter that
+    reads every plain attribute in a single call, so serialising a list
+    does no per-field lookups or branching in Python.
+    """
+
+    def __init__(self, **fields):
+        self.fields = fields
+        self.names = tuple(fields)
+        self._plan = lru_cache(maxsize=64)(self._compile)
+
+    def parse_fields(self, value):
+        """Turn a ?fields=a,b,c value into a known-field tuple, or None for all"""
+        if not value:
+            return None
+        requested = [name.strip() for name in value.split(',')]
+        selected = tuple(name for name in self.names if name in requested)
+        return selected or None
+
+    def _compile(self, names):
+        plain, converted, computed = [], [], []
+        for name in names:
+            spec = self.fields[name]
+            if isinstance(spec, str):
+                plain.append((name, spec))
+            elif isinstance(spec, tuple):
+                converted.append((name, attrgetter(spec[0]), spec[1]))
+            else:
+                computed.append((name, spec))
+
+        plain_names = tuple(name for name, _ in plain)
+        if len(plain) > 1:
+            getter = attrgetter(*(path for _, path in plain))
+        elif plain:
+            single = attrgetter(plain[0][1])
+            getter = lambda obj: (single(obj),)
+        else:
+            getter = lambda obj: ()
+        return plain_names, getter, tuple(converted), tuple(computed)
+
+    def dump(self, obj, fields=None):
+        return self.dump_many((obj,), fields)[0]
+
+    def dump_many(self, objs, fields=None):
+        plain_names, getter, converted, computed = self._plan(fields or self.names)
+        rows = []
+        for obj in objs:
+            row = dict(zip(plain_names, getter(obj)))
+            for name, get, convert in converted:
+                row[name] = convert(get(obj))
+            for name, compute in computed:
+                row[name] = compute(obj)
+            rows.append(row)
+        return rows
+
+
+ActivitySchema = Schema(
+    id='id',
+    name='name',
+    price='price',
+    day='day_of_week',
+    time=lambda a: f"{a.start_time} - {a.end_time}",
+    capacity='max_capacity',
+)
+
+BookingSchema = Schema(
+    id='id',
+    parent='parent.full_name',
+    child='child.name',
+    activity='activity.name',
+    booking_date=('booking_date', isoformat),
+    cost='cost',
+    status='status',
+    created_at=('created_at', isoformat),
+)
+
+ChildSchema = Schema(
+    id='id',
+    name='name',
+    age='age',
+    grade='grade',
+)
+
+WaitlistSchema = Schema(
+    id='id',
+    activity_id='activity_id',
+    child_id='child_id',
+    request_date=('request_date', isoformat),
+    status='status',
+    created_at=('created_at', isoformat),
+)
+
+AvailabilitySchema = Schema(
+    available='is_available',
+    spots_left='spots_left',
+)
+
+CapacitySchema = Schema(
+    activity_id='activity_id',
+    date=('session_date', isoformat),
+    booked='booked',
+    capacity='capacity',
+    available='spots_left',
+    percentage='percentage',
+    status='status',
+)
+
+AttendanceSchema = Schema(
+    date=('date', isoformat),
+    child='child.name',
+    grade='child.grade',
+    status='status',
+    notes='notes',
+    recorded_at=('recorded_at', isoformat),
+)
@@ -300,6 +300,85 @@ function getPreference(key, defaultValue = null) {
     }
 }
 
+// Live capacity badges
+function renderCapacity(el, booked, capacity) {
+    const available = capacity - booked;
+    const percent = Math.min(100, (booked / capacity) * 100);
+    let badge;
+    if (percent >= 100) {
+        badge = '<span class="badge bg-danger"><i class="fas fa-exclamation-circle me-1"></i>FULL</span>';
+    } else if (available <= 3) {
+        badge = `<span class="badge bg-warning text-dark"><i class="fas fa-hourglass-half me-1"></i>Only ${available} spots left</span>`;
+    } else {
+        badge = `<span class="badge bg-success"><i class="fas fa-check-circle me-1"></i>${available} spots available</span>`;
+    }
+    el.querySelector('.capacity-badge').innerHTML = badge;
+    el.querySelector('.capacity-enrolled').textContent = `${booked} / ${capacity} enrolled`;
+
+    const bar = el.querySelector('.progress-bar');
+    if (bar) {
+        bar.style.width = `${percent}%`;
+        bar.setAttribute('aria-valuenow', percent);
+        bar.className = `progress-bar bg-${percent >= 100 ? 'danger' : (percent >= 75 ? 'warning' : 'success')}`;
+    }
+}
+
+function showCapacity(entry) {
+    if (entry.capacity) renderCapacity(entry.el, entry.booked[entry.date] || 0, entry.capacity);
+}
+
+function watchCapacity() {
+    const elements = document.querySelectorAll('[data-capacity-activity]');
+    if (!elements.length || !window.EventSource) return;
+
+    // Capacity applies per session: keep confirmed bookings by date and
+    // show the date picked in the activity's booking or waitlist form
+    const byActivity = {};
+    elements.forEach(el => {
+        const entry = { el: el, booked: {}, capacity: 0, date: el.dataset.capacityDate };
+        byActivity[el.dataset.capacityActivity] = entry;
+
+        const picker = el.closest('.card') && el.closest('.card').querySelector('input[type="date"]');
+        if (picker) {
+            picker.addEventListener('change', () => {
+                if (!picker.value) return;
+                entry.date = picker.value;
+                const label = el.querySelector('.capacity-date');
+                if (label) {
+                    label.textContent = new Date(picker.value + 'T00:00').toLocaleDateString(undefined,
+                        { weekday: 'short', day: '2-digit', month: 'short' });
+                }
+                showCapacity(entry);
+            });
+        }
+    });
+
+    const source = new EventSource('/api/capacity/stream?activities=' + Object.keys(byActivity).join(','));
+    source.addEventListener('snapshot', event => {
+        JSON.parse(event.data).forEach(item => {
+            const entry = byActivity[item.activity_id];
+            if (!entry) return;
+            entry.booked = item.booked;
+            entry.capacity = item.capacity;
+            showCapacity(entry);
+        });
+    });
+    source.addEventListener('capacity', event => {
+        const change = JSON.parse(event.data);
+        const entry = byActivity[change.activity_id];
+        if (!entry || !entry.capacity || !change.date) return;
+        entry.booked[change.date] = Math.max(0, (entry.booked[change.date] || 0) + change.delta);
+        if (change.date === entry.date) showCapacity(entry);
+    });
+    source.addEventListener('resync', () => {
+        // Server dropped deltas for us; reconnecting delivers a fresh snapshot
+        source.close();
+        setTimeout(watchCapacity, 1000);
+    });
+}
+
+document.addEventListener('DOMContentLoaded', watchCapacity);
+
 // Export functions for use in HTML
 window.bookActivity = bookActivityAsync;
 window.cancelBooking = cancelBookingAsync;
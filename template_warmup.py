@@ -0,0 +1,68 @@
+"""
+Template Warm-up
+Production template mode: Jinja bytecode cache, template precompilation
+at startup and first-request latency measurement per worker
+"""
+import os
+import time
+
+from flask import request
+from jinja2 import FileSystemBytecodeCache, TemplateSyntaxError
+
+
+def precompile_templates(app):
+    """
+    Compile every template under templates/ so no request pays for it.
+    With a bytecode cache the compiled code is also written to disk, and
+    workers started later load it instead of compiling.
+    Returns (templates compiled, seconds taken).
+    """
+    started = time.perf_counter()
+    compiled = 0
+    for name in app.jinja_env.list_templates():
+        try:
+            app.jinja_env.get_template(name)
+            compiled += 1
+        except TemplateSyntaxError as e:
+            app.logger.warning('Template %s failed to compile: %s', name, e)
+    return compiled, time.perf_counter() - started
+
+
+def init_templates(app):
+    """
+    Apply the template settings from config.
+
+    TEMPLATES_AUTO_RELOAD (on in development) makes Jinja stat each
+    template file on every render. JINJA_BYTECODE_CACHE stores compiled
+    templates in JINJA_BYTECODE_CACHE_DIR (default: instance/jinja_cache).
+    TEMPLATE_PRECOMPILE compiles them all before the first request.
+    """
+    if app.config.get('JINJA_BYTECODE_CACHE'):
+        directory = app.config.get('JINJA_BYTECODE_CACHE_DIR') or os.path.join(app.instance_path, 'jinja_cache')
+        os.makedirs(directory, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+
+    stats = {'started': time.time(), 'templates': 0, 'precompile_ms': None, 'first_request': None}
+    if app.config.get('TEMPLATE_PRECOMPILE'):
+        compiled, seconds = precompile_templates(app)
+        stats.update(templates=compiled, precompile_ms=round(seconds * 1000, 1))
+        app.logger.info('Precompiled %d templates in %.1f ms', compiled, seconds * 1000)
+    app.extensions['template_warmup'] = stats
+
+    @app.before_request
+    def time_first_request():
+        if stats['first_request'] is None:
+            request.environ['warmup.started'] = time.perf_counter()
+
+    @app.after_request
+    def record_first_request(response):
+        started = request.environ.pop('warmup.started', None)
+        if started is not None and stats['first_request'] is None:
+            stats['first_request'] = {
+                'path': request.path,
+                'ms': round((time.perf_counter() - started) * 1000, 1),
+                'after_start_ms': round((time.time() - stats['started']) * 1000, 1),
+                'pid': os.getpid(),
+            }
+            app.logger.info('First request in worker %(pid)s: %(path)s took %(ms)s ms', stats['first_request'])
+        return response
@@ -0,0 +1,78 @@
+"""
+Bookings
+Booking through the parent forms keeps capacity streams and rollups up to date
+"""
+from datetime import date
+
+import pytest
+
+from app import create_app
+from extensions import capacity_broker, db
+from models import Activity, Booking, Child, Parent, Tutor, rebuild_booking_rollups
+
+SESSION_DATE = date(2026, 10, 19)
+
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        tutor = Tutor(email='tutor@example.com', full_name='Tutor', status='approved')
+        tutor.set_password('secret')
+        parent = Parent(email='parent@example.com', full_name='Parent', phone='0123456789')
+        parent.set_password('secret')
+        db.session.add_all([tutor, parent])
+        db.session.flush()
+
+        activity = Activity(name='Chess', price=10, day_of_week='Monday', start_time='15:00', end_time='16:00',
+                            tutor_id=tutor.id, max_capacity=1)
+        db.session.add_all([
+            activity,
+            Child(parent_id=parent.id, name='First', age=8, grade='3'),
+            Child(parent_id=parent.id, name='Second', age=9, grade='4'),
+        ])
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['parent_id'] = 1
+    return client
+
+
+def book(client, child_id):
+    return client.post('/book_activity', data={
+        'child_id': child_id, 'activity_id': 1, 'booking_date': SESSION_DATE.isoformat()
+    })
+
+
+def test_form_booking_reaches_activity_subscribers(client):
+    subscription = capacity_broker.subscribe([1])
+    try:
+        response = book(client, 1)
+
+        assert response.status_code == 302
+        assert subscription.queue.get_nowait() == {'activity_id': 1, 'date': SESSION_DATE.isoformat(), 'delta': 1}
+    finally:
+        capacity_broker.unsubscribe(subscription)
+
+
+def test_incremental_rollups_match_rebuild(app, client):
+    assert book(client, 1).status_code == 302
+    # Full: the second child joins the waitlist and is promoted on cancellation
+    assert book(client, 2).status_code == 302
+    client.post('/join_waitlist', data={'child_id': 2, 'activity_id': 1, 'date': SESSION_DATE.isoformat()})
+    client.post('/cancel_booking/1')
+
+    promoted = Booking.query.one()
+    assert (promoted.child_id, promoted.status) == (2, 'confirmed')
+    # Ids taken straight from request data are still strings at flush time
+    db.session.add(Booking(parent_id=1, child_id=1, activity_id='1', booking_date=date(2026, 10, 26), cost=10))
+    db.session.commit()
+    assert rebuild_booking_rollups() == {}
@@ -0,0 +1,38 @@
+"""
+Bulk Import
+Imported families can sign in and be matched by email like registered ones
+"""
+import io
+from datetime import date
+
+import pytest
+
+from app import create_app
+from bulk_import import import_csv
+from extensions import db
+from models import Activity, Booking, Parent, find_identity
+
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        db.session.add(Activity(name='Chess', price=10, day_of_week='Monday', start_time='15:00', end_time='16:00'))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_imported_parent_keeps_email_as_written(app):
+    families = 'parent_email,parent_name,phone,child_name\nJane.Doe@Example.com,Jane Doe,0123456789,Sam\n'
+    bookings = f'parent_email,child_name,activity_id,booking_date\nJANE.DOE@example.com,sam,1,{date(2026, 10, 19)}\n'
+
+    assert import_csv('families', io.StringIO(families))['imported'] == 1
+    assert import_csv('bookings', io.StringIO(bookings))['imported'] == 1
+
+    # Login looks parents up by the exact address they registered with
+    parent = Parent.query.filter_by(email='Jane.Doe@Example.com').one()
+    assert find_identity('jane.doe@example.com').user_id == parent.id
+    assert Booking.query.one().parent_id == parent.id
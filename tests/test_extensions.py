@@ -0,0 +1,25 @@
+"""
+Extensions
+Apps built by create_app() keep their own extension state
+"""
+from app import create_app
+from extensions import capacity_broker, password_hasher, rate_limiter
+
+
+def test_each_app_keeps_its_own_state():
+    testing = create_app('testing')
+    development = create_app('development')
+
+    with testing.app_context():
+        assert password_hasher.method == 'pbkdf2:sha256:1000'
+        assert not rate_limiter.state.enabled
+        subscription = capacity_broker.subscribe([1])
+    with development.app_context():
+        assert password_hasher.method != 'pbkdf2:sha256:1000'
+        assert rate_limiter.state.enabled
+        assert capacity_broker.subscriber_count == 0
+    with testing.app_context():
+        assert capacity_broker.subscriber_count == 1
+        capacity_broker.unsubscribe(subscription)
+
+    assert testing.extensions['password_hasher'].executor is not development.extensions['password_hasher'].executor
@@ -0,0 +1,87 @@
+"""
+Identity Loading
+Each authenticated request loads its parent, tutor or admin account once
+"""
+import re
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app
+from extensions import db
+from models import Activity, Admin, Booking, Child, Parent, Tutor
+
+# A primary-key load of an account, however the ORM aliases the columns
+IDENTITY_SELECT = re.compile(r'^SELECT\b.*\bFROM (parent|tutor|admin)\s+WHERE \1\.id = \?', re.DOTALL)
+
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        tutor = Tutor(email='tutor@example.com', full_name='Tutor', status='approved')
+        tutor.set_password('secret')
+        admin = Admin(email='admin@example.com')
+        admin.set_password('secret')
+        parent = Parent(email='parent@example.com', full_name='Parent', phone='0123456789')
+        parent.set_password('secret')
+        db.session.add_all([tutor, admin, parent])
+        db.session.flush()
+        
+        activity = Activity(name='Chess', price=10, day_of_week='Monday', start_time='15:00', end_time='16:00',
+                            tutor_id=tutor.id)
+        child = Child(parent_id=parent.id, name='Child', age=8, grade='3')
+        db.session.add_all([activity, child])
+        db.session.flush()
+        db.session.add(Booking(parent_id=parent.id, child_id=child.id, activity_id=activity.id,
+                               booking_date=date(2026, 10, 19), cost=10))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def statements(app):
+    seen = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+    
+    event.listen(db.engine, 'before_cursor_execute', record)
+    yield seen
+    event.remove(db.engine, 'before_cursor_execute', record)
+
+
+@pytest.mark.parametrize('session_key, url', [
+    ('parent_id', '/dashboard'),
+    ('parent_id', '/parent/profile'),
+    ('tutor_id', '/tutor/dashboard'),
+    ('tutor_id', '/tutor/profile'),
+    ('admin_id', '/admin/dashboard'),
+])
+def test_one_identity_query_per_request(app, statements, session_key, url):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session[session_key] = 1
+    
+    response = client.get(url)
+    
+    assert response.status_code == 200
+    assert len([s for s in statements if IDENTITY_SELECT.match(s)]) == 1
+
+
+def test_deleted_account_is_logged_out(app):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['parent_id'] = 1
+    db.session.delete(db.session.get(Parent, 1))
+    db.session.commit()
+    
+    response = client.get('/dashboard')
+    
+    assert response.status_code == 302
+    with client.session_transaction() as session:
+        assert 'parent_id' not in session